@@ -1,46 +1,72 @@
-from typing import List
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlmodel import select
 
-from ..core.database import get_session
-from ..models.account import Account
+from ..core.database import AnyAsyncSession, get_async_read_session, get_async_session
+from ..models.account import Account, AccountType
+from .pagination import Page, PageParams, keyset_page, page_rows
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
 
-@router.get("/", response_model=List[Account])
-def get_accounts(user_id: int = None, session: Session = Depends(get_session)):
-    """Get all accounts, optionally filtered by user"""
+@router.get("/", response_model=Page[Account])
+async def get_accounts(
+    response: Response,
+    user_id: int = None,
+    account_type: Optional[AccountType] = None,
+    institution_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    page: PageParams = Depends(),
+    session: AnyAsyncSession = Depends(get_async_read_session),
+):
+    """
+    Get accounts, optionally filtered by user, type, institution or status
+
+    Returns one page of at most ``limit`` items; pass its ``next_cursor``
+    back as ``cursor`` for the next one.
+    """
     query = select(Account)
     if user_id:
         query = query.where(Account.user_id == user_id)
-    accounts = session.exec(query).all()
-    return accounts
+    if account_type is not None:
+        query = query.where(Account.account_type == account_type)
+    if institution_id is not None:
+        query = query.where(Account.institution_id == institution_id)
+    if is_active is not None:
+        query = query.where(Account.is_active == is_active)
+
+    keys = (Account.id,)
+    accounts = (await session.exec(keyset_page(query, keys, page))).all()
+    return page_rows(accounts, keys, page, response)
 
 
 @router.get("/{account_id}", response_model=Account)
-def get_account(account_id: int, session: Session = Depends(get_session)):
+async def get_account(account_id: int, session: AnyAsyncSession = Depends(get_async_read_session)):
     """Get a specific account"""
-    account = session.get(Account, account_id)
+    account = await session.get(Account, account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     return account
 
 
 @router.post("/", response_model=Account)
-def create_account(account: Account, session: Session = Depends(get_session)):
+async def create_account(account: Account, session: AnyAsyncSession = Depends(get_async_session)):
     """Create a new account"""
     session.add(account)
-    session.commit()
-    session.refresh(account)
+    await session.commit()
+    await session.refresh(account)
     return account
 
 
 @router.put("/{account_id}", response_model=Account)
-def update_account(account_id: int, account_data: Account, session: Session = Depends(get_session)):
+async def update_account(
+    account_id: int,
+    account_data: Account,
+    session: AnyAsyncSession = Depends(get_async_session),
+):
     """Update an account"""
-    account = session.get(Account, account_id)
+    account = await session.get(Account, account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
 
@@ -49,18 +75,18 @@ def update_account(account_id: int, account_data: Account, session: Session = De
         setattr(account, key, value)
 
     session.add(account)
-    session.commit()
-    session.refresh(account)
+    await session.commit()
+    await session.refresh(account)
     return account
 
 
 @router.delete("/{account_id}")
-def delete_account(account_id: int, session: Session = Depends(get_session)):
+async def delete_account(account_id: int, session: AnyAsyncSession = Depends(get_async_session)):
     """Delete an account"""
-    account = session.get(Account, account_id)
+    account = await session.get(Account, account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
 
-    session.delete(account)
-    session.commit()
+    await session.delete(account)
+    await session.commit()
     return {"message": "Account deleted successfully"}
@@ -1,46 +1,72 @@
-from typing import List
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlmodel import select
 
-from ..core.database import get_session
-from ..models.investment import Investment
+from ..core.database import AnyAsyncSession, get_async_read_session, get_async_session
+from ..models.investment import Investment, InvestmentType
+from .pagination import Page, PageParams, keyset_page, page_rows
 
 router = APIRouter(prefix="/investments", tags=["investments"])
 
 
-@router.get("/", response_model=List[Investment])
-def get_investments(user_id: int = None, session: Session = Depends(get_session)):
-    """Get all investments, optionally filtered by user"""
+@router.get("/", response_model=Page[Investment])
+async def get_investments(
+    response: Response,
+    user_id: int = None,
+    account_id: Optional[int] = None,
+    investment_type: Optional[InvestmentType] = None,
+    symbol: Optional[str] = None,
+    page: PageParams = Depends(),
+    session: AnyAsyncSession = Depends(get_async_read_session),
+):
+    """
+    Get investments, optionally filtered by user, account, type or symbol
+
+    Returns one page of at most ``limit`` items; pass its ``next_cursor``
+    back as ``cursor`` for the next one.
+    """
     query = select(Investment)
     if user_id:
         query = query.where(Investment.user_id == user_id)
-    investments = session.exec(query).all()
-    return investments
+    if account_id is not None:
+        query = query.where(Investment.account_id == account_id)
+    if investment_type is not None:
+        query = query.where(Investment.investment_type == investment_type)
+    if symbol is not None:
+        query = query.where(Investment.symbol == symbol)
+
+    keys = (Investment.id,)
+    investments = (await session.exec(keyset_page(query, keys, page))).all()
+    return page_rows(investments, keys, page, response)
 
 
 @router.get("/{investment_id}", response_model=Investment)
-def get_investment(investment_id: int, session: Session = Depends(get_session)):
+async def get_investment(investment_id: int, session: AnyAsyncSession = Depends(get_async_read_session)):
     """Get a specific investment"""
-    investment = session.get(Investment, investment_id)
+    investment = await session.get(Investment, investment_id)
     if not investment:
         raise HTTPException(status_code=404, detail="Investment not found")
     return investment
 
 
 @router.post("/", response_model=Investment)
-def create_investment(investment: Investment, session: Session = Depends(get_session)):
+async def create_investment(investment: Investment, session: AnyAsyncSession = Depends(get_async_session)):
     """Create a new investment"""
     session.add(investment)
-    session.commit()
-    session.refresh(investment)
+    await session.commit()
+    await session.refresh(investment)
     return investment
 
 
 @router.put("/{investment_id}", response_model=Investment)
-def update_investment(investment_id: int, investment_data: Investment, session: Session = Depends(get_session)):
+async def update_investment(
+    investment_id: int,
+    investment_data: Investment,
+    session: AnyAsyncSession = Depends(get_async_session),
+):
     """Update an investment"""
-    investment = session.get(Investment, investment_id)
+    investment = await session.get(Investment, investment_id)
     if not investment:
         raise HTTPException(status_code=404, detail="Investment not found")
 
@@ -49,18 +75,18 @@ def update_investment(investment_id: int, investment_data: Investment, session:
         setattr(investment, key, value)
 
     session.add(investment)
-    session.commit()
-    session.refresh(investment)
+    await session.commit()
+    await session.refresh(investment)
     return investment
 
 
 @router.delete("/{investment_id}")
-def delete_investment(investment_id: int, session: Session = Depends(get_session)):
+async def delete_investment(investment_id: int, session: AnyAsyncSession = Depends(get_async_session)):
     """Delete an investment"""
-    investment = session.get(Investment, investment_id)
+    investment = await session.get(Investment, investment_id)
     if not investment:
         raise HTTPException(status_code=404, detail="Investment not found")
 
-    session.delete(investment)
-    session.commit()
+    await session.delete(investment)
+    await session.commit()
     return {"message": "Investment deleted successfully"}
@@ -0,0 +1,90 @@
+"""
+Keyset (cursor) pagination for list endpoints
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Generic, List, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel
+from sqlalchemy import literal, tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Response header also holding the next page's cursor; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a list endpoint; ``next_cursor`` is None on the last page"""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class PageParams:
+    """``limit`` and ``cursor`` query parameters of a list endpoint"""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def as_utc(value: datetime) -> datetime:
+    """A filter datetime, taken as UTC when it has no offset"""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _encode_cursor(row: Any, keys: Sequence) -> str:
+    values = [getattr(row, key.key) for key in keys]
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _parse_key(key, value) -> Any:
+    # Decorated types such as SQLModel's UTCDateTime report their Python type on the wrapped one
+    python_type = getattr(key.type, "impl", key.type).python_type
+    return datetime.fromisoformat(value) if python_type is datetime else python_type(value)
+
+
+def _decode_cursor(cursor: str, keys: Sequence) -> List:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError(cursor)
+        return [_parse_key(key, value) for key, value in zip(keys, values)]
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(query, keys: Sequence, page: PageParams, descending: bool = False):
+    """Order ``query`` by ``keys`` and select the page after ``page.cursor``
+
+    ``keys`` must end with a unique column (the id) so that every row has
+    its own position. The cursor becomes a row-value comparison on the
+    keys, which an index on them answers without reading the skipped rows.
+    One row beyond ``page.limit`` is selected to learn whether more follow.
+    """
+    if page.cursor:
+        values = _decode_cursor(page.cursor, keys)
+        position = tuple_(*(literal(value, key.type) for key, value in zip(keys, values)))
+        query = query.where(tuple_(*keys) < position if descending else tuple_(*keys) > position)
+    return query.order_by(*(key.desc() if descending else key.asc() for key in keys)).limit(page.limit + 1)
+
+
+def page_rows(rows: Sequence, keys: Sequence, page: PageParams, response: Response) -> Dict:
+    """The ``Page`` body of the rows, with the next page's cursor also set on ``response``"""
+    rows = list(rows)
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        next_cursor = _encode_cursor(rows[-1], keys)
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return {"items": rows, "next_cursor": next_cursor}
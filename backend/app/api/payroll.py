@@ -1,26 +1,50 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select
 
-from ..core.database import get_session
+from ..core.database import get_read_session, get_session
 from ..models.payroll import Payroll, Deduction, Withholding
+from .pagination import Page, PageParams, as_utc, keyset_page, page_rows
 
 router = APIRouter(prefix="/payroll", tags=["payroll"])
 
 
-@router.get("/", response_model=List[Payroll])
-def get_payroll_records(user_id: int = None, session: Session = Depends(get_session)):
-    """Get all payroll records, optionally filtered by user"""
+@router.get("/", response_model=Page[Payroll])
+def get_payroll_records(
+    response: Response,
+    user_id: int = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    employer_name: Optional[str] = None,
+    page: PageParams = Depends(),
+    session: Session = Depends(get_read_session),
+):
+    """
+    Get payroll records, latest pay date first, optionally filtered by user,
+    pay date range (``end_date`` exclusive) or employer
+
+    Returns one page of at most ``limit`` items; pass its ``next_cursor``
+    back as ``cursor`` for the next one.
+    """
     query = select(Payroll)
     if user_id:
         query = query.where(Payroll.user_id == user_id)
-    records = session.exec(query).all()
-    return records
+    if start_date is not None:
+        query = query.where(Payroll.pay_date >= as_utc(start_date))
+    if end_date is not None:
+        query = query.where(Payroll.pay_date < as_utc(end_date))
+    if employer_name is not None:
+        query = query.where(Payroll.employer_name == employer_name)
+
+    keys = (Payroll.pay_date, Payroll.id)
+    records = session.exec(keyset_page(query, keys, page, descending=True)).all()
+    return page_rows(records, keys, page, response)
 
 
 @router.get("/{payroll_id}", response_model=Payroll)
-def get_payroll_record(payroll_id: int, session: Session = Depends(get_session)):
+def get_payroll_record(payroll_id: int, session: Session = Depends(get_read_session)):
     """Get a specific payroll record"""
     record = session.get(Payroll, payroll_id)
     if not record:
@@ -38,7 +62,7 @@ def create_payroll_record(payroll: Payroll, session: Session = Depends(get_sessi
 
 
 @router.get("/{payroll_id}/deductions", response_model=List[Deduction])
-def get_deductions(payroll_id: int, session: Session = Depends(get_session)):
+def get_deductions(payroll_id: int, session: Session = Depends(get_read_session)):
     """Get deductions for a payroll record"""
     deductions = session.exec(select(Deduction).where(Deduction.payroll_id == payroll_id)).all()
     return deductions
@@ -55,7 +79,7 @@ def create_deduction(payroll_id: int, deduction: Deduction, session: Session = D
 
 
 @router.get("/{payroll_id}/withholdings", response_model=List[Withholding])
-def get_withholdings(payroll_id: int, session: Session = Depends(get_session)):
+def get_withholdings(payroll_id: int, session: Session = Depends(get_read_session)):
     """Get withholdings for a payroll record"""
     withholdings = session.exec(select(Withholding).where(Withholding.payroll_id == payroll_id)).all()
     return withholdings
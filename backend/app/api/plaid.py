@@ -4,9 +4,10 @@ from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlmodel import Session, select
+from sqlmodel import select
+from starlette.concurrency import run_in_threadpool
 
-from ..core.database import get_session
+from ..core.database import AnyAsyncSession, get_async_session
 from ..models.account import Account, AccountType
 from ..models.ledger import LedgerEntry, EntryType
 from ..models.plaid import PlaidItem, PlaidAccount
@@ -15,6 +16,8 @@ from ..services.plaid_service import plaid_service
 
 router = APIRouter(prefix="/plaid", tags=["plaid"])
 
+# The Plaid client is blocking, so its calls run in the threadpool
+
 
 class LinkTokenRequest(BaseModel):
     user_id: int
@@ -32,24 +35,27 @@ class SyncRequest(BaseModel):
 
 
 @router.post("/link-token")
-def create_link_token(request: LinkTokenRequest):
+async def create_link_token(request: LinkTokenRequest):
     """Create a Plaid Link token for connecting bank accounts"""
     try:
-        result = plaid_service.create_link_token(request.user_id, request.username)
+        result = await run_in_threadpool(plaid_service.create_link_token, request.user_id, request.username)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/exchange-token")
-def exchange_public_token(request: PublicTokenExchange, session: Session = Depends(get_session)):
+async def exchange_public_token(
+    request: PublicTokenExchange,
+    session: AnyAsyncSession = Depends(get_async_session),
+):
     """Exchange public token and save Plaid item"""
     try:
         # Exchange the public token for access token
-        access_token = plaid_service.exchange_public_token(request.public_token)
+        access_token = await run_in_threadpool(plaid_service.exchange_public_token, request.public_token)
 
         # Get accounts from Plaid
-        plaid_accounts = plaid_service.get_accounts(access_token)
+        plaid_accounts = await run_in_threadpool(plaid_service.get_accounts, access_token)
 
         # Create PlaidItem
         plaid_item = PlaidItem(
@@ -61,8 +67,8 @@ def exchange_public_token(request: PublicTokenExchange, session: Session = Depen
             last_synced=datetime.now(timezone.utc),
         )
         session.add(plaid_item)
-        session.commit()
-        session.refresh(plaid_item)
+        await session.commit()
+        await session.refresh(plaid_item)
 
         # Create accounts and link to Plaid
         created_accounts = []
@@ -77,8 +83,8 @@ def exchange_public_token(request: PublicTokenExchange, session: Session = Depen
                 currency='USD',
             )
             session.add(account)
-            session.commit()
-            session.refresh(account)
+            await session.commit()
+            await session.refresh(account)
 
             # Create PlaidAccount link
             plaid_account = PlaidAccount(
@@ -100,7 +106,7 @@ def exchange_public_token(request: PublicTokenExchange, session: Session = Depen
                 },
             )
 
-        session.commit()
+        await session.commit()
 
         return {
             "message": "Accounts linked successfully",
@@ -108,29 +114,30 @@ def exchange_public_token(request: PublicTokenExchange, session: Session = Depen
             "accounts": created_accounts,
         }
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/sync-transactions")
-def sync_transactions(request: SyncRequest, session: Session = Depends(get_session)):
+async def sync_transactions(request: SyncRequest, session: AnyAsyncSession = Depends(get_async_session)):
     """Sync transactions from Plaid for a specific item"""
     try:
         # Get PlaidItem
-        plaid_item = session.get(PlaidItem, request.plaid_item_id)
+        plaid_item = await session.get(PlaidItem, request.plaid_item_id)
         if not plaid_item:
             raise HTTPException(status_code=404, detail="Plaid item not found")
 
         # Get transactions from Plaid
-        plaid_transactions = plaid_service.sync_transactions(
+        plaid_transactions = await run_in_threadpool(
+            plaid_service.sync_transactions,
             plaid_item.plaid_access_token,
             days=request.days,
         )
 
         # Get PlaidAccount mappings
-        plaid_accounts = session.exec(
+        plaid_accounts = (await session.exec(
             select(PlaidAccount).where(PlaidAccount.plaid_item_id == plaid_item.id),
-        ).all()
+        )).all()
 
         plaid_account_map = {pa.plaid_account_id: pa.account_id for pa in plaid_accounts}
 
@@ -147,11 +154,11 @@ def sync_transactions(request: SyncRequest, session: Session = Depends(get_sessi
                 continue
 
             # Check if transaction already exists using Plaid transaction ID
-            existing = session.exec(
+            existing = (await session.exec(
                 select(Transaction).where(
                     Transaction.plaid_transaction_id == plaid_txn_id,
                 ),
-            ).first()
+            )).first()
 
             if existing:
                 continue
@@ -174,8 +181,8 @@ def sync_transactions(request: SyncRequest, session: Session = Depends(get_sessi
                 plaid_transaction_id=plaid_txn_id,
             )
             session.add(transaction)
-            session.commit()
-            session.refresh(transaction)
+            await session.commit()
+            await session.refresh(transaction)
 
             # Create ledger entry
             ledger_entry = LedgerEntry(
@@ -190,7 +197,7 @@ def sync_transactions(request: SyncRequest, session: Session = Depends(get_sessi
             session.add(ledger_entry)
 
             # Update account balance
-            account = session.get(Account, account_id)
+            account = await session.get(Account, account_id)
             if account:
                 account.balance += amount
                 account.updated_at = datetime.now(timezone.utc)
@@ -201,7 +208,7 @@ def sync_transactions(request: SyncRequest, session: Session = Depends(get_sessi
         # Update last synced
         plaid_item.last_synced = datetime.now(timezone.utc)
         session.add(plaid_item)
-        session.commit()
+        await session.commit()
 
         return {
             "message": "Transactions synced successfully",
@@ -209,24 +216,24 @@ def sync_transactions(request: SyncRequest, session: Session = Depends(get_sessi
             "total_transactions": len(plaid_transactions),
         }
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/items", response_model=List[PlaidItem])
-def get_plaid_items(user_id: int, session: Session = Depends(get_session)):
+async def get_plaid_items(user_id: int, session: AnyAsyncSession = Depends(get_async_session)):
     """Get all Plaid items for a user"""
-    items = session.exec(select(PlaidItem).where(PlaidItem.user_id == user_id)).all()
+    items = (await session.exec(select(PlaidItem).where(PlaidItem.user_id == user_id))).all()
     return items
 
 
 @router.delete("/items/{item_id}")
-def delete_plaid_item(item_id: int, session: Session = Depends(get_session)):
+async def delete_plaid_item(item_id: int, session: AnyAsyncSession = Depends(get_async_session)):
     """Delete a Plaid item and unlink accounts"""
-    plaid_item = session.get(PlaidItem, item_id)
+    plaid_item = await session.get(PlaidItem, item_id)
     if not plaid_item:
         raise HTTPException(status_code=404, detail="Plaid item not found")
 
-    session.delete(plaid_item)
-    session.commit()
+    await session.delete(plaid_item)
+    await session.commit()
     return {"message": "Plaid item deleted successfully"}
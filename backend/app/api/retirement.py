@@ -1,26 +1,45 @@
-from typing import List
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select
 
-from ..core.database import get_session
-from ..models.retirement import RetirementAccount
+from ..core.database import get_read_session, get_session
+from ..models.retirement import RetirementAccount, RetirementType
+from .pagination import Page, PageParams, keyset_page, page_rows
 
 router = APIRouter(prefix="/retirement", tags=["retirement"])
 
 
-@router.get("/", response_model=List[RetirementAccount])
-def get_retirement_accounts(user_id: int = None, session: Session = Depends(get_session)):
-    """Get all retirement accounts, optionally filtered by user"""
+@router.get("/", response_model=Page[RetirementAccount])
+def get_retirement_accounts(
+    response: Response,
+    user_id: int = None,
+    account_id: Optional[int] = None,
+    retirement_type: Optional[RetirementType] = None,
+    page: PageParams = Depends(),
+    session: Session = Depends(get_read_session),
+):
+    """
+    Get retirement accounts, optionally filtered by user, account or type
+
+    Returns one page of at most ``limit`` items; pass its ``next_cursor``
+    back as ``cursor`` for the next one.
+    """
     query = select(RetirementAccount)
     if user_id:
         query = query.where(RetirementAccount.user_id == user_id)
-    accounts = session.exec(query).all()
-    return accounts
+    if account_id is not None:
+        query = query.where(RetirementAccount.account_id == account_id)
+    if retirement_type is not None:
+        query = query.where(RetirementAccount.retirement_type == retirement_type)
+
+    keys = (RetirementAccount.id,)
+    accounts = session.exec(keyset_page(query, keys, page)).all()
+    return page_rows(accounts, keys, page, response)
 
 
 @router.get("/{retirement_id}", response_model=RetirementAccount)
-def get_retirement_account(retirement_id: int, session: Session = Depends(get_session)):
+def get_retirement_account(retirement_id: int, session: Session = Depends(get_read_session)):
     """Get a specific retirement account"""
     account = session.get(RetirementAccount, retirement_id)
     if not account:
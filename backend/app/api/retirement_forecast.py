@@ -1,19 +1,50 @@
-import json
+from datetime import datetime, timezone
 from decimal import Decimal
-from typing import List, Optional
+from itertools import product
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import func, update
 from sqlmodel import Session, select
 
-from ..core.database import get_session
-from ..models.investment_tax import InvestmentTaxBucket
+from ..core.database import get_read_session, get_session
+from ..models.account import Account
+from ..models.investment import Investment, InvestmentType
+from ..models.investment_tax import InvestmentTaxBucket, TaxClassification
 from ..models.retirement_forecast import (
+    ForecastStatus,
     RetirementForecast,
     RMDProjection,
     IRMAAProjection,
+    RetirementScenario,
+    ReturnModel,
+    RothObjective,
+    SamplingMethod,
+    WithdrawalStrategy,
 )
-from ..services.monte_carlo_service import MonteCarloSimulator, RMDCalculator, IRMAACalculator
+from ..services.forecast_cache import forecast_cache, return_matrix_cache
+from ..services.forecast_jobs import apply_simulation_results, forecast_jobs
+from ..services.historical_returns import dataset_path, load_historical_returns
+from ..services.irmaa_brackets import FILING_STATUSES
+from ..services.monte_carlo_service import ENGINE_VERSION, MonteCarloSimulator, RMDCalculator, IRMAACalculator
+from ..services.multi_asset import MultiAssetSimulator, PortfolioAllocation
+from ..services.projection_store import replace_projections
+from ..services.roth_optimizer import SEARCH_BLOCK_SIZE, RothConversionOptimizer
+from ..services.sampling import sobol_available
+from ..services.scenario_sweep import ScenarioSweep
+from ..services.withdrawal_solver import SustainableWithdrawalSolver
+from ..services.year_stats_codec import YEAR_STAT_NAMES, read_year_stats
+
+# Upper bound on grid points evaluated by one sweep request
+MAX_SWEEP_SCENARIOS = 2000
+# Upper bound on (scenario, conversion schedule) candidates of one Roth conversion search
+MAX_ROTH_CANDIDATES = 5000
+# Upper bound on points of a sustainable withdrawal curve
+MAX_CURVE_POINTS = 1000
+# Upper bound on paths of the requests that evaluate many variants on every path
+# (scenario sweeps, Roth conversion searches, withdrawal solving)
+MAX_VARIANT_SIMULATIONS = 50000
 
 router = APIRouter(prefix="/retirement-forecast", tags=["retirement-forecast"])
 
@@ -30,20 +61,43 @@ class ForecastRequest(BaseModel):
     volatility: Decimal
     inflation_rate: Decimal = Decimal("2.5")
     num_simulations: int = 10000
+    streaming: Optional[bool] = None  # None lets large runs stream automatically
+    seed: Optional[int] = None  # Same seed reproduces the same result
+    # Stop early once the 95% CI half-width is within target; num_simulations is then the path budget
+    target_success_ci: Optional[Decimal] = None  # Percentage points of success rate
+    target_median_ci: Optional[Decimal] = None  # Percent of median final balance
+    sampling: SamplingMethod = SamplingMethod.RANDOM
+    return_model: ReturnModel = ReturnModel.NORMAL
+    bootstrap_block_years: int = 5  # Consecutive historical years per resampled block
+    withdrawal_strategy: WithdrawalStrategy = WithdrawalStrategy.FIXED
+    withdrawal_rate: Decimal = Decimal("4")  # Percent of balance (percentage, floor_ceiling)
+    guardrail_band: Decimal = Decimal("20")  # Percent drift from the initial rate that triggers a change
+    guardrail_adjustment: Decimal = Decimal("10")  # Percent cut or raise at a guardrail
+    withdrawal_floor: Decimal = Decimal("80")  # Percent of annual_withdrawal (floor_ceiling)
+    withdrawal_ceiling: Decimal = Decimal("120")  # Percent of annual_withdrawal (floor_ceiling)
 
 
-@router.post("/forecast", response_model=RetirementForecast)
-def create_retirement_forecast(
-    user_id: int,
-    forecast: ForecastRequest,
-    session: Session = Depends(get_session),
-):
-    """Create and run a new retirement forecast with Monte Carlo simulation"""
+def _check_return_options(sampling: SamplingMethod, return_model: ReturnModel, bootstrap_block_years: int) -> None:
+    """Reject return model and sampling combinations that cannot run here"""
+    if sampling == SamplingMethod.SOBOL and not sobol_available():
+        raise HTTPException(status_code=400, detail="Sobol sampling requires scipy to be installed")
 
-    # Create forecast record
-    db_forecast = RetirementForecast(
-        user_id=user_id,
-        forecast_name=forecast.forecast_name,
+    if return_model == ReturnModel.HISTORICAL_BOOTSTRAP:
+        if sampling != SamplingMethod.RANDOM:
+            raise HTTPException(status_code=400, detail="Historical bootstrap returns only support random sampling")
+        if bootstrap_block_years < 1:
+            raise HTTPException(status_code=400, detail="bootstrap_block_years must be at least 1")
+        if not dataset_path().exists():
+            raise HTTPException(status_code=400, detail="Historical returns dataset is not available")
+
+
+def _build_simulator(forecast: ForecastRequest, **options) -> MonteCarloSimulator:
+    """Create a simulator for the parameters of a forecast request (``options`` are passed through)"""
+    _check_return_options(forecast.sampling, forecast.return_model, forecast.bootstrap_block_years)
+    if forecast.withdrawal_floor > forecast.withdrawal_ceiling:
+        raise HTTPException(status_code=400, detail="withdrawal_floor must not exceed withdrawal_ceiling")
+
+    return MonteCarloSimulator(
         current_age=forecast.current_age,
         retirement_age=forecast.retirement_age,
         life_expectancy=forecast.life_expectancy,
@@ -54,10 +108,61 @@ def create_retirement_forecast(
         volatility=forecast.volatility,
         inflation_rate=forecast.inflation_rate,
         num_simulations=forecast.num_simulations,
+        streaming=forecast.streaming,
+        seed=forecast.seed,
+        target_success_ci=forecast.target_success_ci,
+        target_median_ci=forecast.target_median_ci,
+        sampling=forecast.sampling,
+        return_model=forecast.return_model,
+        bootstrap_block_years=forecast.bootstrap_block_years,
+        withdrawal_strategy=forecast.withdrawal_strategy,
+        withdrawal_rate=forecast.withdrawal_rate,
+        guardrail_band=forecast.guardrail_band,
+        guardrail_adjustment=forecast.guardrail_adjustment,
+        withdrawal_floor=forecast.withdrawal_floor,
+        withdrawal_ceiling=forecast.withdrawal_ceiling,
+        **options,
     )
 
-    # Run Monte Carlo simulation
-    simulator = MonteCarloSimulator(
+
+def _check_tax_options(filing_status: str) -> None:
+    """Reject tax outcome options the IRMAA tables cannot evaluate"""
+    if filing_status not in FILING_STATUSES:
+        raise HTTPException(status_code=400, detail=f"filing_status must be one of {', '.join(FILING_STATUSES)}")
+
+
+@router.post("/forecast", response_model=RetirementForecast)
+def create_retirement_forecast(
+    user_id: int,
+    forecast: ForecastRequest,
+    background: bool = False,
+    session: Session = Depends(get_session),
+):
+    """
+    Create and run a new retirement forecast with Monte Carlo simulation
+
+    With ``background=true`` the forecast is returned immediately with
+    ``status=pending`` and simulated on a background worker. Poll
+    ``GET /forecast/{id}`` or listen on ``/ws/sync/{user_id}`` for
+    ``retirement_forecast`` progress and completion events.
+
+    Results are cached by a hash of the simulation inputs, seed and engine
+    version, so an identical request is answered without re-simulating
+    (and completes immediately even in background mode).
+
+    With ``target_success_ci`` and/or ``target_median_ci`` the simulation
+    stops as soon as the 95% confidence interval is that narrow, using at
+    most ``num_simulations`` paths; ``paths_used`` and the achieved
+    half-widths are stored on the forecast.
+
+    The seed (drawn when none is given) is stored on the forecast so
+    ``POST /forecast/{id}/rerun`` can replay the same markets.
+    """
+
+    # Create forecast record
+    db_forecast = RetirementForecast(
+        user_id=user_id,
+        forecast_name=forecast.forecast_name,
         current_age=forecast.current_age,
         retirement_age=forecast.retirement_age,
         life_expectancy=forecast.life_expectancy,
@@ -68,19 +173,41 @@ def create_retirement_forecast(
         volatility=forecast.volatility,
         inflation_rate=forecast.inflation_rate,
         num_simulations=forecast.num_simulations,
+        target_success_ci=forecast.target_success_ci,
+        target_median_ci=forecast.target_median_ci,
+        sampling=forecast.sampling,
+        return_model=forecast.return_model,
+        bootstrap_block_years=forecast.bootstrap_block_years,
+        withdrawal_strategy=forecast.withdrawal_strategy,
+        withdrawal_rate=forecast.withdrawal_rate,
+        guardrail_band=forecast.guardrail_band,
+        guardrail_adjustment=forecast.guardrail_adjustment,
+        withdrawal_floor=forecast.withdrawal_floor,
+        withdrawal_ceiling=forecast.withdrawal_ceiling,
     )
 
-    results = simulator.run_simulation()
+    simulator = _build_simulator(forecast)
+    cache_key = simulator.cache_key()
+    db_forecast.input_hash = cache_key
+    db_forecast.engine_version = ENGINE_VERSION
+    db_forecast.seed = simulator.seed
 
-    # Update forecast with results
-    db_forecast.success_rate = results["success_rate"]
-    db_forecast.median_final_balance = results["median_final_balance"]
-    db_forecast.percentile_10_balance = results["percentile_10_balance"]
-    db_forecast.percentile_90_balance = results["percentile_90_balance"]
-    db_forecast.simulation_data = json.dumps(results["year_stats"])
+    results = forecast_cache.get(cache_key, session)
+
+    if results is None and background:
+        session.add(db_forecast)
+        session.commit()
+        session.refresh(db_forecast)
+        forecast_jobs.submit(db_forecast.id, user_id, simulator)
+        return db_forecast
 
-    from datetime import datetime, timezone
-    db_forecast.last_run = datetime.now(timezone.utc)
+    if results is None:
+        # Run Monte Carlo simulation, keeping the return matrix for later re-runs
+        results, _ = return_matrix_cache.run(simulator)
+        forecast_cache.put(cache_key, results)
+
+    # Update forecast with results
+    apply_simulation_results(db_forecast, results)
 
     session.add(db_forecast)
     session.commit()
@@ -89,8 +216,254 @@ def create_retirement_forecast(
     return db_forecast
 
 
+class ForecastChanges(BaseModel):
+    """Inputs to change when re-running a stored forecast; omitted fields keep their stored values"""
+    forecast_name: Optional[str] = None
+    current_age: Optional[int] = None
+    retirement_age: Optional[int] = None
+    life_expectancy: Optional[int] = None
+    current_savings: Optional[Decimal] = None
+    annual_contribution: Optional[Decimal] = None
+    annual_withdrawal: Optional[Decimal] = None
+    expected_return: Optional[Decimal] = None
+    volatility: Optional[Decimal] = None
+    inflation_rate: Optional[Decimal] = None
+    num_simulations: Optional[int] = None
+    seed: Optional[int] = None
+    target_success_ci: Optional[Decimal] = None
+    target_median_ci: Optional[Decimal] = None
+    sampling: Optional[SamplingMethod] = None
+    return_model: Optional[ReturnModel] = None
+    bootstrap_block_years: Optional[int] = None
+    withdrawal_strategy: Optional[WithdrawalStrategy] = None
+    withdrawal_rate: Optional[Decimal] = None
+    guardrail_band: Optional[Decimal] = None
+    guardrail_adjustment: Optional[Decimal] = None
+    withdrawal_floor: Optional[Decimal] = None
+    withdrawal_ceiling: Optional[Decimal] = None
+
+
+# Headline results compared between a forecast and its re-run
+RESULT_FIELDS = ("success_rate", "median_final_balance", "percentile_10_balance", "percentile_90_balance")
+
+
+@router.post("/forecast/{forecast_id}/rerun")
+def rerun_forecast(forecast_id: int, changes: ForecastChanges, session: Session = Depends(get_session)):
+    """
+    Re-run a stored forecast with some inputs changed, on the same markets
+
+    The stored seed is reused, so the simulation sees the same return
+    paths and the change in results reflects the edited inputs rather
+    than sampling noise. When only inputs that act on balances change
+    (savings, contributions, withdrawals, retirement age, inflation) and
+    the return matrix is still resident, only the balance propagation is
+    recomputed. The forecast is updated in place and the response lists
+    the changed inputs, recomputed stages and each result's change.
+    """
+    db_forecast = session.get(RetirementForecast, forecast_id)
+    if not db_forecast:
+        raise HTTPException(status_code=404, detail="Forecast not found")
+    if db_forecast.status in (ForecastStatus.PENDING, ForecastStatus.RUNNING, ForecastStatus.CANCELLING):
+        raise HTTPException(status_code=400, detail=f"Forecast is still {db_forecast.status}")
+
+    stored = {name: getattr(db_forecast, name) for name in ForecastRequest.model_fields if hasattr(db_forecast, name)}
+    updates = changes.model_dump(exclude_unset=True)
+    try:
+        forecast = ForecastRequest(**{**stored, **updates})
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    changed_parameters = sorted(name for name, value in updates.items() if stored.get(name) != value)
+
+    simulator = _build_simulator(forecast)
+    cache_key = simulator.cache_key()
+    previous = {name: getattr(db_forecast, name) for name in RESULT_FIELDS}
+    previous_engine_version = db_forecast.engine_version
+
+    results = forecast_cache.get(cache_key, session)
+    if results is not None:
+        recomputed = []
+    else:
+        results, reused_returns = return_matrix_cache.run(simulator)
+        forecast_cache.put(cache_key, results)
+        recomputed = ["paths"] if reused_returns else ["returns", "paths"]
+
+    for name, value in forecast.model_dump().items():
+        if hasattr(db_forecast, name):
+            setattr(db_forecast, name, value)
+    db_forecast.input_hash = cache_key
+    db_forecast.engine_version = ENGINE_VERSION
+    apply_simulation_results(db_forecast, results)
+
+    session.add(db_forecast)
+    session.commit()
+    session.refresh(db_forecast)
+
+    return {
+        "forecast": db_forecast,
+        "changed_parameters": changed_parameters,
+        "recomputed": recomputed,
+        # Results of a different engine version may differ even for unchanged inputs
+        "engine_version_changed": previous_engine_version != ENGINE_VERSION,
+        "changes": {
+            name: {
+                "previous": previous[name],
+                "current": getattr(db_forecast, name),
+                "change": (
+                    getattr(db_forecast, name) - previous[name] if previous[name] is not None else None
+                ),
+            }
+            for name in RESULT_FIELDS
+        },
+    }
+
+
+@router.post("/forecast/{forecast_id}/cancel", response_model=RetirementForecast)
+def cancel_forecast(forecast_id: int, session: Session = Depends(get_session)):
+    """
+    Cancel a pending or running background forecast
+
+    A live job is signalled and the forecast shows ``cancelling`` until the
+    job stops and records ``cancelled``.
+    """
+    forecast = session.get(RetirementForecast, forecast_id)
+    if not forecast:
+        raise HTTPException(status_code=404, detail="Forecast not found")
+
+    if forecast.status not in (ForecastStatus.PENDING, ForecastStatus.RUNNING):
+        raise HTTPException(status_code=400, detail=f"Forecast is already {forecast.status}")
+
+    # No live job owns the forecast when, e.g., the server restarted, so it is closed out here
+    status = ForecastStatus.CANCELLING if forecast_jobs.cancel(forecast_id) else ForecastStatus.CANCELLED
+    # Conditional, so a job that finishes meanwhile keeps its final status
+    session.exec(
+        update(RetirementForecast)
+        .where(
+            RetirementForecast.id == forecast_id,
+            RetirementForecast.status.in_((ForecastStatus.PENDING, ForecastStatus.RUNNING)),
+        )
+        .values(status=status, updated_at=datetime.now(timezone.utc)),
+    )
+    session.commit()
+    session.refresh(forecast)
+
+    return forecast
+
+
+@router.get("/cache/stats")
+def get_forecast_cache_stats():
+    """Hit/miss counters and occupancy of the forecast result and return matrix caches"""
+    return {**forecast_cache.stats(), "return_matrices": return_matrix_cache.stats()}
+
+
+@router.delete("/cache")
+def clear_forecast_cache():
+    """Drop all in-memory cached forecast results and return matrices"""
+    forecast_cache.clear()
+    return_matrix_cache.clear()
+    return {"message": "Forecast cache cleared successfully"}
+
+
+@router.get("/historical-returns")
+def get_historical_returns_summary():
+    """Describe the historical returns dataset used by bootstrap forecasts"""
+    if not dataset_path().exists():
+        raise HTTPException(status_code=404, detail="Historical returns dataset is not available")
+    return load_historical_returns(dataset_path()).summary()
+
+
+class TaxOutcomeRequest(ForecastRequest):
+    forecast_name: str = ""
+    pre_tax_fraction: Decimal = Decimal("100")  # Percent of savings held in pre-tax accounts
+    other_income: Decimal = Decimal("0")  # Yearly MAGI besides RMDs, today's dollars
+    filing_status: str = "single"
+    start_year: Optional[int] = None  # Calendar year of current_age; defaults to the current year
+
+
+@router.post("/forecast/tax-outcomes")
+def simulate_tax_outcomes(request: TaxOutcomeRequest):
+    """
+    Simulate a forecast together with its RMD and IRMAA distributions
+
+    Every simulated path gets, per year, the RMD due on its pre-tax balance
+    and the IRMAA tier that RMD plus ``other_income`` lands in, so the
+    results add ``tax_outcomes``: per age, RMD percentiles, the probability
+    of each IRMAA tier and the expected surcharge. Nothing is stored.
+    """
+    _check_tax_options(request.filing_status)
+    if not 0 <= request.pre_tax_fraction <= 100:
+        raise HTTPException(status_code=400, detail="pre_tax_fraction must be between 0 and 100")
+
+    simulator = _build_simulator(
+        request,
+        tax_outcomes=True,
+        pre_tax_fraction=request.pre_tax_fraction,
+        other_income=request.other_income,
+        filing_status=request.filing_status,
+        start_year=request.start_year,
+    )
+    results, _ = return_matrix_cache.run(simulator)
+    return results
+
+
+class SustainableWithdrawalRequest(BaseModel):
+    current_age: int
+    retirement_age: int
+    life_expectancy: int = 95
+    current_savings: Decimal
+    annual_contribution: Decimal
+    expected_return: Decimal
+    volatility: Decimal
+    inflation_rate: Decimal = Decimal("2.5")
+    num_simulations: int = Field(10000, ge=1, le=MAX_VARIANT_SIMULATIONS)
+    seed: Optional[int] = None
+    sampling: SamplingMethod = SamplingMethod.RANDOM
+    return_model: ReturnModel = ReturnModel.NORMAL
+    bootstrap_block_years: int = 5
+    target_success_rates: List[Decimal] = [Decimal("90")]  # Percent
+    curve_points: int = 50
+
+
+@router.post("/withdrawal/solve")
+def solve_sustainable_withdrawal(request: SustainableWithdrawalRequest):
+    """
+    Find the fixed withdrawal that achieves each target success rate
+
+    Solves the maximum sustainable inflation-adjusted withdrawal of every
+    simulated path in closed form, at about the cost of one simulation,
+    and returns the withdrawal for each of ``target_success_rates`` plus
+    the success-rate-versus-withdrawal curve. A forecast with the same
+    inputs, seed and that ``annual_withdrawal`` reproduces the success rate.
+    """
+    _check_return_options(request.sampling, request.return_model, request.bootstrap_block_years)
+    if request.retirement_age >= request.life_expectancy:
+        raise HTTPException(status_code=400, detail="Retirement must start before life expectancy")
+    if not all(0 < target <= 100 for target in request.target_success_rates):
+        raise HTTPException(status_code=400, detail="Target success rates must be above 0 and at most 100")
+    if not 2 <= request.curve_points <= MAX_CURVE_POINTS:
+        raise HTTPException(status_code=400, detail=f"curve_points must be between 2 and {MAX_CURVE_POINTS}")
+
+    # The base simulator only supplies the inputs and shared return paths
+    base = MonteCarloSimulator(
+        current_age=request.current_age,
+        retirement_age=request.retirement_age,
+        life_expectancy=request.life_expectancy,
+        current_savings=request.current_savings,
+        annual_contribution=request.annual_contribution,
+        annual_withdrawal=Decimal("0"),
+        expected_return=request.expected_return,
+        volatility=request.volatility,
+        inflation_rate=request.inflation_rate,
+        num_simulations=request.num_simulations,
+        seed=request.seed,
+        sampling=request.sampling,
+        return_model=request.return_model,
+        bootstrap_block_years=request.bootstrap_block_years,
+    )
+    return SustainableWithdrawalSolver(base).solve(request.target_success_rates, request.curve_points)
+
+
 @router.get("/forecast/{forecast_id}", response_model=RetirementForecast)
-def get_forecast(forecast_id: int, session: Session = Depends(get_session)):
+def get_forecast(forecast_id: int, session: Session = Depends(get_read_session)):
     """Get a specific retirement forecast"""
     forecast = session.get(RetirementForecast, forecast_id)
     if not forecast:
@@ -99,7 +472,7 @@ def get_forecast(forecast_id: int, session: Session = Depends(get_session)):
 
 
 @router.get("/forecasts/user/{user_id}", response_model=List[RetirementForecast])
-def get_user_forecasts(user_id: int, session: Session = Depends(get_session)):
+def get_user_forecasts(user_id: int, session: Session = Depends(get_read_session)):
     """Get all forecasts for a user"""
     forecasts = session.exec(
         select(RetirementForecast).where(RetirementForecast.user_id == user_id),
@@ -108,13 +481,28 @@ def get_user_forecasts(user_id: int, session: Session = Depends(get_session)):
 
 
 @router.get("/forecast/{forecast_id}/details")
-def get_forecast_details(forecast_id: int, session: Session = Depends(get_session)):
-    """Get detailed forecast results including year-by-year projections"""
+def get_forecast_details(
+    forecast_id: int,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    stats: Optional[List[str]] = Query(default=None),
+    session: Session = Depends(get_read_session),
+):
+    """
+    Get detailed forecast results including year-by-year projections
+
+    ``start_year``/``end_year`` (years from today, end exclusive) and
+    ``stats`` (any of median, p10, p90, min, max) limit the projections
+    returned; only the requested statistics are decoded.
+    """
+    if stats is not None and not set(stats) <= set(YEAR_STAT_NAMES):
+        raise HTTPException(status_code=400, detail=f"stats must be among {', '.join(YEAR_STAT_NAMES)}")
+
     forecast = session.get(RetirementForecast, forecast_id)
     if not forecast:
         raise HTTPException(status_code=404, detail="Forecast not found")
 
-    year_stats = json.loads(forecast.simulation_data) if forecast.simulation_data else []
+    year_stats = read_year_stats(forecast.simulation_blob, forecast.simulation_data, start_year, end_year, stats)
 
     return {
         "forecast_id": forecast.id,
@@ -123,6 +511,25 @@ def get_forecast_details(forecast_id: int, session: Session = Depends(get_sessio
         "median_final_balance": float(forecast.median_final_balance) if forecast.median_final_balance else 0,
         "percentile_10_balance": float(forecast.percentile_10_balance) if forecast.percentile_10_balance else 0,
         "percentile_90_balance": float(forecast.percentile_90_balance) if forecast.percentile_90_balance else 0,
+        "percentile_relative_error": (
+            float(forecast.percentile_relative_error) if forecast.percentile_relative_error is not None else None
+        ),
+        "precision": {
+            "confidence_level": 95.0,
+            "paths_used": forecast.paths_used,
+            "success_rate_ci_half_width": (
+                float(forecast.success_rate_ci_half_width)
+                if forecast.success_rate_ci_half_width is not None
+                else None
+            ),
+            "median_ci_half_width": (
+                float(forecast.median_ci_half_width) if forecast.median_ci_half_width is not None else None
+            ),
+            "target_success_ci": (
+                float(forecast.target_success_ci) if forecast.target_success_ci is not None else None
+            ),
+            "target_median_ci": float(forecast.target_median_ci) if forecast.target_median_ci is not None else None,
+        },
         "year_projections": year_stats,
     }
 
@@ -161,21 +568,25 @@ def project_rmds(
         additional_withdrawals=request.additional_withdrawals,
     )
 
-    # Save projections to database
-    for proj in projections:
-        db_proj = RMDProjection(
-            user_id=user_id,
-            forecast_id=forecast_id,
-            year=proj["year"],
-            age=proj["age"],
-            account_balance=Decimal(str(proj["account_balance"])),
-            rmd_amount=Decimal(str(proj["rmd_amount"])),
-            life_expectancy_factor=Decimal(str(proj["life_expectancy_factor"])),
-            pre_tax_balance=Decimal(str(proj["account_balance"])),
-        )
-        session.add(db_proj)
-
-    session.commit()
+    # Replace any earlier projections for this user and forecast
+    replace_projections(
+        session,
+        RMDProjection,
+        [(user_id, forecast_id)],
+        [
+            {
+                "user_id": user_id,
+                "forecast_id": forecast_id,
+                "year": proj["year"],
+                "age": proj["age"],
+                "account_balance": Decimal(str(proj["account_balance"])),
+                "rmd_amount": Decimal(str(proj["rmd_amount"])),
+                "life_expectancy_factor": Decimal(str(proj["life_expectancy_factor"])),
+                "pre_tax_balance": Decimal(str(proj["account_balance"])),
+            }
+            for proj in projections
+        ],
+    )
 
     return {
         "user_id": user_id,
@@ -188,7 +599,7 @@ def project_rmds(
 def get_user_rmd_projections(
     user_id: int,
     forecast_id: Optional[int] = None,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
 ):
     """Get RMD projections for a user"""
     query = select(RMDProjection).where(RMDProjection.user_id == user_id)
@@ -196,7 +607,7 @@ def get_user_rmd_projections(
     if forecast_id:
         query = query.where(RMDProjection.forecast_id == forecast_id)
 
-    projections = session.exec(query).all()
+    projections = session.exec(query.order_by(RMDProjection.forecast_id, RMDProjection.age)).all()
 
     return {
         "user_id": user_id,
@@ -222,6 +633,8 @@ class IRMAARequest(BaseModel):
     investment_income: Decimal = Decimal("0.00")
     other_income: Decimal = Decimal("0.00")
     filing_status: str = "single"
+    start_year: Optional[int] = None  # Calendar year of starting_age; defaults to the current year
+    threshold_inflation: Optional[Decimal] = None  # Percent; defaults to the bracket file's rate
 
 
 @router.post("/irmaa/project")
@@ -272,29 +685,35 @@ def project_irmaa(
         income_sources=income_sources,
         rmd_projections=rmd_projections,
         filing_status=request.filing_status,
+        start_year=request.start_year,
+        threshold_inflation=float(request.threshold_inflation) if request.threshold_inflation is not None else None,
     )
 
-    # Save to database
-    for proj in projections:
-        db_proj = IRMAAProjection(
-            user_id=user_id,
-            forecast_id=forecast_id,
-            year=proj["year"],
-            age=proj["age"],
-            social_security=request.social_security,
-            pension=request.pension,
-            investment_income=request.investment_income,
-            rmd_income=Decimal(str(proj["rmd_income"])),
-            other_income=request.other_income,
-            adjusted_gross_income=Decimal(str(proj["magi"])),
-            magi=Decimal(str(proj["magi"])),
-            irmaa_tier=proj["irmaa_tier"],
-            monthly_premium_surcharge=Decimal(str(proj["monthly_surcharge"])),
-            annual_premium_surcharge=Decimal(str(proj["annual_surcharge"])),
-        )
-        session.add(db_proj)
-
-    session.commit()
+    # Replace any earlier projections for this user and forecast
+    replace_projections(
+        session,
+        IRMAAProjection,
+        [(user_id, forecast_id)],
+        [
+            {
+                "user_id": user_id,
+                "forecast_id": forecast_id,
+                "year": proj["year"],
+                "age": proj["age"],
+                "social_security": request.social_security,
+                "pension": request.pension,
+                "investment_income": request.investment_income,
+                "rmd_income": Decimal(str(proj["rmd_income"])),
+                "other_income": request.other_income,
+                "adjusted_gross_income": Decimal(str(proj["magi"])),
+                "magi": Decimal(str(proj["magi"])),
+                "irmaa_tier": proj["irmaa_tier"],
+                "monthly_premium_surcharge": Decimal(str(proj["monthly_surcharge"])),
+                "annual_premium_surcharge": Decimal(str(proj["annual_surcharge"])),
+            }
+            for proj in projections
+        ],
+    )
 
     return {
         "user_id": user_id,
@@ -307,7 +726,7 @@ def project_irmaa(
 def get_user_irmaa_projections(
     user_id: int,
     forecast_id: Optional[int] = None,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
 ):
     """Get IRMAA projections for a user"""
     query = select(IRMAAProjection).where(IRMAAProjection.user_id == user_id)
@@ -315,7 +734,7 @@ def get_user_irmaa_projections(
     if forecast_id:
         query = query.where(IRMAAProjection.forecast_id == forecast_id)
 
-    projections = session.exec(query).all()
+    projections = session.exec(query.order_by(IRMAAProjection.forecast_id, IRMAAProjection.age)).all()
 
     return {
         "user_id": user_id,
@@ -334,65 +753,396 @@ def get_user_irmaa_projections(
     }
 
 
-@router.get("/user/{user_id}/tax-bucket-summary")
-def get_user_tax_bucket_summary(user_id: int, session: Session = Depends(get_session)):
-    """Get summary of all tax buckets across all accounts for retirement planning"""
+class RothConversionSetting(BaseModel):
+    amount: Decimal  # Converted each year
+    years: int  # Number of years, starting at retirement
 
-    # Get all accounts for user (would need to join through accounts table)
-    from ..models.account import Account
-    accounts = session.exec(select(Account).where(Account.user_id == user_id)).all()
 
-    summary = {
-        "user_id": user_id,
-        "total_pre_tax": Decimal("0.00"),
-        "total_roth": Decimal("0.00"),
-        "total_after_tax": Decimal("0.00"),
-        "total_taxable": Decimal("0.00"),
-        "accounts": [],
+class ScenarioSweepRequest(BaseModel):
+    sweep_name: str
+    current_age: int
+    life_expectancy: int = 95
+    current_savings: Decimal
+    expected_return: Decimal
+    volatility: Decimal
+    inflation_rate: Decimal = Decimal("2.5")
+    num_simulations: int = Field(10000, ge=1, le=MAX_VARIANT_SIMULATIONS)
+    seed: Optional[int] = None
+    sampling: SamplingMethod = SamplingMethod.RANDOM
+    return_model: ReturnModel = ReturnModel.NORMAL
+    bootstrap_block_years: int = 5
+
+    # Grid axes; every combination becomes one scenario
+    retirement_ages: List[int]
+    annual_contributions: List[Decimal]
+    withdrawal_rates: List[Decimal]  # Percent of the balance at retirement
+    roth_conversions: List[Optional[RothConversionSetting]] = [None]
+
+    # Tax treatment shared by all scenarios
+    pre_tax_percent: Decimal = Decimal("100")  # Share of current savings in pre-tax accounts
+    tax_rate: Decimal = Decimal("0")  # Ordinary income rate on pre-tax withdrawals
+    conversion_tax_rate: Optional[Decimal] = None  # Defaults to tax_rate
+
+
+@router.post("/scenarios/sweep", response_model=List[RetirementScenario])
+def sweep_retirement_scenarios(
+    user_id: int,
+    sweep: ScenarioSweepRequest,
+    session: Session = Depends(get_session),
+):
+    """
+    Evaluate a grid of retirement scenarios in one vectorized pass
+
+    Every combination of retirement age, contribution, withdrawal rate and
+    Roth conversion setting is simulated against the same return paths
+    (common random numbers), so differences between scenarios are not
+    masked by sampling noise. One ``RetirementScenario`` row is stored per
+    grid point with its success rate, median lifetime taxes and median
+    after-tax estate value.
+    """
+    _check_return_options(sweep.sampling, sweep.return_model, sweep.bootstrap_block_years)
+
+    grid = list(product(
+        sweep.retirement_ages,
+        sweep.annual_contributions,
+        sweep.withdrawal_rates,
+        sweep.roth_conversions,
+    ))
+    if not grid:
+        raise HTTPException(status_code=400, detail="Every grid axis needs at least one value")
+    if len(grid) > MAX_SWEEP_SCENARIOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Sweep has {len(grid)} scenarios; the limit is {MAX_SWEEP_SCENARIOS}",
+        )
+    if sweep.current_age >= sweep.life_expectancy or max(sweep.retirement_ages) > sweep.life_expectancy:
+        raise HTTPException(status_code=400, detail="Ages must be below life expectancy")
+
+    # The base simulator only supplies the shared return paths
+    base = MonteCarloSimulator(
+        current_age=sweep.current_age,
+        retirement_age=sweep.current_age,
+        life_expectancy=sweep.life_expectancy,
+        current_savings=sweep.current_savings,
+        annual_contribution=Decimal("0"),
+        annual_withdrawal=Decimal("0"),
+        expected_return=sweep.expected_return,
+        volatility=sweep.volatility,
+        inflation_rate=sweep.inflation_rate,
+        num_simulations=sweep.num_simulations,
+        seed=sweep.seed,
+        sampling=sweep.sampling,
+        return_model=sweep.return_model,
+        bootstrap_block_years=sweep.bootstrap_block_years,
+    )
+    results = ScenarioSweep(
+        base,
+        retirement_ages=[retirement_age for retirement_age, _, _, _ in grid],
+        annual_contributions=[contribution for _, contribution, _, _ in grid],
+        withdrawal_rates=[withdrawal_rate for _, _, withdrawal_rate, _ in grid],
+        roth_conversion_amounts=[roth.amount if roth else None for _, _, _, roth in grid],
+        roth_conversion_years=[roth.years if roth else None for _, _, _, roth in grid],
+        pre_tax_percent=sweep.pre_tax_percent,
+        tax_rate=sweep.tax_rate,
+        conversion_tax_rate=sweep.conversion_tax_rate,
+    ).run()
+
+    description = f"{sweep.sweep_name}: {sweep.num_simulations} shared paths"
+    if sweep.seed is not None:
+        description += f", seed {sweep.seed}"
+
+    scenarios = []
+    for (retirement_age, contribution, withdrawal_rate, roth), result in zip(grid, results):
+        name = f"Retire {retirement_age}, contribute ${contribution:,.0f}, withdraw {withdrawal_rate}%"
+        if roth:
+            name += f", convert ${roth.amount:,.0f} x {roth.years}y"
+        scenario = RetirementScenario(
+            user_id=user_id,
+            scenario_name=name,
+            description=description,
+            retirement_age=retirement_age,
+            annual_contribution=contribution,
+            withdrawal_rate=withdrawal_rate,
+            roth_conversion_amount=roth.amount if roth else None,
+            roth_conversion_years=roth.years if roth else None,
+            success_rate=result["success_rate"],
+            total_taxes_paid=result["total_taxes_paid"],
+            estate_value=result["estate_value"],
+        )
+        session.add(scenario)
+        scenarios.append(scenario)
+
+    session.commit()
+    for scenario in scenarios:
+        session.refresh(scenario)
+
+    return scenarios
+
+
+class RothOptimizationRequest(BaseModel):
+    scenario_ids: Optional[List[int]] = None  # Defaults to every scenario of the user
+    current_age: int
+    life_expectancy: int = 95
+    current_savings: Decimal
+    expected_return: Decimal
+    volatility: Decimal
+    inflation_rate: Decimal = Decimal("2.5")
+    num_simulations: int = Field(10000, ge=1, le=MAX_VARIANT_SIMULATIONS)
+    seed: Optional[int] = None
+    sampling: SamplingMethod = SamplingMethod.RANDOM
+    return_model: ReturnModel = ReturnModel.NORMAL
+    bootstrap_block_years: int = 5
+
+    # Search space; every amount is tried with every number of years, plus no conversion
+    conversion_amounts: List[Decimal]  # Converted each year
+    conversion_years: List[int]  # Number of years, starting at retirement
+    objective: RothObjective = RothObjective.TAXES
+    min_success_rate: Decimal = Decimal("80")
+
+    # Tax treatment shared by all scenarios
+    pre_tax_percent: Decimal = Decimal("100")
+    tax_rate: Decimal = Decimal("0")
+    conversion_tax_rate: Optional[Decimal] = None  # Defaults to tax_rate
+    other_income: Decimal = Decimal("0")  # Yearly MAGI besides withdrawals and conversions, today's dollars
+    filing_status: str = "single"
+    start_year: Optional[int] = None  # Calendar year of current_age; defaults to the current year
+
+
+@router.post("/scenarios/roth-optimize")
+def optimize_roth_conversions(
+    user_id: int,
+    request: RothOptimizationRequest,
+    session: Session = Depends(get_session),
+):
+    """
+    Find the Roth conversion schedule of each scenario that best meets an objective
+
+    Every conversion amount and number of years is evaluated for every
+    scenario against the same return paths, with RMDs and IRMAA
+    surcharges, minimizing lifetime taxes plus surcharges (``taxes``) or
+    maximizing the after-tax estate (``estate``) among schedules whose
+    success rate reaches ``min_success_rate``. Candidates that are
+    confidently infeasible or dominated are dropped after each block of
+    paths. The winning schedule and its results are written back to the
+    scenario rows. Scenarios where no schedule reaches ``min_success_rate``
+    are left unchanged and reported with ``scenario_updated`` false,
+    together with the schedule that came closest.
+    """
+    _check_return_options(request.sampling, request.return_model, request.bootstrap_block_years)
+    _check_tax_options(request.filing_status)
+
+    query = select(RetirementScenario).where(RetirementScenario.user_id == user_id)
+    if request.scenario_ids is not None:
+        query = query.where(RetirementScenario.id.in_(request.scenario_ids))
+    scenarios = session.exec(query.order_by(RetirementScenario.id)).all()
+    if not scenarios:
+        raise HTTPException(status_code=404, detail="No scenarios found")
+    if request.scenario_ids is not None and len(scenarios) != len(set(request.scenario_ids)):
+        raise HTTPException(status_code=404, detail="Scenario not found")
+
+    if not request.conversion_amounts or not request.conversion_years:
+        raise HTTPException(status_code=400, detail="conversion_amounts and conversion_years need at least one value")
+    if min(request.conversion_amounts) < 0 or min(request.conversion_years) < 0:
+        raise HTTPException(status_code=400, detail="Conversion amounts and years must not be negative")
+    candidates = (len(request.conversion_amounts) * len(request.conversion_years) + 1) * len(scenarios)
+    if candidates > MAX_ROTH_CANDIDATES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Search has {candidates} candidates; the limit is {MAX_ROTH_CANDIDATES}",
+        )
+    if request.current_age >= request.life_expectancy or any(
+        s.retirement_age > request.life_expectancy for s in scenarios
+    ):
+        raise HTTPException(status_code=400, detail="Ages must be below life expectancy")
+
+    # The base simulator supplies the shared return paths, in blocks of one pruning round
+    base = MonteCarloSimulator(
+        current_age=request.current_age,
+        retirement_age=request.current_age,
+        life_expectancy=request.life_expectancy,
+        current_savings=request.current_savings,
+        annual_contribution=Decimal("0"),
+        annual_withdrawal=Decimal("0"),
+        expected_return=request.expected_return,
+        volatility=request.volatility,
+        inflation_rate=request.inflation_rate,
+        num_simulations=request.num_simulations,
+        seed=request.seed,
+        sampling=request.sampling,
+        return_model=request.return_model,
+        bootstrap_block_years=request.bootstrap_block_years,
+        chunk_size=SEARCH_BLOCK_SIZE,
+        other_income=request.other_income,
+        filing_status=request.filing_status,
+        start_year=request.start_year,
+    )
+    optimizer = RothConversionOptimizer(
+        base,
+        retirement_ages=[s.retirement_age for s in scenarios],
+        annual_contributions=[s.annual_contribution for s in scenarios],
+        withdrawal_rates=[s.withdrawal_rate for s in scenarios],
+        conversion_amounts=request.conversion_amounts,
+        conversion_years=request.conversion_years,
+        objective=request.objective,
+        min_success_rate=request.min_success_rate,
+        pre_tax_percent=request.pre_tax_percent,
+        tax_rate=request.tax_rate,
+        conversion_tax_rate=request.conversion_tax_rate,
+    )
+    results = optimizer.run()
+
+    now = datetime.now(timezone.utc)
+    for scenario, result in zip(scenarios, results):
+        # Never replace the stored schedule with one that breaks the success-rate constraint
+        if not result["meets_success_target"]:
+            continue
+        scenario.roth_conversion_amount = result["roth_conversion_amount"]
+        scenario.roth_conversion_years = result["roth_conversion_years"]
+        scenario.success_rate = result["success_rate"]
+        scenario.total_taxes_paid = result["total_taxes_paid"]
+        scenario.estate_value = result["estate_value"]
+        scenario.updated_at = now
+        session.add(scenario)
+    session.commit()
+
+    return {
+        "objective": optimizer.objective,
+        "min_success_rate": request.min_success_rate,
+        "num_simulations": request.num_simulations,
+        "seed": base.seed,
+        "results": [
+            {"scenario_id": scenario.id, "scenario_updated": result["meets_success_target"], **result}
+            for scenario, result in zip(scenarios, results)
+        ],
     }
 
-    for account in accounts:
-        buckets = session.exec(
-            select(InvestmentTaxBucket).where(InvestmentTaxBucket.account_id == account.id),
-        ).all()
 
-        account_summary = {
-            "account_id": account.id,
-            "account_name": account.name,
-            "buckets": [],
-        }
-
-        for bucket in buckets:
-            account_summary["buckets"].append(
-                {
-                    "tax_classification": bucket.tax_classification,
-                    "balance": float(bucket.balance),
-                },
-            )
-
-            # Add to totals
-            if bucket.tax_classification == "pre_tax":
-                summary["total_pre_tax"] += bucket.balance
-            elif bucket.tax_classification == "roth":
-                summary["total_roth"] += bucket.balance
-            elif bucket.tax_classification == "after_tax":
-                summary["total_after_tax"] += bucket.balance
-            elif bucket.tax_classification == "taxable":
-                summary["total_taxable"] += bucket.balance
-
-        if account_summary["buckets"]:
-            summary["accounts"].append(account_summary)
-
-    # Convert Decimal to float for JSON response
-    summary["total_pre_tax"] = float(summary["total_pre_tax"])
-    summary["total_roth"] = float(summary["total_roth"])
-    summary["total_after_tax"] = float(summary["total_after_tax"])
-    summary["total_taxable"] = float(summary["total_taxable"])
-    summary["total_all"] = (
-            summary["total_pre_tax"] +
-            summary["total_roth"] +
-            summary["total_after_tax"] +
-            summary["total_taxable"]
+@router.get("/scenarios/user/{user_id}", response_model=List[RetirementScenario])
+def get_user_scenarios(user_id: int, session: Session = Depends(get_read_session)):
+    """Get all retirement scenarios for a user"""
+    scenarios = session.exec(
+        select(RetirementScenario).where(RetirementScenario.user_id == user_id),
+    ).all()
+    return scenarios
+
+
+class AssetAssumption(BaseModel):
+    expected_return: Decimal
+    volatility: Decimal
+
+
+class MultiAssetForecastRequest(BaseModel):
+    current_age: int
+    retirement_age: int
+    life_expectancy: int = 95
+    annual_contribution: Decimal
+    annual_withdrawal: Decimal
+    inflation_rate: Decimal = Decimal("2.5")
+    num_simulations: int = 10000
+    streaming: Optional[bool] = None
+    seed: Optional[int] = None
+    target_success_ci: Optional[Decimal] = None
+    target_median_ci: Optional[Decimal] = None
+    rebalance_years: int = 1  # 0 lets allocations drift
+    contribution_bucket: TaxClassification = TaxClassification.PRE_TAX
+    asset_assumptions: Dict[InvestmentType, AssetAssumption] = {}  # Overrides of the default assumptions
+    tax_outcomes: bool = False  # Add RMD and IRMAA distributions from the simulated pre-tax bucket
+    other_income: Decimal = Decimal("0")  # Yearly MAGI besides RMDs, today's dollars
+    filing_status: str = "single"
+    start_year: Optional[int] = None  # Calendar year of current_age; defaults to the current year
+
+
+@router.post("/multi-asset")
+def run_multi_asset_forecast(
+    user_id: int,
+    forecast: MultiAssetForecastRequest,
+    session: Session = Depends(get_session),
+):
+    """
+    Simulate the user's actual portfolio across asset classes and tax buckets
+
+    The allocation is built from the user's investment holdings and the
+    tax bucket balances of their accounts; asset class returns are drawn
+    with their correlations and each tax bucket is tracked separately.
+    Returns the usual summary plus the starting allocation and per-bucket
+    final balance percentiles and yearly medians, and with
+    ``tax_outcomes`` the RMD and IRMAA distributions of the pre-tax bucket.
+    """
+    if forecast.rebalance_years < 0:
+        raise HTTPException(status_code=400, detail="rebalance_years must not be negative")
+    _check_tax_options(forecast.filing_status)
+
+    account_ids = session.exec(select(Account.id).where(Account.user_id == user_id)).all()
+    investments = session.exec(select(Investment).where(Investment.user_id == user_id)).all()
+    tax_buckets = session.exec(
+        select(InvestmentTaxBucket).where(InvestmentTaxBucket.account_id.in_(account_ids)),
+    ).all() if account_ids else []
+
+    try:
+        allocation = PortfolioAllocation.from_accounts(investments, tax_buckets)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    simulator = MultiAssetSimulator(
+        allocation,
+        current_age=forecast.current_age,
+        retirement_age=forecast.retirement_age,
+        life_expectancy=forecast.life_expectancy,
+        annual_contribution=forecast.annual_contribution,
+        annual_withdrawal=forecast.annual_withdrawal,
+        inflation_rate=forecast.inflation_rate,
+        num_simulations=forecast.num_simulations,
+        seed=forecast.seed,
+        streaming=forecast.streaming,
+        target_success_ci=forecast.target_success_ci,
+        target_median_ci=forecast.target_median_ci,
+        rebalance_years=forecast.rebalance_years,
+        contribution_bucket=forecast.contribution_bucket,
+        asset_assumptions={
+            asset_type: (assumption.expected_return, assumption.volatility)
+            for asset_type, assumption in forecast.asset_assumptions.items()
+        },
+        tax_outcomes=forecast.tax_outcomes,
+        other_income=forecast.other_income,
+        filing_status=forecast.filing_status,
+        start_year=forecast.start_year,
     )
+    results = simulator.run_simulation()
+    return {"user_id": user_id, **results}
 
+
+@router.get("/user/{user_id}/tax-bucket-summary")
+def get_user_tax_bucket_summary(user_id: int, session: Session = Depends(get_read_session)):
+    """Get summary of all tax buckets across all accounts for retirement planning"""
+    # One round trip: bucket balances per account and classification
+    rows = session.exec(
+        select(
+            Account.id,
+            Account.name,
+            InvestmentTaxBucket.tax_classification,
+            func.sum(InvestmentTaxBucket.balance),
+        )
+        .join(InvestmentTaxBucket, InvestmentTaxBucket.account_id == Account.id)
+        .where(Account.user_id == user_id)
+        .group_by(InvestmentTaxBucket.tax_classification, Account.id, Account.name)
+        .order_by(Account.id, InvestmentTaxBucket.tax_classification),
+    ).all()
+
+    totals = {classification: Decimal("0.00") for classification in TaxClassification}
+    accounts: Dict[int, Dict] = {}
+    for account_id, account_name, classification, balance in rows:
+        balance = Decimal(balance or 0)
+        totals[classification] += balance
+        account_summary = accounts.setdefault(
+            account_id,
+            {"account_id": account_id, "account_name": account_name, "buckets": []},
+        )
+        account_summary["buckets"].append({"tax_classification": classification, "balance": float(balance)})
+
+    summary = {
+        "user_id": user_id,
+        **{f"total_{classification}": float(total) for classification, total in totals.items()},
+        "accounts": list(accounts.values()),
+    }
+    summary["total_all"] = float(sum(totals.values()))
     return summary
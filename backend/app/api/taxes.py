@@ -1,28 +1,40 @@
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select
 
-from ..core.database import get_session
+from ..core.database import get_read_session, get_session
 from ..models.tax import TaxRecord
+from .pagination import Page, PageParams, keyset_page, page_rows
 
 router = APIRouter(prefix="/taxes", tags=["taxes"])
 
 
-@router.get("/", response_model=List[TaxRecord])
-def get_tax_records(user_id: int = None, tax_year: int = None, session: Session = Depends(get_session)):
-    """Get all tax records, optionally filtered by user and year"""
+@router.get("/", response_model=Page[TaxRecord])
+def get_tax_records(
+    response: Response,
+    user_id: int = None,
+    tax_year: int = None,
+    page: PageParams = Depends(),
+    session: Session = Depends(get_read_session),
+):
+    """
+    Get tax records, latest year first, optionally filtered by user and year
+
+    Returns one page of at most ``limit`` items; pass its ``next_cursor``
+    back as ``cursor`` for the next one.
+    """
     query = select(TaxRecord)
     if user_id:
         query = query.where(TaxRecord.user_id == user_id)
     if tax_year:
         query = query.where(TaxRecord.tax_year == tax_year)
-    records = session.exec(query).all()
-    return records
+
+    keys = (TaxRecord.tax_year, TaxRecord.id)
+    records = session.exec(keyset_page(query, keys, page, descending=True)).all()
+    return page_rows(records, keys, page, response)
 
 
 @router.get("/{tax_id}", response_model=TaxRecord)
-def get_tax_record(tax_id: int, session: Session = Depends(get_session)):
+def get_tax_record(tax_id: int, session: Session = Depends(get_read_session)):
     """Get a specific tax record"""
     record = session.get(TaxRecord, tax_id)
     if not record:
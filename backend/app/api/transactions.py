@@ -1,45 +1,76 @@
 from datetime import datetime, timezone
-from typing import List
+from decimal import Decimal
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlmodel import select
 
-from ..core.database import get_session
+from ..core.database import AnyAsyncSession, get_async_read_session, get_async_session
 from ..models.account import Account
 from ..models.ledger import LedgerEntry, EntryType
 from ..models.transaction import Transaction
+from .pagination import Page, PageParams, as_utc, keyset_page, page_rows
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
 
-@router.get("/", response_model=List[Transaction])
-def get_transactions(user_id: int = None, account_id: int = None, session: Session = Depends(get_session)):
-    """Get all transactions, optionally filtered by user or account"""
+@router.get("/", response_model=Page[Transaction])
+async def get_transactions(
+    response: Response,
+    user_id: int = None,
+    account_id: int = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category: Optional[str] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None,
+    page: PageParams = Depends(),
+    session: AnyAsyncSession = Depends(get_async_read_session),
+):
+    """
+    Get transactions, newest first, optionally filtered by user, account,
+    date range (``end_date`` exclusive), category or amount range
+
+    Returns one page of at most ``limit`` items; pass its ``next_cursor``
+    back as ``cursor`` for the next one.
+    """
     query = select(Transaction)
     if user_id:
         query = query.where(Transaction.user_id == user_id)
     if account_id:
         query = query.where(Transaction.account_id == account_id)
-    transactions = session.exec(query).all()
-    return transactions
+    if start_date is not None:
+        query = query.where(Transaction.transaction_date >= as_utc(start_date))
+    if end_date is not None:
+        query = query.where(Transaction.transaction_date < as_utc(end_date))
+    if category is not None:
+        query = query.where(Transaction.category == category)
+    if min_amount is not None:
+        query = query.where(Transaction.amount >= min_amount)
+    if max_amount is not None:
+        query = query.where(Transaction.amount <= max_amount)
+
+    keys = (Transaction.transaction_date, Transaction.id)
+    transactions = (await session.exec(keyset_page(query, keys, page, descending=True))).all()
+    return page_rows(transactions, keys, page, response)
 
 
 @router.get("/{transaction_id}", response_model=Transaction)
-def get_transaction(transaction_id: int, session: Session = Depends(get_session)):
+async def get_transaction(transaction_id: int, session: AnyAsyncSession = Depends(get_async_read_session)):
     """Get a specific transaction"""
-    transaction = session.get(Transaction, transaction_id)
+    transaction = await session.get(Transaction, transaction_id)
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     return transaction
 
 
 @router.post("/", response_model=Transaction)
-def create_transaction(transaction: Transaction, session: Session = Depends(get_session)):
+async def create_transaction(transaction: Transaction, session: AnyAsyncSession = Depends(get_async_session)):
     """Create a new transaction with double-entry ledger entries"""
     # Add transaction
     session.add(transaction)
-    session.commit()
-    session.refresh(transaction)
+    await session.commit()
+    await session.refresh(transaction)
 
     # Create ledger entries (double-entry accounting)
     # Debit entry for the account
@@ -55,23 +86,23 @@ def create_transaction(transaction: Transaction, session: Session = Depends(get_
     session.add(debit_entry)
 
     # Update account balance
-    account = session.get(Account, transaction.account_id)
+    account = await session.get(Account, transaction.account_id)
     if account:
         account.balance += transaction.amount
         account.updated_at = datetime.now(timezone.utc)
         session.add(account)
 
-    session.commit()
+    await session.commit()
     return transaction
 
 
 @router.delete("/{transaction_id}")
-def delete_transaction(transaction_id: int, session: Session = Depends(get_session)):
+async def delete_transaction(transaction_id: int, session: AnyAsyncSession = Depends(get_async_session)):
     """Delete a transaction"""
-    transaction = session.get(Transaction, transaction_id)
+    transaction = await session.get(Transaction, transaction_id)
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
-    session.delete(transaction)
-    session.commit()
+    await session.delete(transaction)
+    await session.commit()
     return {"message": "Transaction deleted successfully"}
@@ -1,23 +1,39 @@
-from typing import List
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select
 
-from ..core.database import get_session
+from ..core.database import get_read_session, get_session
 from ..models.user import User
+from .pagination import Page, PageParams, keyset_page, page_rows
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.get("/", response_model=List[User])
-def get_users(session: Session = Depends(get_session)):
-    """Get all users"""
-    users = session.exec(select(User)).all()
-    return users
+@router.get("/", response_model=Page[User])
+def get_users(
+    response: Response,
+    is_active: Optional[bool] = None,
+    page: PageParams = Depends(),
+    session: Session = Depends(get_read_session),
+):
+    """
+    Get users, optionally filtered by status
+
+    Returns one page of at most ``limit`` items; pass its ``next_cursor``
+    back as ``cursor`` for the next one.
+    """
+    query = select(User)
+    if is_active is not None:
+        query = query.where(User.is_active == is_active)
+
+    keys = (User.id,)
+    users = session.exec(keyset_page(query, keys, page)).all()
+    return page_rows(users, keys, page, response)
 
 
 @router.get("/{user_id}", response_model=User)
-def get_user(user_id: int, session: Session = Depends(get_session)):
+def get_user(user_id: int, session: Session = Depends(get_read_session)):
     """Get a specific user"""
     user = session.get(User, user_id)
     if not user:
@@ -1,5 +1,6 @@
+import asyncio
 from datetime import datetime, timezone
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
@@ -12,8 +13,13 @@ active_connections: Dict[int, Set[WebSocket]] = {}
 class ConnectionManager:
     """Manages WebSocket connections for real-time sync"""
 
+    def __init__(self):
+        # Event loop serving the connections, used to notify from worker threads
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
     async def connect(self, websocket: WebSocket, user_id: int):
         """Connect a new WebSocket client"""
+        self.loop = asyncio.get_running_loop()
         await websocket.accept()
         if user_id not in active_connections:
             active_connections[user_id] = set()
@@ -52,6 +58,21 @@ class ConnectionManager:
         }
         await self.broadcast_to_user(user_id, message)
 
+    def broadcast_data_change_threadsafe(
+        self,
+        user_id: int,
+        resource_type: str,
+        action: str,
+        data: dict = None,
+    ):
+        """Notify clients from a thread that is not running the event loop"""
+        if self.loop is None or self.loop.is_closed() or user_id not in active_connections:
+            return
+        asyncio.run_coroutine_threadsafe(
+            self.broadcast_data_change(user_id, resource_type, action, data),
+            self.loop,
+        )
+
 
 manager = ConnectionManager()
 
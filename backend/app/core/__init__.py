@@ -1,4 +1,9 @@
 from .config import settings
-from .database import create_db_and_tables, get_session
+from .database import (
+    create_db_and_tables, get_async_read_session, get_async_session, get_read_session, get_session,
+)
 
-__all__ = ["settings", "create_db_and_tables", "get_session"]
+__all__ = [
+    "settings", "create_db_and_tables", "get_session", "get_async_session", "get_read_session",
+    "get_async_read_session",
+]
@@ -1,9 +1,78 @@
+import itertools
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
+
+from fastapi import Request, Response
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import QueuePool
 from sqlmodel import create_engine, SQLModel, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from .config import settings
+from .pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, pool_stats
+
+
+def _engine_options(url: str, poolclass: type) -> Dict[str, Any]:
+    """Logging, pool and statement timeout options from the settings
+
+    SQLite keeps SQLAlchemy's default pool, which takes no sizing options.
+    """
+    options: Dict[str, Any] = {"echo": settings.database_echo}
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        return options
+
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        pool_pre_ping=settings.database_pool_pre_ping,
+    )
+    if backend == "postgresql" and settings.database_statement_timeout_ms > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.database_statement_timeout_ms}"}
+    return options
+
+
+def _has_async_driver(url: str) -> bool:
+    """Whether ``create_async_engine`` can open the URL (e.g. not with SQLite's sync driver)"""
+    parsed = make_url(url)
+    return parsed.get_dialect().get_async_dialect_cls(parsed).is_async
+
 
 # Create database engine
-engine = create_engine(settings.database_url, echo=True)
+engine = create_engine(settings.database_url, **_engine_options(settings.database_url, InstrumentedQueuePool))
+
+# Async engines are used only when enabled and every database URL names a driver with async support
+database_async = settings.database_async and all(
+    _has_async_driver(url) for url in [settings.database_url, *settings.get_read_database_urls()]
+)
+
+# Async engine for the async routers; the same postgresql+psycopg URL selects
+# psycopg 3's async driver. None runs those routers on the sync engine instead.
+async_engine: Optional[AsyncEngine] = (
+    create_async_engine(settings.database_url, **_engine_options(settings.database_url, InstrumentedAsyncQueuePool))
+    if database_async else None
+)
+
+# Read replicas, with a sync and (if enabled) async engine each, in the same order
+read_engines: List[Engine] = [
+    create_engine(url, **_engine_options(url, InstrumentedQueuePool)) for url in settings.get_read_database_urls()
+]
+async_read_engines: List[AsyncEngine] = [
+    create_async_engine(url, **_engine_options(url, InstrumentedAsyncQueuePool))
+    for url in settings.get_read_database_urls()
+] if database_async else []
+
+READ_REPLICA_POLICIES = ("round_robin", "least_connections")
+# Holds the time until which the client's reads go to the primary
+READ_PRIMARY_COOKIE = "finapp_read_primary_until"
+
+# Rows are fetched before a statement returns, as AsyncSession does
+_BUFFERED = {"prebuffer_rows": True}
 
 
 def create_db_and_tables():
@@ -11,7 +80,153 @@ def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
 
 
+def database_pool_stats() -> Dict[str, Any]:
+    """Occupancy and checkout telemetry of the primary and replica engine pools"""
+    return {
+        "sync": pool_stats(engine.pool),
+        "async": pool_stats(async_engine.pool) if async_engine is not None else None,
+        "read_replicas": [pool_stats(read_engine.pool) for read_engine in read_engines],
+        "async_read_replicas": [pool_stats(read_engine.pool) for read_engine in async_read_engines],
+    }
+
+
+async def dispose_async_engines():
+    """Close the connections of every async engine"""
+    for async_bind in ([async_engine] if async_engine is not None else []) + async_read_engines:
+        await async_bind.dispose()
+
+
+class ReplicaRouter:
+    """Picks the engine that serves a read: a replica, or the primary if there is none
+
+    ``round_robin`` takes the replicas in turn; ``least_connections`` takes
+    the one with the fewest connections checked out of its pool.
+    """
+
+    def __init__(self, primary, replicas: Sequence, policy: str):
+        if policy not in READ_REPLICA_POLICIES:
+            raise ValueError(f"READ_REPLICA_POLICY must be one of {', '.join(READ_REPLICA_POLICIES)}")
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.policy = policy
+        self._turns = itertools.count()
+
+    def pick(self, use_primary: bool = False):
+        if use_primary or not self.replicas:
+            return self.primary
+        if self.policy == "least_connections":
+            return min(self.replicas, key=_connections_in_use)
+        return self.replicas[next(self._turns) % len(self.replicas)]
+
+
+def _connections_in_use(bind) -> int:
+    return bind.pool.checkedout() if isinstance(bind.pool, QueuePool) else 0
+
+
+read_router = ReplicaRouter(engine, read_engines, settings.read_replica_policy)
+async_read_router = ReplicaRouter(async_engine, async_read_engines, settings.read_replica_policy)
+
+
+def pin_reads_to_primary(response: Response) -> None:
+    """Send the client's reads to the primary for the read-your-writes window"""
+    if read_engines and settings.read_your_writes_seconds > 0:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            str(time.time() + settings.read_your_writes_seconds),
+            max_age=int(settings.read_your_writes_seconds) + 1,
+            httponly=True,
+            samesite="lax",
+        )
+
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    """Whether the client wrote recently enough that its reads must see the primary"""
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
 def get_session():
     """Get database session"""
     with Session(engine) as session:
         yield session
+
+
+def get_read_session(request: Request):
+    """Get database session for read-only handlers, on a replica when one is configured"""
+    with Session(read_router.pick(reads_pinned_to_primary(request))) as session:
+        yield session
+
+
+class ThreadedSession:
+    """``AsyncSession`` interface over a sync ``Session``, run in the threadpool
+
+    Lets the async routers use the sync engine (e.g. SQLite in tests)
+    when ``DATABASE_ASYNC`` is off, without blocking the event loop.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    async def exec(self, statement, **kwargs):
+        kwargs["execution_options"] = {**_BUFFERED, **kwargs.get("execution_options", {})}
+        return await run_in_threadpool(self.sync_session.exec, statement, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def refresh(self, instance: Any) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance)
+
+    async def delete(self, instance: Any) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+
+AnyAsyncSession = Union[AsyncSession, ThreadedSession]
+
+
+async def _async_session(bind: Engine, async_bind: Optional[AsyncEngine]) -> AsyncIterator[AnyAsyncSession]:
+    if async_bind is None:
+        session = Session(bind, expire_on_commit=False)
+        try:
+            yield ThreadedSession(session)
+        finally:
+            await run_in_threadpool(session.close)
+        return
+
+    async with AsyncSession(async_bind, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_async_session() -> AsyncIterator[AnyAsyncSession]:
+    """Get database session for async routers
+
+    Objects stay loaded after commit, so returning them after the last
+    commit needs no further (blocking) refresh.
+    """
+    async for session in _async_session(engine, async_engine):
+        yield session
+
+
+async def get_async_read_session(request: Request) -> AsyncIterator[AnyAsyncSession]:
+    """Get database session for read-only async handlers, on a replica when one is configured"""
+    use_primary = reads_pinned_to_primary(request)
+    if async_engine is None:
+        bind, async_bind = read_router.pick(use_primary), None
+    else:
+        bind, async_bind = engine, async_read_router.pick(use_primary)
+    async for session in _async_session(bind, async_bind):
+        yield session
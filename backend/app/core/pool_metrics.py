@@ -0,0 +1,119 @@
+"""
+Connection pool telemetry
+"""
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Upper bounds (milliseconds) of the checkout wait histogram buckets; the last bucket is unbounded
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolMetrics:
+    """Checkout wait times and peak occupancy of one connection pool
+
+    The wait covers everything ``Pool.connect`` does: queueing for a free
+    connection, opening a new one and the pre-ping. Percentiles are the
+    upper bound of the histogram bucket they fall in, capped at the
+    longest wait seen.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bucket_counts: List[int] = [0] * (len(CHECKOUT_WAIT_BUCKETS_MS) + 1)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_in_use = 0
+
+    def observe(self, seconds: float, in_use: int) -> None:
+        """Record one successful checkout"""
+        milliseconds = seconds * 1000
+        bucket = next(
+            (i for i, bound in enumerate(CHECKOUT_WAIT_BUCKETS_MS) if milliseconds <= bound),
+            len(CHECKOUT_WAIT_BUCKETS_MS),
+        )
+        with self._lock:
+            self.bucket_counts[bucket] += 1
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            self.max_in_use = max(self.max_in_use, in_use)
+
+    def timed_out(self) -> None:
+        """Record a checkout that gave up after the pool timeout"""
+        with self._lock:
+            self.timeouts += 1
+
+    def _percentile(self, fraction: float) -> float:
+        rank = fraction * self.checkouts
+        seen = 0
+        for bound, count in zip(CHECKOUT_WAIT_BUCKETS_MS, self.bucket_counts):
+            seen += count
+            if seen >= rank:
+                return min(float(bound), round(self.max_wait * 1000, 3))
+        return round(self.max_wait * 1000, 3)
+
+    def stats(self) -> Dict:
+        """Checkout counters, wait percentiles (ms) and the wait histogram"""
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "max_in_use": self.max_in_use,
+                "wait_mean_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_p50_ms": self._percentile(0.50) if self.checkouts else 0.0,
+                "wait_p99_ms": self._percentile(0.99) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.max_wait * 1000, 3),
+                "wait_histogram_ms": {
+                    **{f"le_{bound}": count for bound, count in zip(CHECKOUT_WAIT_BUCKETS_MS, self.bucket_counts)},
+                    "inf": self.bucket_counts[-1],
+                },
+            }
+
+
+class _InstrumentedPool:
+    """Times ``connect`` (the checkout) of the pool class it is mixed into"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.timed_out()
+            raise
+        self.metrics.observe(time.perf_counter() - start, self.checkedout())
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    """``QueuePool`` that records checkout telemetry"""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that records checkout telemetry"""
+
+
+def pool_stats(pool: Pool) -> Dict:
+    """Occupancy of a pool, plus checkout telemetry when it is instrumented"""
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "in_use": pool.checkedout(),
+            "idle": pool.checkedin(),
+            # QueuePool counts overflow from -pool_size; only connections beyond the pool size matter here
+            "overflow": max(pool.overflow(), 0),
+        })
+    if isinstance(pool, _InstrumentedPool):
+        stats.update(pool.metrics.stats())
+    return stats
@@ -1,17 +1,37 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api import (
     users, institutions, accounts, transactions, investments, investment_tax,
     payroll, retirement, retirement_forecast, taxes, plaid, import_export, websocket,
 )
+from .api.pagination import NEXT_CURSOR_HEADER
 from .core.config import settings
+from .core.database import create_db_and_tables, database_pool_stats, dispose_async_engines, pin_reads_to_primary
+from .services.forecast_jobs import forecast_jobs
+from .services.irmaa_brackets import brackets_path, load_irmaa_brackets
+from .services.rmd_refresh import rmd_refresh_scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create tables, load IRMAA brackets and start the nightly RMD refresh; stop background work on shutdown"""
+    create_db_and_tables()
+    load_irmaa_brackets(brackets_path())
+    rmd_refresh_scheduler.start()
+    yield
+    rmd_refresh_scheduler.shutdown()
+    forecast_jobs.shutdown()
+    await dispose_async_engines()
+
 
 app = FastAPI(
     title=settings.project_name,
     version=settings.version,
     openapi_url=f"{settings.api_prefix}/openapi.json",
-    lifespan=settings.lifespan_context_manager,
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -21,9 +41,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """Keep a client's reads on the primary for a while after it writes"""
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        pin_reads_to_primary(response)
+    return response
+
+
 @app.get("/")
 def root():
     """Root endpoint"""
@@ -40,6 +70,12 @@ def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics/database-pool")
+def database_pool_metrics():
+    """Connection pool occupancy and checkout wait times, for sizing the pools"""
+    return database_pool_stats()
+
+
 # Include routers
 app.include_router(users.router, prefix=settings.api_prefix)
 app.include_router(institutions.router, prefix=settings.api_prefix)
@@ -7,6 +7,12 @@ from .payroll import Payroll, Deduction, Withholding
 from .plaid import PlaidItem, PlaidAccount
 from .retirement import RetirementAccount, RetirementType
 from .retirement_forecast import (
+    ForecastStatus,
+    ProjectionSource,
+    ReturnModel,
+    RothObjective,
+    SamplingMethod,
+    WithdrawalStrategy,
     RetirementForecast,
     RMDProjection,
     IRMAAProjection,
@@ -35,6 +41,12 @@ __all__ = [
     "Withholding",
     "RetirementAccount",
     "RetirementType",
+    "ForecastStatus",
+    "ProjectionSource",
+    "ReturnModel",
+    "RothObjective",
+    "SamplingMethod",
+    "WithdrawalStrategy",
     "RetirementForecast",
     "RMDProjection",
     "IRMAAProjection",
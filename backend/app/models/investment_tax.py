@@ -3,7 +3,7 @@ from decimal import Decimal
 from enum import StrEnum, auto
 from typing import Optional
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 
 class TaxClassification(StrEnum):
@@ -17,9 +17,13 @@ class TaxClassification(StrEnum):
 class InvestmentTaxBucket(SQLModel, table=True):
     """Tax bucket for tracking different tax treatments within an account"""
     __tablename__ = "investment_tax_buckets"
+    # Serves per-account lookups and per-classification rollups of an account's buckets
+    __table_args__ = (
+        Index("ix_investment_tax_buckets_account_classification", "account_id", "tax_classification"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    account_id: int = Field(foreign_key="accounts.id", index=True)
+    account_id: int = Field(foreign_key="accounts.id")  # Leads the composite index above
     tax_classification: TaxClassification
     balance: Decimal = Field(max_digits=15, decimal_places=2, default=Decimal("0.00"))
     cost_basis: Decimal = Field(max_digits=15, decimal_places=2, default=Decimal("0.00"))
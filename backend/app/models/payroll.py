@@ -2,20 +2,24 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Optional
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 
 class Payroll(SQLModel, table=True):
     """Payroll model for tracking jobs and income"""
     __tablename__ = "payroll"
+    # Serves latest-first pages of a user's payroll records
+    __table_args__ = (
+        Index("ix_payroll_user_pay_date", "user_id", "pay_date", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", index=True)
+    user_id: int = Field(foreign_key="users.id")  # Leads ix_payroll_user_pay_date
     employer_name: str
     job_title: str
     pay_period_start: datetime
     pay_period_end: datetime
-    pay_date: datetime
+    pay_date: datetime = Field(index=True)
     gross_pay: Decimal = Field(max_digits=15, decimal_places=2)
     net_pay: Decimal = Field(max_digits=15, decimal_places=2)
     year_to_date_gross: Decimal = Field(max_digits=15, decimal_places=2, default=Decimal("0.00"))
@@ -1,8 +1,54 @@
 from datetime import datetime, timezone
 from decimal import Decimal
+from enum import StrEnum, auto
 from typing import Optional
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
+
+
+class ForecastStatus(StrEnum):
+    """Lifecycle of a forecast simulation run"""
+    PENDING = auto()
+    RUNNING = auto()
+    CANCELLING = auto()  # Cancellation requested; the job stops at its next block of paths
+    COMPLETED = auto()
+    FAILED = auto()
+    CANCELLED = auto()
+
+
+class SamplingMethod(StrEnum):
+    """How Monte Carlo return shocks are sampled"""
+    RANDOM = auto()  # Plain pseudo-random normal draws
+    ANTITHETIC = auto()  # Each path paired with its mirror image
+    LATIN_HYPERCUBE = auto()  # Every year stratified across the paths of a block
+    SOBOL = auto()  # Scrambled Sobol sequence (requires scipy)
+
+
+class ReturnModel(StrEnum):
+    """Source of simulated annual returns"""
+    NORMAL = auto()  # Independent normal returns from expected_return and volatility
+    HISTORICAL_BOOTSTRAP = auto()  # Blocks of consecutive years resampled from historical returns
+
+
+class WithdrawalStrategy(StrEnum):
+    """How retirement withdrawals are sized each year"""
+    FIXED = auto()  # annual_withdrawal, grown with inflation
+    PERCENTAGE = auto()  # withdrawal_rate of the balance
+    RMD = auto()  # Balance divided by the IRS Uniform Lifetime Table divisor
+    GUARDRAILS = auto()  # Inflation-adjusted, cut or raised when the withdrawal rate drifts
+    FLOOR_CEILING = auto()  # withdrawal_rate of the balance, bounded around annual_withdrawal
+
+
+class RothObjective(StrEnum):
+    """What a Roth conversion search optimizes"""
+    TAXES = auto()  # Minimize lifetime taxes plus IRMAA surcharges
+    ESTATE = auto()  # Maximize after-tax estate value
+
+
+class ProjectionSource(StrEnum):
+    """Who wrote a projection set"""
+    USER = auto()  # Requested through the projection endpoints
+    REFRESH = auto()  # Re-projected by the nightly RMD refresh
 
 
 class RetirementForecast(SQLModel, table=True):
@@ -25,17 +71,42 @@ class RetirementForecast(SQLModel, table=True):
 
     # Withdrawal strategy
     annual_withdrawal: Decimal = Field(max_digits=15, decimal_places=2)
-    withdrawal_strategy: str = "fixed"  # fixed, percentage, rmd
+    withdrawal_strategy: WithdrawalStrategy = Field(default=WithdrawalStrategy.FIXED)
+    withdrawal_rate: Decimal = Field(max_digits=5, decimal_places=2, default=Decimal("4.00"))  # Percent of balance
+    guardrail_band: Decimal = Field(max_digits=5, decimal_places=2, default=Decimal("20.00"))  # Percent rate drift
+    guardrail_adjustment: Decimal = Field(max_digits=5, decimal_places=2, default=Decimal("10.00"))  # Percent change
+    withdrawal_floor: Decimal = Field(max_digits=5, decimal_places=2, default=Decimal("80.00"))  # Percent of annual_withdrawal
+    withdrawal_ceiling: Decimal = Field(max_digits=5, decimal_places=2, default=Decimal("120.00"))  # Percent of annual_withdrawal
 
     # Monte Carlo parameters
     num_simulations: int = 10000
+    seed: Optional[int] = None  # RNG seed of the last run; re-runs reuse it to see the same markets
+    sampling: SamplingMethod = Field(default=SamplingMethod.RANDOM)
+    return_model: ReturnModel = Field(default=ReturnModel.NORMAL)
+    bootstrap_block_years: int = 5
     success_threshold: Decimal = Field(max_digits=5, decimal_places=2, default=Decimal("80.00"))
+    # Adaptive precision targets (95% CI half-widths); num_simulations is then the path budget
+    target_success_ci: Optional[Decimal] = Field(default=None, max_digits=5, decimal_places=2)  # Percentage points
+    target_median_ci: Optional[Decimal] = Field(default=None, max_digits=5, decimal_places=2)  # Percent of median
+
+    # Run status (simulations may run in the background)
+    status: ForecastStatus = Field(default=ForecastStatus.PENDING, index=True)
+    progress: Decimal = Field(max_digits=5, decimal_places=2, default=Decimal("0.00"))  # Percent complete
+    error_message: Optional[str] = None
 
     # Results
     success_rate: Optional[Decimal] = Field(default=None, max_digits=5, decimal_places=2)
     median_final_balance: Optional[Decimal] = Field(default=None, max_digits=15, decimal_places=2)
     percentile_10_balance: Optional[Decimal] = Field(default=None, max_digits=15, decimal_places=2)
     percentile_90_balance: Optional[Decimal] = Field(default=None, max_digits=15, decimal_places=2)
+    percentile_relative_error: Optional[Decimal] = Field(
+        default=None,
+        max_digits=5,
+        decimal_places=2,
+    )  # Percent bound on reported percentiles; None when exact
+    paths_used: Optional[int] = None
+    success_rate_ci_half_width: Optional[Decimal] = Field(default=None, max_digits=6, decimal_places=3)
+    median_ci_half_width: Optional[Decimal] = Field(default=None, max_digits=8, decimal_places=3)
 
     # RMD projections
     first_rmd_year: Optional[int] = None
@@ -45,8 +116,13 @@ class RetirementForecast(SQLModel, table=True):
     estimated_magi: Optional[Decimal] = Field(default=None, max_digits=15, decimal_places=2)
     irmaa_bracket: Optional[str] = None  # standard, tier1, tier2, tier3, tier4
 
+    # Result cache identity (hash of simulation inputs, seed and engine version)
+    input_hash: Optional[str] = Field(default=None, index=True)
+    engine_version: Optional[str] = None
+
     # Metadata
-    simulation_data: Optional[str] = None  # JSON blob for detailed results
+    simulation_data: Optional[str] = None  # Legacy JSON year_stats; superseded by simulation_blob
+    simulation_blob: Optional[bytes] = Field(default=None, exclude=True)  # Encoded by year_stats_codec
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     last_run: Optional[datetime] = None
@@ -55,10 +131,19 @@ class RetirementForecast(SQLModel, table=True):
 class RMDProjection(SQLModel, table=True):
     """Required Minimum Distribution projections"""
     __tablename__ = "rmd_projections"
+    # One row per age of a projection set; a missing forecast_id is its own set
+    __table_args__ = (
+        Index(
+            "ix_rmd_projections_user_forecast_age", "user_id", "forecast_id", "age",
+            unique=True, postgresql_nulls_not_distinct=True,
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", index=True)
+    user_id: int = Field(foreign_key="users.id")  # Leads the unique index above
     forecast_id: Optional[int] = Field(default=None, foreign_key="retirement_forecasts.id")
+    # The nightly refresh leaves forecasts with user-requested projections alone
+    source: ProjectionSource = Field(default=ProjectionSource.USER)
 
     year: int
     age: int
@@ -77,9 +162,16 @@ class RMDProjection(SQLModel, table=True):
 class IRMAAProjection(SQLModel, table=True):
     """IRMAA (Income-Related Monthly Adjustment Amount) projections"""
     __tablename__ = "irmaa_projections"
+    # One row per age of a projection set; a missing forecast_id is its own set
+    __table_args__ = (
+        Index(
+            "ix_irmaa_projections_user_forecast_age", "user_id", "forecast_id", "age",
+            unique=True, postgresql_nulls_not_distinct=True,
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", index=True)
+    user_id: int = Field(foreign_key="users.id")  # Leads the unique index above
     forecast_id: Optional[int] = Field(default=None, foreign_key="retirement_forecasts.id")
 
     year: int
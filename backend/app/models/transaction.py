@@ -2,16 +2,21 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Optional
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 
 class Transaction(SQLModel, table=True):
     """Transaction model for financial transactions"""
     __tablename__ = "transactions"
+    # Serve newest-first pages of a user's or an account's transactions
+    __table_args__ = (
+        Index("ix_transactions_user_date", "user_id", "transaction_date", "id"),
+        Index("ix_transactions_account_date", "account_id", "transaction_date", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", index=True)
-    account_id: int = Field(foreign_key="accounts.id", index=True)
+    user_id: int = Field(foreign_key="users.id")  # Leads ix_transactions_user_date
+    account_id: int = Field(foreign_key="accounts.id")  # Leads ix_transactions_account_date
     transaction_date: datetime = Field(index=True)
     description: str
     amount: Decimal = Field(max_digits=15, decimal_places=2)
@@ -0,0 +1,229 @@
+"""
+Content-addressed cache for Monte Carlo forecast results
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlmodel import Session, select
+
+from ..core.config import settings
+from ..models.retirement_forecast import ForecastStatus, RetirementForecast
+from .monte_carlo_service import CONFIDENCE_LEVEL, ENGINE_VERSION, MonteCarloSimulator
+from .year_stats_codec import read_year_stats
+
+
+class ForecastResultCache:
+    """Two-tier cache of simulation results keyed on ``MonteCarloSimulator.cache_key()``
+
+    The first tier is an in-process LRU of result dicts. The second tier is
+    the ``retirement_forecasts`` table itself: any completed forecast with
+    the same ``input_hash`` and the current ``engine_version`` can answer
+    the request. Keys include the engine version and stored rows are also
+    filtered on it, so an engine upgrade invalidates both tiers.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, session: Session) -> Optional[Dict]:
+        """Look up results in memory, then in stored forecasts"""
+        with self._lock:
+            results = self._entries.get(key)
+            if results is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return results
+
+        db_forecast = session.exec(
+            select(RetirementForecast)
+            .where(
+                RetirementForecast.input_hash == key,
+                RetirementForecast.engine_version == ENGINE_VERSION,
+                RetirementForecast.status == ForecastStatus.COMPLETED,
+            )
+            .order_by(RetirementForecast.last_run.desc())
+            .limit(1),
+        ).first()
+
+        if db_forecast is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        results = self._results_from_forecast(db_forecast)
+        with self._lock:
+            self.persistent_hits += 1
+        self.put(key, results)
+        return results
+
+    def put(self, key: str, results: Dict) -> None:
+        """Store results, evicting the least recently used entries"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every in-memory entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and occupancy"""
+        with self._lock:
+            lookups = self.memory_hits + self.persistent_hits + self.misses
+            return {
+                "engine_version": ENGINE_VERSION,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "memory_hits": self.memory_hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.memory_hits + self.persistent_hits) / lookups * 100, 2) if lookups else 0.0,
+            }
+
+    @staticmethod
+    def _results_from_forecast(db_forecast: RetirementForecast) -> Dict:
+        """Rebuild a ``run_simulation`` result dict from a stored forecast"""
+        if db_forecast.percentile_relative_error is None:
+            percentile_accuracy = {"method": "exact"}
+        else:
+            percentile_accuracy = {
+                "method": "log_histogram",
+                "relative_error": float(db_forecast.percentile_relative_error) / 100,
+            }
+
+        precision = {
+            "confidence_level": CONFIDENCE_LEVEL,
+            "success_rate_ci_half_width": float(db_forecast.success_rate_ci_half_width),
+            "median_ci_half_width": (
+                float(db_forecast.median_ci_half_width) if db_forecast.median_ci_half_width is not None else None
+            ),
+            "paths_used": db_forecast.paths_used,
+        }
+        if db_forecast.target_success_ci is not None or db_forecast.target_median_ci is not None:
+            success_met = (
+                db_forecast.target_success_ci is None
+                or db_forecast.success_rate_ci_half_width <= db_forecast.target_success_ci
+            )
+            median_met = db_forecast.target_median_ci is None or (
+                db_forecast.median_ci_half_width is not None
+                and db_forecast.median_ci_half_width <= db_forecast.target_median_ci
+            )
+            precision["target_met"] = success_met and median_met
+
+        return {
+            "success_rate": db_forecast.success_rate,
+            "median_final_balance": db_forecast.median_final_balance,
+            "percentile_10_balance": db_forecast.percentile_10_balance,
+            "percentile_90_balance": db_forecast.percentile_90_balance,
+            "num_simulations": db_forecast.paths_used,
+            "year_stats": read_year_stats(db_forecast.simulation_blob, db_forecast.simulation_data),
+            "percentile_accuracy": percentile_accuracy,
+            "precision": precision,
+            "seed": db_forecast.seed,
+        }
+
+
+class ReturnMatrixCache:
+    """LRU of simulated return matrices keyed on ``MonteCarloSimulator.returns_key()``
+
+    Editing a forecast input that only affects how balances evolve (savings,
+    contributions, withdrawals, retirement age, inflation) leaves the
+    return matrix unchanged, so a re-run can skip drawing it. Entries are
+    the per-block matrices in block order, bounded by total size; a single
+    matrix larger than a quarter of the budget is never kept.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, List[np.ndarray]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def cacheable(self, simulator: MonteCarloSimulator) -> bool:
+        """Whether the simulator's full return matrix fits the cache
+
+        Adaptive runs usually stop well short of their path budget, so
+        drawing the whole budget up front would cost more than it saves.
+        """
+        matrix_bytes = simulator.total_years * simulator.num_simulations * 8
+        return not simulator.adaptive and 0 < matrix_bytes <= self.max_bytes // 4
+
+    def run(self, simulator: MonteCarloSimulator) -> Tuple[Dict, bool]:
+        """Run a simulation, reusing a resident return matrix when possible
+
+        Returns the results and whether the return matrix was reused.
+        Results are identical to ``simulator.run_simulation()`` either way.
+        A hit simulates in-process on the cached blocks; a miss runs as
+        usual (on the process pool when there are workers) and keeps the
+        blocks the shards drew.
+        """
+        if not self.cacheable(simulator):
+            return simulator.run_simulation(), False
+
+        key = simulator.returns_key()
+        with self._lock:
+            blocks = self._entries.get(key)
+            if blocks is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if blocks is not None:
+            return simulator.run_simulation(block_returns=blocks), True
+
+        blocks = []
+        results = simulator.run_simulation(kept_returns=blocks)
+        for returns in blocks:
+            returns.setflags(write=False)
+        self._put(key, blocks)
+        return results, False
+
+    def _put(self, key: str, blocks: List[np.ndarray]) -> None:
+        size = sum(block.nbytes for block in blocks)
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = blocks
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= sum(block.nbytes for block in evicted)
+
+    def clear(self) -> None:
+        """Drop every cached matrix"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and memory use"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "megabytes": round(self._bytes / 2**20, 2),
+                "max_megabytes": round(self.max_bytes / 2**20, 2),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+forecast_cache = ForecastResultCache(max_entries=settings.forecast_cache_size)
+return_matrix_cache = ReturnMatrixCache(max_bytes=settings.return_matrix_cache_mb * 2**20)
@@ -0,0 +1,176 @@
+"""
+Background execution of retirement forecast simulations
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict
+
+from sqlmodel import Session
+
+from ..api.websocket import manager
+from ..core.config import settings
+from ..core.database import engine
+from ..models.retirement_forecast import ForecastStatus, RetirementForecast
+from .forecast_cache import forecast_cache
+from .monte_carlo_service import MonteCarloSimulator, SimulationCancelled
+from .year_stats_codec import encode_year_stats
+
+FORECAST_RESOURCE = "retirement_forecast"
+
+
+def apply_simulation_results(db_forecast: RetirementForecast, results: Dict) -> None:
+    """Copy simulation results onto a forecast row and mark it completed"""
+    db_forecast.success_rate = results["success_rate"]
+    db_forecast.median_final_balance = results["median_final_balance"]
+    db_forecast.percentile_10_balance = results["percentile_10_balance"]
+    db_forecast.percentile_90_balance = results["percentile_90_balance"]
+    relative_error = results["percentile_accuracy"].get("relative_error")
+    db_forecast.percentile_relative_error = (
+        Decimal(str(round(relative_error * 100, 2))) if relative_error is not None else None
+    )
+    precision = results["precision"]
+    db_forecast.paths_used = precision["paths_used"]
+    db_forecast.success_rate_ci_half_width = Decimal(str(precision["success_rate_ci_half_width"]))
+    db_forecast.median_ci_half_width = (
+        Decimal(str(precision["median_ci_half_width"])) if precision["median_ci_half_width"] is not None else None
+    )
+    db_forecast.seed = results["seed"]
+    db_forecast.simulation_blob = encode_year_stats(results["year_stats"], db_forecast.current_age)
+    db_forecast.simulation_data = None
+
+    now = datetime.now(timezone.utc)
+    db_forecast.status = ForecastStatus.COMPLETED
+    db_forecast.progress = Decimal("100.00")
+    db_forecast.error_message = None
+    db_forecast.last_run = now
+    db_forecast.updated_at = now
+
+
+class ForecastJobManager:
+    """Runs forecast simulations on a background thread pool
+
+    Each job owns its own database session, writes progress to the forecast
+    row as blocks of paths finish, and pushes progress and completion
+    events to the user's ``/ws/sync/{user_id}`` connections.
+    """
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="forecast-job")
+        self._cancel_events: Dict[int, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, forecast_id: int, user_id: int, simulator: MonteCarloSimulator) -> None:
+        """Queue a simulation for an already persisted pending forecast"""
+        cancel_event = threading.Event()
+        with self._lock:
+            self._cancel_events[forecast_id] = cancel_event
+        self._executor.submit(self._run, forecast_id, user_id, simulator, cancel_event)
+
+    def cancel(self, forecast_id: int) -> bool:
+        """Request cancellation; returns False if the job is not tracked here"""
+        with self._lock:
+            cancel_event = self._cancel_events.get(forecast_id)
+        if cancel_event is None:
+            return False
+        cancel_event.set()
+        return True
+
+    def shutdown(self) -> None:
+        """Cancel outstanding jobs and stop the executor"""
+        with self._lock:
+            for cancel_event in self._cancel_events.values():
+                cancel_event.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(
+        self,
+        forecast_id: int,
+        user_id: int,
+        simulator: MonteCarloSimulator,
+        cancel_event: threading.Event,
+    ) -> None:
+        """Job body executed on the thread pool"""
+        try:
+            with Session(engine) as session:
+                db_forecast = session.get(RetirementForecast, forecast_id)
+                if db_forecast is None:
+                    return
+                if cancel_event.is_set():
+                    self._finish(session, db_forecast, ForecastStatus.CANCELLED)
+                    return
+
+                db_forecast.status = ForecastStatus.RUNNING
+                self._save(session, db_forecast)
+                self._notify(user_id, "running", db_forecast)
+
+                last_reported = Decimal("0.00")
+
+                def on_progress(completed_paths: int, total_paths: int) -> None:
+                    nonlocal last_reported
+                    progress = Decimal(str(round(completed_paths / total_paths * 100, 2)))
+                    if progress - last_reported < 1 and completed_paths < total_paths:
+                        return
+                    last_reported = progress
+                    db_forecast.progress = progress
+                    self._save(session, db_forecast)
+                    self._notify(user_id, "progress", db_forecast)
+
+                try:
+                    results = simulator.run_simulation(
+                        progress_callback=on_progress,
+                        cancel_event=cancel_event,
+                    )
+                except SimulationCancelled:
+                    self._finish(session, db_forecast, ForecastStatus.CANCELLED)
+                    return
+                except Exception as e:
+                    session.rollback()
+                    self._finish(session, db_forecast, ForecastStatus.FAILED, str(e))
+                    return
+
+                forecast_cache.put(simulator.cache_key(), results)
+                apply_simulation_results(db_forecast, results)
+                self._save(session, db_forecast)
+                self._notify(user_id, "completed", db_forecast)
+        finally:
+            with self._lock:
+                self._cancel_events.pop(forecast_id, None)
+
+    def _finish(
+        self,
+        session: Session,
+        db_forecast: RetirementForecast,
+        status: ForecastStatus,
+        error_message: str = None,
+    ) -> None:
+        """Record a terminal status that carries no results"""
+        db_forecast.status = status
+        db_forecast.error_message = error_message
+        self._save(session, db_forecast)
+        self._notify(db_forecast.user_id, str(status), db_forecast)
+
+    @staticmethod
+    def _save(session: Session, db_forecast: RetirementForecast) -> None:
+        db_forecast.updated_at = datetime.now(timezone.utc)
+        session.add(db_forecast)
+        session.commit()
+        session.refresh(db_forecast)
+
+    @staticmethod
+    def _notify(user_id: int, action: str, db_forecast: RetirementForecast) -> None:
+        manager.broadcast_data_change_threadsafe(
+            user_id,
+            FORECAST_RESOURCE,
+            action,
+            {
+                "id": db_forecast.id,
+                "status": str(db_forecast.status),
+                "progress": float(db_forecast.progress),
+                "success_rate": float(db_forecast.success_rate) if db_forecast.success_rate is not None else None,
+            },
+        )
+
+
+forecast_jobs = ForecastJobManager(max_workers=settings.forecast_job_workers)
@@ -0,0 +1,159 @@
+"""
+Historical returns datasets and block-bootstrap sampling
+"""
+import csv
+import hashlib
+import math
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Sequence
+
+import numpy as np
+
+from ..core.config import settings
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_DATASET = DATA_DIR / "us_stock_annual_returns.bin"
+
+MAGIC = b"RTNS"
+FORMAT_VERSION = 1
+
+# magic, format version, periods per year, first year, number of periods, number of series
+_HEADER = struct.Struct("<4sBBHIH")
+_SERIES_NAME_BYTES = 16
+
+
+def dataset_path() -> Path:
+    """Configured historical returns dataset, defaulting to the shipped one"""
+    return Path(settings.historical_returns_path) if settings.historical_returns_path else DEFAULT_DATASET
+
+
+def write_returns_dataset(
+    path: Path,
+    returns: np.ndarray,
+    series_names: Sequence[str],
+    start_year: int,
+    periods_per_year: int = 1,
+) -> None:
+    """Write a ``(periods, series)`` array of simple returns (fractions) as a dataset
+
+    Layout: a fixed header, one 16-byte ASCII name per series, then the
+    returns as little-endian float64 in period-major order, so the file can
+    be opened directly with ``np.memmap``.
+    """
+    returns = np.asarray(returns, dtype="<f8")
+    if returns.ndim != 2 or returns.shape[1] != len(series_names):
+        raise ValueError("returns must have shape (periods, len(series_names))")
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, periods_per_year, start_year, returns.shape[0], returns.shape[1])
+    names = b"".join(
+        name.encode("ascii")[:_SERIES_NAME_BYTES].ljust(_SERIES_NAME_BYTES, b"\0") for name in series_names
+    )
+    with open(path, "wb") as f:
+        f.write(header + names)
+        f.write(returns.tobytes())
+
+
+def build_returns_dataset(csv_path: Path, path: Path, periods_per_year: int = 1) -> None:
+    """Convert a CSV of percent returns (first column the year) into a binary dataset
+
+    Lines starting with ``#`` are comments; the header row names the series.
+    """
+    with open(csv_path, newline="") as f:
+        rows = [row for row in csv.reader(f) if row and not row[0].startswith("#")]
+    header, data = rows[0], rows[1:]
+    returns = np.array([[float(value) / 100.0 for value in row[1:]] for row in data])
+    write_returns_dataset(path, returns, header[1:], start_year=int(data[0][0]), periods_per_year=periods_per_year)
+
+
+class HistoricalReturns:
+    """Memory-mapped historical returns dataset
+
+    The data is never copied into the process: every worker maps the same
+    file and shares one page cache copy.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"{self.path}: truncated returns dataset")
+            magic, version, periods_per_year, start_year, num_periods, num_series = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path}: not a returns dataset")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{self.path}: unsupported returns dataset version {version}")
+            names = f.read(_SERIES_NAME_BYTES * num_series)
+
+        self.periods_per_year = periods_per_year
+        self.start_year = start_year
+        self.num_periods = num_periods
+        self.series_names: List[str] = [
+            names[i:i + _SERIES_NAME_BYTES].rstrip(b"\0").decode("ascii")
+            for i in range(0, len(names), _SERIES_NAME_BYTES)
+        ]
+        self.returns = np.memmap(
+            self.path,
+            dtype="<f8",
+            mode="r",
+            offset=_HEADER.size + len(names),
+            shape=(num_periods, num_series),
+        )
+        self.digest = hashlib.sha256(self.path.read_bytes()).hexdigest()
+
+    def block_bootstrap(
+        self,
+        rng: np.random.Generator,
+        num_years: int,
+        num_paths: int,
+        block_years: int,
+        series: int = 0,
+    ) -> np.ndarray:
+        """Draw a year-major ``(num_years, num_paths)`` matrix of annual returns
+
+        Each path is stitched together from blocks of ``block_years``
+        consecutive years of history starting at random points (circular
+        block bootstrap, wrapping around the end of the data), which keeps
+        fat tails and short-range autocorrelation. Sub-annual data is
+        compounded into annual returns.
+        """
+        block_periods = max(1, min(block_years * self.periods_per_year, self.num_periods))
+        num_periods = num_years * self.periods_per_year
+        num_blocks = math.ceil(num_periods / block_periods)
+
+        starts = rng.integers(0, self.num_periods, size=(num_blocks, 1, num_paths))
+        offsets = np.arange(block_periods).reshape(1, block_periods, 1)
+        indexes = ((starts + offsets) % self.num_periods).reshape(num_blocks * block_periods, num_paths)
+        returns = self.returns[indexes[:num_periods], series]
+
+        if self.periods_per_year == 1:
+            return returns
+        growth = (returns + 1).reshape(num_years, self.periods_per_year, num_paths).prod(axis=1)
+        return growth - 1
+
+    def summary(self) -> dict:
+        """Annualized mean and volatility of each series"""
+        whole_years = self.num_periods - self.num_periods % self.periods_per_year
+        growth = np.asarray(self.returns[:whole_years]) + 1
+        annual = growth.reshape(-1, self.periods_per_year, len(self.series_names)).prod(axis=1) - 1
+        return {
+            "dataset": self.path.name,
+            "start_year": self.start_year,
+            "periods_per_year": self.periods_per_year,
+            "num_periods": self.num_periods,
+            "series": {
+                name: {
+                    "mean_return": round(float(annual[:, i].mean()) * 100, 2),
+                    "volatility": round(float(annual[:, i].std(ddof=1)) * 100, 2),
+                }
+                for i, name in enumerate(self.series_names)
+            },
+        }
+
+
+@lru_cache(maxsize=4)
+def load_historical_returns(path: Path) -> HistoricalReturns:
+    """Open a dataset once per process"""
+    return HistoricalReturns(path)
@@ -0,0 +1,109 @@
+"""
+Year-versioned Medicare IRMAA bracket tables
+"""
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_BRACKETS = DATA_DIR / "irmaa_brackets.json"
+
+FORMAT_VERSION = 1
+FILING_STATUSES = ("single", "married")
+# Indexed thresholds are rounded to this many dollars
+THRESHOLD_ROUNDING = 1000
+
+
+def brackets_path() -> Path:
+    """Configured IRMAA bracket file, defaulting to the shipped one"""
+    return Path(settings.irmaa_brackets_path) if settings.irmaa_brackets_path else DEFAULT_BRACKETS
+
+
+def filing_status_index(filing_status: str) -> int:
+    """Row of a filing status in the bracket arrays (anything but "married" files single)"""
+    return 1 if filing_status == "married" else 0
+
+
+def _stack(tables, key: str) -> np.ndarray:
+    return np.array([[table[status][key] for status in FILING_STATUSES] for table in tables], dtype=float)
+
+
+class IRMAABrackets:
+    """IRMAA bracket tables of every published year as dense arrays
+
+    ``thresholds`` has shape ``(years, filing statuses, tiers - 1)`` and
+    holds the upper MAGI bound of every tier but the last; the surcharge
+    arrays have shape ``(years, filing statuses, tiers)`` and hold monthly
+    amounts per person.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        raw = self.path.read_bytes()
+        self.digest = hashlib.sha256(raw).hexdigest()
+        data = json.loads(raw)
+        if data.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: unsupported IRMAA bracket format {data.get('format')}")
+
+        self.tiers: Tuple[str, ...] = tuple(data["tiers"])
+        self.default_threshold_inflation = float(data["default_threshold_inflation"])
+        self.years = np.array(sorted(int(year) for year in data["tables"]))
+        tables = [data["tables"][str(year)] for year in self.years]
+
+        self.thresholds = _stack(tables, "max_magi")
+        self.part_b = _stack(tables, "part_b_surcharge")
+        self.part_d = _stack(tables, "part_d_surcharge")
+        tier_counts = {self.thresholds.shape[2] + 1, self.part_b.shape[2], self.part_d.shape[2]}
+        if tier_counts != {len(self.tiers)}:
+            raise ValueError(f"{self.path}: every table needs one threshold per tier but the last")
+        if np.any(np.diff(self.thresholds, axis=2) <= 0):
+            raise ValueError(f"{self.path}: thresholds must increase with the tier")
+
+    def tables(
+        self,
+        first_year: int,
+        num_years: int,
+        filing_status: int,
+        threshold_inflation: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Thresholds, Part B and Part D surcharges in effect in each of ``num_years`` years
+
+        Rows are years starting at ``first_year``. Years before the first
+        table use it unchanged. Years after the last one index its
+        thresholds by ``threshold_inflation`` (percent, defaulting to the
+        file's rate) per year, rounded to the nearest $1,000; surcharges stay
+        at the last published amounts.
+        """
+        years = first_year + np.arange(num_years)
+        index = np.clip(np.searchsorted(self.years, years, side="right") - 1, 0, len(self.years) - 1)
+        thresholds = self.thresholds[index, filing_status]
+
+        years_past = np.maximum(years - self.years[-1], 0)
+        if years_past.any():
+            rate = self.default_threshold_inflation if threshold_inflation is None else threshold_inflation
+            growth = (1 + rate / 100.0) ** years_past[:, None]
+            indexed = np.round(thresholds * growth / THRESHOLD_ROUNDING) * THRESHOLD_ROUNDING
+            thresholds = np.where(years_past[:, None] > 0, indexed, thresholds)
+        return thresholds, self.part_b[index, filing_status], self.part_d[index, filing_status]
+
+    def table(
+        self,
+        year: int,
+        filing_status: int,
+        threshold_inflation: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Thresholds, Part B and Part D surcharges in effect in ``year``"""
+        thresholds, part_b, part_d = self.tables(year, 1, filing_status, threshold_inflation)
+        return thresholds[0], part_b[0], part_d[0]
+
+
+@lru_cache(maxsize=4)
+def load_irmaa_brackets(path: Path) -> IRMAABrackets:
+    """Parse a bracket file once per process"""
+    return IRMAABrackets(path)
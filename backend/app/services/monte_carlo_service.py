@@ -1,14 +1,178 @@
 """
 Monte Carlo simulation service for retirement forecasting
 """
-from decimal import Decimal
-from typing import List, Dict, Tuple
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Callable, Iterator, List, Dict, Tuple, Optional, Sequence, Union
 
 import numpy as np
 
+from ..core.config import settings
+from ..models.retirement_forecast import ReturnModel, SamplingMethod, WithdrawalStrategy
+from .historical_returns import dataset_path, load_historical_returns
+from .irmaa_brackets import brackets_path, filing_status_index, load_irmaa_brackets
+from .quantile_sketch import LogHistogramSketch
+from .sampling import draw_standard_normals
+from .tax_outcomes import TaxOutcomes
+from .rmd_table import MAX_DIVISOR_AGE, RMD_START_AGE, UNIFORM_LIFETIME_DIVISORS, rmd_divisors
+from .withdrawal_kernels import WITHDRAWAL_KERNELS, WithdrawalKernel
+
+# Bump whenever a change alters simulation output for the same inputs and seed;
+# cached results from other engine versions are then ignored
+ENGINE_VERSION = "2"
+
+# Above this many paths, results are aggregated in streaming mode by default
+STREAMING_THRESHOLD = 100_000
+DEFAULT_CHUNK_SIZE = 10_000
+# Shards per worker when running on the process pool, for finer progress
+SHARDS_PER_WORKER = 4
+# How often a pooled run wakes up to check for cancellation, in seconds
+CANCEL_POLL_INTERVAL = 0.25
+
+# Adaptive precision runs check their stopping rule after every block
+ADAPTIVE_BLOCK_SIZE = 1_000
+MIN_ADAPTIVE_PATHS = 2_000
+CONFIDENCE_LEVEL = 95.0
+Z_SCORE = 1.959963984540054  # Two-sided 95% normal quantile
+
+CENT = Decimal("0.01")
+
+# Called with (completed_paths, total_paths) as blocks finish
+ProgressCallback = Callable[[int, int], None]
+# Successful paths, balance aggregate and tax outcomes (when requested) of simulated blocks
+ShardResult = Tuple[int, Union[np.ndarray, LogHistogramSketch], Optional[TaxOutcomes]]
+
+# Inputs that only affect how balances evolve on given returns; everything
+# else in ``cache_parameters`` also determines the return matrix
+PATH_PARAMETERS = frozenset({
+    "current_savings",
+    "annual_contribution",
+    "annual_withdrawal",
+    "retirement_age",
+    "inflation_rate",
+    "streaming",
+    "target_success_ci",
+    "target_median_ci",
+    "withdrawal_strategy",
+    "withdrawal_rate",
+    "guardrail_band",
+    "guardrail_adjustment",
+    "withdrawal_floor",
+    "withdrawal_ceiling",
+    "tax_outcomes",
+    "pre_tax_fraction",
+    "other_income",
+    "filing_status",
+    "start_year",
+    "irmaa_brackets",
+})
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+class SimulationCancelled(Exception):
+    """Raised when a running simulation is cancelled"""
+
+
+def configured_workers() -> int:
+    """Number of worker processes available to a single simulation"""
+    return settings.monte_carlo_workers or os.cpu_count() or 1
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Lazily create the process pool shared by all simulations"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=configured_workers())
+        return _process_pool
+
+
+def _sorted_percentiles(ordered: np.ndarray, percentiles: Sequence[float]) -> np.ndarray:
+    """``np.percentile(..., axis=1)`` of rows that are already sorted, bit for bit
+
+    Interpolates linearly between neighbouring order statistics the way
+    NumPy does, so no selection pass is needed.
+    """
+    positions = (ordered.shape[1] - 1) * (np.asarray(percentiles, dtype=np.float64) / 100)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, ordered.shape[1] - 1)
+    weight = positions - lower
+    below, above = ordered[:, lower], ordered[:, upper]
+    step = above - below
+    return np.where(weight >= 0.5, above - step * (1 - weight), below + step * weight).T
+
+
+def _run_shard(
+    simulator: "MonteCarloSimulator",
+    block_seeds: Sequence[np.random.SeedSequence],
+    block_sizes: Sequence[int],
+    keep_returns: bool = False,
+) -> Tuple[ShardResult, Optional[List[np.ndarray]]]:
+    """Process pool entry point for one shard of blocks
+
+    Returns the shard result and, if ``keep_returns``, the return matrices
+    the shard drew.
+    """
+    kept_returns: Optional[List[np.ndarray]] = [] if keep_returns else None
+    return simulator._simulate_blocks(block_seeds, block_sizes, kept_returns=kept_returns), kept_returns
+
 
 class MonteCarloSimulator:
-    """Monte Carlo simulation for retirement planning"""
+    """Monte Carlo simulation for retirement planning
+
+    Paths are simulated in fixed-size blocks of ``chunk_size`` paths. Within
+    a block, returns for every path and year are drawn as a single matrix
+    and balances are propagated year by year with vectorized NumPy
+    operations across paths.
+
+    Block ``i`` always draws from child ``i`` of
+    ``np.random.SeedSequence(seed).spawn(...)``. Blocks are grouped into
+    shards that may run on a process pool, and shard aggregates are merged
+    in block order, so a given seed produces the same result for any
+    number of workers.
+
+    In streaming mode each block is folded into a quantile sketch instead
+    of being kept, so peak memory does not grow with ``num_simulations``;
+    the reported percentiles then carry the sketch's relative error bound
+    instead of being exact.
+
+    When a target confidence-interval half-width is given for the success
+    rate (percentage points) and/or the median final balance (percent of
+    the median), ``num_simulations`` becomes a path budget: blocks are
+    simulated in order until the targets are met or the budget runs out.
+    The stopping point is evaluated block by block in block order, so it
+    is also independent of the worker count.
+
+    ``sampling`` selects how return shocks are drawn (see ``sampling.py``).
+    Structured schemes are re-randomized per block, so blocks stay
+    independent; within a block they reduce variance, which makes the
+    adaptive intervals (computed as for independent paths) conservative.
+
+    With ``return_model=historical_bootstrap`` returns are resampled in
+    blocks of ``bootstrap_block_years`` from the memory-mapped historical
+    dataset instead, and ``expected_return``/``volatility`` are unused.
+
+    ``withdrawal_strategy`` selects the kernel that sizes each retired
+    year's withdrawal from the path balances (see ``withdrawal_kernels.py``).
+
+    With ``tax_outcomes`` every block also yields, per path and year, the
+    RMD due on the pre-tax share (``pre_tax_fraction`` percent) of the
+    start-of-year balance and the IRMAA tier of ``other_income`` (today's
+    dollars, grown with inflation) plus that RMD, with ``start_year`` the
+    calendar year of ``current_age``. Results then carry the per-age
+    distribution under ``tax_outcomes`` (see ``tax_outcomes.py``).
+
+    Without a ``seed`` one is drawn at construction and reported in the
+    results, so every run can be reproduced; unseeded runs still share
+    one cache key per set of inputs.
+    """
 
     def __init__(
         self,
@@ -22,6 +186,26 @@ class MonteCarloSimulator:
         volatility: Decimal,
         inflation_rate: Decimal = Decimal("2.5"),
         num_simulations: int = 10000,
+        seed: Optional[int] = None,
+        streaming: Optional[bool] = None,
+        chunk_size: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        target_success_ci: Optional[Decimal] = None,
+        target_median_ci: Optional[Decimal] = None,
+        sampling: SamplingMethod = SamplingMethod.RANDOM,
+        return_model: ReturnModel = ReturnModel.NORMAL,
+        bootstrap_block_years: int = 5,
+        withdrawal_strategy: WithdrawalStrategy = WithdrawalStrategy.FIXED,
+        withdrawal_rate: Decimal = Decimal("4"),
+        guardrail_band: Decimal = Decimal("20"),
+        guardrail_adjustment: Decimal = Decimal("10"),
+        withdrawal_floor: Decimal = Decimal("80"),
+        withdrawal_ceiling: Decimal = Decimal("120"),
+        tax_outcomes: bool = False,
+        pre_tax_fraction: Decimal = Decimal("100"),
+        other_income: Decimal = Decimal("0"),
+        filing_status: str = "single",
+        start_year: Optional[int] = None,
     ):
         self.current_age = current_age
         self.retirement_age = retirement_age
@@ -33,122 +217,594 @@ class MonteCarloSimulator:
         self.volatility = float(volatility) / 100.0
         self.inflation_rate = float(inflation_rate) / 100.0
         self.num_simulations = num_simulations
+        self.seeded = seed is not None
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().generate_state(1)[0] >> 1)
+        self.streaming = num_simulations > STREAMING_THRESHOLD if streaming is None else streaming
+        self.num_workers = num_workers
+        self.target_success_ci = float(target_success_ci) if target_success_ci is not None else None
+        self.target_median_ci = float(target_median_ci) if target_median_ci is not None else None
+        self.adaptive = self.target_success_ci is not None or self.target_median_ci is not None
+        self.sampling = SamplingMethod(sampling)
+        self.return_model = ReturnModel(return_model)
+        self.bootstrap_block_years = bootstrap_block_years
+        self.returns_dataset = dataset_path() if self.return_model == ReturnModel.HISTORICAL_BOOTSTRAP else None
+        if self.returns_dataset is not None and self.sampling != SamplingMethod.RANDOM:
+            raise ValueError("Historical bootstrap returns only support random sampling")
+        if chunk_size is None:
+            chunk_size = ADAPTIVE_BLOCK_SIZE if self.adaptive else DEFAULT_CHUNK_SIZE
+            if self.sampling == SamplingMethod.SOBOL:
+                # Sobol points are balanced in power-of-two runs
+                chunk_size = 1 << (chunk_size.bit_length() - 1)
+        self.chunk_size = chunk_size
+        self.withdrawal_strategy = WithdrawalStrategy(withdrawal_strategy)
+        self.withdrawal_rate = float(withdrawal_rate) / 100.0
+        self.guardrail_band = float(guardrail_band) / 100.0
+        self.guardrail_adjustment = float(guardrail_adjustment) / 100.0
+        self.withdrawal_floor = float(withdrawal_floor) / 100.0
+        self.withdrawal_ceiling = float(withdrawal_ceiling) / 100.0
+        self.tax_outcomes = tax_outcomes
+        self.pre_tax_fraction = float(pre_tax_fraction) / 100.0
+        self.other_income = float(other_income)
+        self.filing_status = "married" if filing_status == "married" else "single"
+        self.start_year = start_year or date.today().year
 
         self.years_to_retirement = retirement_age - current_age
         self.years_in_retirement = life_expectancy - retirement_age
         self.total_years = life_expectancy - current_age
 
-    def run_simulation(self) -> Dict:
-        """Run Monte Carlo simulation"""
-        results = []
-        final_balances = []
+    def cache_parameters(self) -> Dict:
+        """Every input that influences the result, in canonical form
+
+        The worker count is deliberately absent since it never changes results.
+        """
+        return {
+            "engine_version": ENGINE_VERSION,
+            "current_age": self.current_age,
+            "retirement_age": self.retirement_age,
+            "life_expectancy": self.life_expectancy,
+            "current_savings": self.current_savings,
+            "annual_contribution": self.annual_contribution,
+            "annual_withdrawal": self.annual_withdrawal,
+            "expected_return": self.expected_return,
+            "volatility": self.volatility,
+            "inflation_rate": self.inflation_rate,
+            "num_simulations": self.num_simulations,
+            "seed": self.seed if self.seeded else None,
+            "streaming": self.streaming,
+            "chunk_size": self.chunk_size,
+            "target_success_ci": self.target_success_ci,
+            "target_median_ci": self.target_median_ci,
+            "sampling": str(self.sampling),
+            "return_model": str(self.return_model),
+            "bootstrap_block_years": self.bootstrap_block_years if self.returns_dataset is not None else None,
+            "returns_dataset": load_historical_returns(self.returns_dataset).digest if self.returns_dataset else None,
+            "withdrawal_strategy": str(self.withdrawal_strategy),
+            "withdrawal_rate": self.withdrawal_rate,
+            "guardrail_band": self.guardrail_band,
+            "guardrail_adjustment": self.guardrail_adjustment,
+            "withdrawal_floor": self.withdrawal_floor,
+            "withdrawal_ceiling": self.withdrawal_ceiling,
+            # Only present when requested, so keys of runs without them are unchanged
+            **({
+                "tax_outcomes": True,
+                "pre_tax_fraction": self.pre_tax_fraction,
+                "other_income": self.other_income,
+                "filing_status": self.filing_status,
+                "start_year": self.start_year,
+                "irmaa_brackets": load_irmaa_brackets(brackets_path()).digest,
+            } if self.tax_outcomes else {}),
+        }
+
+    def cache_key(self) -> str:
+        """Content hash of the simulation inputs, seed and engine version"""
+        canonical = json.dumps(self.cache_parameters(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def returns_key(self) -> str:
+        """Content hash of the inputs that determine the return matrix, including the drawn seed"""
+        parameters = {
+            name: value for name, value in self.cache_parameters().items() if name not in PATH_PARAMETERS
+        }
+        parameters["seed"] = self.seed
+        canonical = json.dumps(parameters, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def run_simulation(
+        self,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+        block_returns: Optional[Sequence[np.ndarray]] = None,
+        kept_returns: Optional[List[np.ndarray]] = None,
+    ) -> Dict:
+        """Run Monte Carlo simulation
+
+        Args:
+            progress_callback: Called with (completed_paths, total_paths) as blocks finish
+            cancel_event: When set, the run stops and raises SimulationCancelled
+            block_returns: Return matrices of every block, as yielded by
+                ``iter_return_blocks``, to reuse instead of drawing them
+                (the run then stays in-process)
+            kept_returns: Filled with the return matrix of every block in
+                block order, including those drawn on the process pool
+                (non-adaptive runs without ``block_returns`` only)
+        """
+        block_seeds, block_sizes = self.block_plan()
+        on_paths_done = self._progress_hook(progress_callback, cancel_event)
+
+        if self.adaptive:
+            return self._run_adaptive(block_seeds, block_sizes, on_paths_done, cancel_event, block_returns)
+
+        shard_results = self._run_shards(
+            block_seeds, block_sizes, on_paths_done, cancel_event,
+            block_returns=block_returns, kept_returns=kept_returns,
+        )
+        successful_sims = sum(successful for successful, _, _ in shard_results)
+        aggregate = self._merge_aggregates([shard_aggregate for _, shard_aggregate, _ in shard_results])
+        outcomes = self._merge_outcomes([shard_outcomes for _, _, shard_outcomes in shard_results])
+
+        return self._summarize(successful_sims, self.num_simulations, aggregate, outcomes=outcomes)
+
+    def block_plan(self) -> Tuple[List[np.random.SeedSequence], List[int]]:
+        """Seed and path count of every block, in block order"""
+        block_sizes = [
+            min(self.chunk_size, self.num_simulations - start)
+            for start in range(0, self.num_simulations, self.chunk_size)
+        ]
+        return np.random.SeedSequence(self.seed).spawn(len(block_sizes)), block_sizes
+
+    def iter_return_blocks(self) -> Iterator[np.ndarray]:
+        """Yield the return matrix of every block, as used by ``run_simulation``
+
+        Other engines evaluating many variants against the same draws
+        (common random numbers) consume this instead of sampling their own.
+        """
+        for block_seed, num_paths in zip(*self.block_plan()):
+            yield self._draw_returns(np.random.default_rng(block_seed), num_paths)
+
+    def _run_adaptive(
+        self,
+        block_seeds: List[np.random.SeedSequence],
+        block_sizes: List[int],
+        on_paths_done: Callable[[int], None],
+        cancel_event: Optional[threading.Event],
+        block_returns: Optional[Sequence[np.ndarray]] = None,
+    ) -> Dict:
+        """Simulate blocks in batches until the precision targets are met"""
+        batch_size = max(1, min(self.num_workers or configured_workers(), len(block_sizes)))
+        successful_sims = 0
+        num_paths = 0
+        aggregates = []
+        outcomes = []
+
+        for batch_start in range(0, len(block_sizes), batch_size):
+            batch = range(batch_start, min(batch_start + batch_size, len(block_sizes)))
+            block_results = self._run_shards(
+                [block_seeds[i] for i in batch],
+                [block_sizes[i] for i in batch],
+                on_paths_done,
+                cancel_event,
+                shards=[[i - batch_start] for i in batch],
+                block_returns=[block_returns[i] for i in batch] if block_returns is not None else None,
+            )
+
+            # Blocks beyond the first one that meets the targets are discarded
+            for block_index, (successful, block_aggregate, block_outcomes) in zip(batch, block_results):
+                successful_sims += successful
+                num_paths += block_sizes[block_index]
+                aggregates.append(block_aggregate)
+                outcomes.append(block_outcomes)
+                if num_paths < MIN_ADAPTIVE_PATHS:
+                    continue
+
+                aggregate = self._merge_aggregates(aggregates)
+                aggregates = [aggregate]
+                precision = self._precision(successful_sims, num_paths, aggregate)
+                if self._targets_met(precision):
+                    return self._summarize(
+                        successful_sims, num_paths, aggregate, precision, target_met=True,
+                        outcomes=self._merge_outcomes(outcomes),
+                    )
+
+        aggregate = self._merge_aggregates(aggregates)
+        return self._summarize(
+            successful_sims, num_paths, aggregate, target_met=False, outcomes=self._merge_outcomes(outcomes),
+        )
+
+    def _progress_hook(
+        self,
+        progress_callback: Optional[ProgressCallback],
+        cancel_event: Optional[threading.Event],
+    ) -> Callable[[int], None]:
+        """Build the per-block hook that reports progress and honours cancellation"""
+        completed_paths = 0
+
+        def on_paths_done(num_paths: int) -> None:
+            nonlocal completed_paths
+            completed_paths += num_paths
+            if progress_callback is not None:
+                progress_callback(completed_paths, self.num_simulations)
+            if cancel_event is not None and cancel_event.is_set():
+                raise SimulationCancelled()
+
+        return on_paths_done
+
+    def _run_shards(
+        self,
+        block_seeds: List[np.random.SeedSequence],
+        block_sizes: List[int],
+        on_paths_done: Callable[[int], None],
+        cancel_event: Optional[threading.Event] = None,
+        shards: Optional[List[Sequence[int]]] = None,
+        block_returns: Optional[Sequence[np.ndarray]] = None,
+        kept_returns: Optional[List[np.ndarray]] = None,
+    ) -> List[ShardResult]:
+        """Simulate blocks, in shards on the process pool when worthwhile
+
+        Returns one ``(successful_paths, aggregate, outcomes)`` triple per shard, in shard
+        order. ``shards`` lists block indexes per shard; by default blocks are
+        split evenly across the available workers. Given ``block_returns``
+        are used in-process rather than shipped to workers. Drawn return
+        matrices are appended to ``kept_returns`` in shard order when given.
+        """
+        workers = min(self.num_workers or configured_workers(), len(block_sizes))
+        if workers <= 1 or block_returns is not None:
+            if shards is None:
+                return [self._simulate_blocks(block_seeds, block_sizes, on_paths_done, block_returns, kept_returns)]
+            return [
+                self._simulate_blocks(
+                    [block_seeds[i] for i in shard],
+                    [block_sizes[i] for i in shard],
+                    on_paths_done,
+                    [block_returns[i] for i in shard] if block_returns is not None else None,
+                    kept_returns,
+                )
+                for shard in shards
+            ]
+
+        if shards is None:
+            shards = np.array_split(
+                np.arange(len(block_sizes)),
+                min(len(block_sizes), workers * SHARDS_PER_WORKER),
+            )
+        pool = _get_process_pool()
+        futures = [
+            pool.submit(
+                _run_shard,
+                self,
+                [block_seeds[i] for i in shard],
+                [block_sizes[i] for i in shard],
+                kept_returns is not None,
+            )
+            for shard in shards
+        ]
+        shard_paths = {future: sum(block_sizes[i] for i in shard) for future, shard in zip(futures, shards)}
+
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+                    on_paths_done(shard_paths[future])
+                if not done and cancel_event is not None and cancel_event.is_set():
+                    raise SimulationCancelled()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+        shard_results = []
+        for future in futures:
+            shard_result, shard_returns = future.result()
+            shard_results.append(shard_result)
+            if kept_returns is not None:
+                kept_returns.extend(shard_returns)
+        return shard_results
+
+    def _simulate_blocks(
+        self,
+        block_seeds: Sequence[np.random.SeedSequence],
+        block_sizes: Sequence[int],
+        on_block_done: Optional[Callable[[int], None]] = None,
+        block_returns: Optional[Sequence[np.ndarray]] = None,
+        kept_returns: Optional[List[np.ndarray]] = None,
+    ) -> ShardResult:
+        """Simulate consecutive blocks and aggregate them
+
+        Returns the number of successful paths together with either the
+        concatenated balances or, in streaming mode, a quantile sketch, and
+        the blocks' tax outcomes (None unless requested). Drawn return
+        matrices are appended to ``kept_returns`` when given.
+        """
+        successful_sims = 0
+        sketch = LogHistogramSketch(self._aggregate_rows()) if self.streaming else None
+        outcomes = self._new_tax_outcomes() if self.tax_outcomes else None
+        chunks = []
+
+        for index, (block_seed, num_paths) in enumerate(zip(block_seeds, block_sizes)):
+            if block_returns is not None:
+                returns = block_returns[index]
+            else:
+                returns = self._draw_returns(np.random.default_rng(block_seed), num_paths)
+                if kept_returns is not None:
+                    kept_returns.append(returns)
+            balances = self._simulate_paths(returns)
+            successful_sims += int(np.count_nonzero(balances[-1] > 0))
+            if sketch is not None:
+                sketch.update(balances)
+            else:
+                chunks.append(balances)
+            if outcomes is not None:
+                outcomes.update(self._pre_tax_balances(balances))
+            if on_block_done is not None:
+                on_block_done(num_paths)
+
+        if sketch is not None:
+            return successful_sims, sketch, outcomes
+        return successful_sims, chunks[0] if len(chunks) == 1 else np.concatenate(chunks, axis=1), outcomes
 
-        for i in range(self.num_simulations):
-            balance_path = self._simulate_single_path()
-            results.append(balance_path)
-            final_balances.append(balance_path[-1])
+    def _new_tax_outcomes(self) -> TaxOutcomes:
+        """Empty RMD and IRMAA accumulator for this simulator's years"""
+        years = np.arange(self.total_years)
+        ages = self.current_age + years
+        brackets = load_irmaa_brackets(brackets_path())
+        thresholds, part_b, part_d = brackets.tables(
+            self.start_year, self.total_years, filing_status_index(self.filing_status), self.inflation_rate * 100,
+        )
+        return TaxOutcomes(
+            ages=ages,
+            calendar_years=self.start_year + years,
+            divisors=RMDCalculator.divisor_array()[np.minimum(ages, MAX_DIVISOR_AGE)],
+            base_income=self.other_income * (1 + self.inflation_rate) ** years,
+            thresholds=thresholds,
+            surcharges=part_b + part_d,
+            tiers=brackets.tiers,
+            streaming=self.streaming,
+        )
 
-        # Calculate success rate (how many simulations didn't run out of money)
-        successful_sims = sum(1 for bal in final_balances if bal > 0)
-        success_rate = (successful_sims / self.num_simulations) * 100
+    def _pre_tax_balances(self, paths: np.ndarray) -> np.ndarray:
+        """Start-of-year pre-tax balance of every year and path, from ``_simulate_paths`` output"""
+        return paths[:-1] * self.pre_tax_fraction
 
-        # Calculate percentiles
-        final_balances_sorted = sorted(final_balances)
-        median_balance = final_balances_sorted[len(final_balances_sorted) // 2]
-        p10_balance = final_balances_sorted[int(len(final_balances_sorted) * 0.10)]
-        p90_balance = final_balances_sorted[int(len(final_balances_sorted) * 0.90)]
+    def _aggregate_rows(self) -> int:
+        """Rows per path in the array returned by ``_simulate_paths``; the last is the final total"""
+        return self.total_years + 1
 
-        # Calculate year-by-year statistics
-        year_stats = self._calculate_year_stats(results)
+    def _merge_aggregates(
+        self,
+        aggregates: List[Union[np.ndarray, LogHistogramSketch]],
+    ) -> Union[np.ndarray, LogHistogramSketch]:
+        """Combine per-shard aggregates, preserving block order"""
+        if len(aggregates) == 1:
+            return aggregates[0]
+        if self.streaming:
+            sketch = aggregates[0]
+            for other in aggregates[1:]:
+                sketch.merge(other)
+            return sketch
+        return np.concatenate(aggregates, axis=1)
+
+    def _merge_outcomes(self, outcomes: List[Optional[TaxOutcomes]]) -> Optional[TaxOutcomes]:
+        """Combine per-shard tax outcomes, preserving block order"""
+        if outcomes[0] is None:
+            return None
+        merged = outcomes[0]
+        for other in outcomes[1:]:
+            merged.merge(other)
+        return merged
+
+    def _final_quantiles(
+        self,
+        aggregate: Union[np.ndarray, LogHistogramSketch],
+        qs: Sequence[float],
+    ) -> np.ndarray:
+        """Quantiles (0-1) of the final balance"""
+        if self.streaming:
+            return aggregate.quantiles(qs)[:, -1]
+        return np.quantile(aggregate[-1], qs)
+
+    def _precision(
+        self,
+        successful_sims: int,
+        num_paths: int,
+        aggregate: Union[np.ndarray, LogHistogramSketch],
+    ) -> Dict:
+        """Achieved confidence-interval half-widths for success rate and median
+
+        The success rate uses a Wilson score interval (percentage points).
+        The median uses the distribution-free order-statistic interval,
+        reported as a percent of the median (None when the median is zero
+        but the interval is not).
+        """
+        z2 = Z_SCORE ** 2
+        p = successful_sims / num_paths
+        success_half_width = (
+            Z_SCORE * np.sqrt(p * (1 - p) / num_paths + z2 / (4 * num_paths ** 2)) / (1 + z2 / num_paths) * 100
+        )
+
+        rank_offset = Z_SCORE / (2 * np.sqrt(num_paths))
+        lower, median, upper = self._final_quantiles(
+            aggregate,
+            [max(0.0, 0.5 - rank_offset), 0.5, min(1.0, 0.5 + rank_offset)],
+        )
+        if median > 0:
+            median_half_width = (upper - lower) / 2 / median * 100
+        else:
+            median_half_width = 0.0 if upper == lower else None
 
         return {
+            "confidence_level": CONFIDENCE_LEVEL,
+            "success_rate_ci_half_width": round(float(success_half_width), 3),
+            "median_ci_half_width": round(float(median_half_width), 3) if median_half_width is not None else None,
+            "paths_used": num_paths,
+        }
+
+    def _targets_met(self, precision: Dict) -> bool:
+        """Whether the achieved precision satisfies every requested target"""
+        if self.target_success_ci is not None and precision["success_rate_ci_half_width"] > self.target_success_ci:
+            return False
+        if self.target_median_ci is not None:
+            median_half_width = precision["median_ci_half_width"]
+            if median_half_width is None or median_half_width > self.target_median_ci:
+                return False
+        return True
+
+    def _summarize(
+        self,
+        successful_sims: int,
+        num_paths: int,
+        aggregate: Union[np.ndarray, LogHistogramSketch],
+        precision: Optional[Dict] = None,
+        target_met: Optional[bool] = None,
+        outcomes: Optional[TaxOutcomes] = None,
+    ) -> Dict:
+        """Build the result dict from merged aggregates"""
+        if self.streaming:
+            p10, median, p90 = aggregate.quantiles([0.10, 0.50, 0.90])
+            year_stats = self._format_year_stats(p10, median, p90, aggregate.minimum, aggregate.maximum)
+            final_percentiles = (p10[-1], median[-1], p90[-1])
+            percentile_accuracy = aggregate.accuracy()
+        else:
+            final_percentiles = np.percentile(aggregate[-1], [10, 50, 90])
+            year_stats = self._calculate_year_stats(aggregate)
+            percentile_accuracy = {"method": "exact"}
+
+        precision = precision or self._precision(successful_sims, num_paths, aggregate)
+        if target_met is not None:
+            precision["target_met"] = target_met
+
+        success_rate = (successful_sims / num_paths) * 100
+        p10_balance, median_balance, p90_balance = (float(p) for p in final_percentiles)
+
+        results = {
             "success_rate": Decimal(str(round(success_rate, 2))),
             "median_final_balance": Decimal(str(round(median_balance, 2))),
             "percentile_10_balance": Decimal(str(round(max(0, p10_balance), 2))),
             "percentile_90_balance": Decimal(str(round(p90_balance, 2))),
-            "num_simulations": self.num_simulations,
+            "num_simulations": num_paths,
             "year_stats": year_stats,
+            "percentile_accuracy": percentile_accuracy,
+            "precision": precision,
+            "seed": self.seed,
         }
+        if outcomes is not None:
+            results["tax_outcomes"] = {
+                "filing_status": self.filing_status,
+                "start_year": self.start_year,
+                **outcomes.summary(),
+            }
+        return results
+
+    def _draw_returns(self, rng: np.random.Generator, num_paths: int) -> np.ndarray:
+        """Draw a year-major ``(total_years, num_paths)`` matrix of annual returns"""
+        if self.returns_dataset is not None:
+            history = load_historical_returns(self.returns_dataset)
+            return history.block_bootstrap(rng, self.total_years, num_paths, self.bootstrap_block_years)
+
+        returns = draw_standard_normals(self.sampling, rng, self.total_years, num_paths)
+        returns *= self.volatility
+        returns += self.expected_return
+        return returns
+
+    def _cashflow_schedule(self) -> np.ndarray:
+        """Inflation-adjusted net cash flow for each simulated year
+
+        Contributions are positive during working years and withdrawals are
+        negative during retirement; both grow with inflation from today.
+        """
+        years = np.arange(self.total_years)
+        inflation_factors = (1 + self.inflation_rate) ** years
+        working = self.current_age + years < self.retirement_age
+        return np.where(
+            working,
+            self.annual_contribution * inflation_factors,
+            -self.annual_withdrawal * inflation_factors,
+        )
+
+    def _withdrawal_kernel(self) -> WithdrawalKernel:
+        """Fresh withdrawal kernel for one block of paths"""
+        return WITHDRAWAL_KERNELS[self.withdrawal_strategy](
+            annual_withdrawal=self.annual_withdrawal,
+            withdrawal_rate=self.withdrawal_rate,
+            guardrail_band=self.guardrail_band,
+            guardrail_adjustment=self.guardrail_adjustment,
+            withdrawal_floor=self.withdrawal_floor,
+            withdrawal_ceiling=self.withdrawal_ceiling,
+        )
 
-    def _simulate_single_path(self) -> List[float]:
-        """Simulate a single retirement path"""
-        balance = self.current_savings
-        path = [balance]
+    def _simulate_paths(self, returns: np.ndarray) -> np.ndarray:
+        """Propagate balances for every path given a matrix of annual returns
+
+        ``returns`` is year-major with shape ``(total_years, paths)`` so each
+        year's update touches one contiguous row. Returns an array of shape
+        ``(total_years + 1, paths)`` where row 0 is the starting balance.
+        Retired years withdraw the withdrawal kernel's amount, sized from the
+        start-of-year balance. Once a path runs out of money it stays at zero.
+        """
+        num_paths = returns.shape[1]
+        cashflows = self._cashflow_schedule()
+        inflation_factors = (1 + self.inflation_rate) ** np.arange(self.total_years)
+        kernel = self._withdrawal_kernel()
+
+        balances = np.empty((self.total_years + 1, num_paths))
+        balances[0] = self.current_savings
+        alive = np.ones(num_paths, dtype=bool)
 
         for year in range(self.total_years):
             age = self.current_age + year
+            balance = balances[year + 1]
+            np.multiply(balances[year], returns[year] + 1, out=balance)
+            if age < self.retirement_age:
+                balance += cashflows[year]
+            else:
+                balance -= kernel.withdraw(age, inflation_factors[year], balances[year])
+            np.maximum(balance, 0, out=balance)
+            balance *= alive
+            alive &= balance > 0
 
-            # Generate random return for this year
-            random_return = np.random.normal(self.expected_return, self.volatility)
+        return balances
 
-            # Apply return
-            balance *= (1 + random_return)
+    def _calculate_year_stats(self, balances: np.ndarray) -> List[Dict]:
+        """Calculate statistics for each year across all simulations
 
-            # Add contributions during working years
-            if age < self.retirement_age:
-                # Adjust contribution for inflation
-                inflated_contribution = self.annual_contribution * ((1 + self.inflation_rate) ** year)
-                balance += inflated_contribution
-
-            # Subtract withdrawals during retirement
-            if age >= self.retirement_age:
-                years_in_retirement = age - self.retirement_age
-                # Adjust withdrawal for inflation
-                inflated_withdrawal = self.annual_withdrawal * (
-                            (1 + self.inflation_rate) ** (self.years_to_retirement + years_in_retirement))
-                balance -= inflated_withdrawal
-
-            # Balance cannot go negative
-            balance = max(0, balance)
-            path.append(balance)
-
-            # If balance hits zero, it stays zero
-            if balance == 0:
-                break
-
-        # Fill remaining years with zeros if ran out early
-        while len(path) < self.total_years + 1:
-            path.append(0)
-
-        return path
-
-    def _calculate_year_stats(self, results: List[List[float]]) -> List[Dict]:
-        """Calculate statistics for each year across all simulations"""
-        year_stats = []
-
-        for year_idx in range(self.total_years + 1):
-            balances_this_year = [sim[year_idx] for sim in results if year_idx < len(sim)]
-            balances_sorted = sorted(balances_this_year)
-
-            year_stats.append(
-                {
-                    "year": year_idx,
-                    "age": self.current_age + year_idx,
-                    "median": round(balances_sorted[len(balances_sorted) // 2], 2),
-                    "p10": round(balances_sorted[int(len(balances_sorted) * 0.10)], 2),
-                    "p90": round(balances_sorted[int(len(balances_sorted) * 0.90)], 2),
-                    "min": round(min(balances_this_year), 2),
-                    "max": round(max(balances_this_year), 2),
-                },
-            )
+        A single sort of each year's row yields all of them: min and max are
+        its ends and the percentiles read off neighbouring order statistics.
+        On simulated balances NumPy's vectorized sort is several times faster
+        than ``np.percentile`` or a multi-``kth`` ``np.partition``.
+        """
+        ordered = np.sort(balances, axis=1)
+        p10, median, p90 = _sorted_percentiles(ordered, [10, 50, 90])
+        return self._format_year_stats(p10, median, p90, ordered[:, 0], ordered[:, -1])
 
-        return year_stats
+    def _format_year_stats(
+        self,
+        p10: np.ndarray,
+        median: np.ndarray,
+        p90: np.ndarray,
+        minimum: np.ndarray,
+        maximum: np.ndarray,
+    ) -> List[Dict]:
+        """Turn per-year statistic columns into the year_stats list"""
+        columns = [np.round(column, 2).tolist() for column in (median, p10, p90, minimum, maximum)]
+
+        return [
+            {
+                "year": year_idx,
+                "age": self.current_age + year_idx,
+                "median": median_value,
+                "p10": p10_value,
+                "p90": p90_value,
+                "min": min_value,
+                "max": max_value,
+            }
+            for year_idx, (median_value, p10_value, p90_value, min_value, max_value)
+            in enumerate(zip(*columns))
+        ]
 
 
 class RMDCalculator:
     """Calculate Required Minimum Distributions"""
 
-    # IRS Uniform Lifetime Table (2024+)
-    LIFE_EXPECTANCY_TABLE = {
-        72: 27.4, 73: 26.5, 74: 25.5, 75: 24.6, 76: 23.7, 77: 22.9, 78: 22.0, 79: 21.1,
-        80: 20.2, 81: 19.4, 82: 18.5, 83: 17.7, 84: 16.8, 85: 16.0, 86: 15.2, 87: 14.4,
-        88: 13.7, 89: 12.9, 90: 12.2, 91: 11.5, 92: 10.8, 93: 10.1, 94: 9.5, 95: 8.9,
-        96: 8.4, 97: 7.8, 98: 7.3, 99: 6.8, 100: 6.4, 101: 6.0, 102: 5.6, 103: 5.2,
-        104: 4.9, 105: 4.6, 106: 4.3, 107: 4.1, 108: 3.9, 109: 3.7, 110: 3.5, 111: 3.4,
-        112: 3.3, 113: 3.1, 114: 3.0, 115: 2.9, 116: 2.8, 117: 2.7, 118: 2.5, 119: 2.3,
-        120: 2.0,
-    }
-
     @staticmethod
     def calculate_rmd(age: int, account_balance: Decimal) -> Tuple[Decimal, Decimal]:
         """
@@ -161,22 +817,83 @@ class RMDCalculator:
         Returns:
             Tuple of (rmd_amount, life_expectancy_factor)
         """
-        if age < 73:  # Minimum RMD age (may vary by birth year)
+        if age < RMD_START_AGE:  # Minimum RMD age (may vary by birth year)
             return Decimal("0.00"), Decimal("0.00")
 
-        # Get life expectancy from IRS table
-        life_expectancy = RMDCalculator.LIFE_EXPECTANCY_TABLE.get(age)
-
-        if life_expectancy is None:
-            if age > 120:
-                life_expectancy = 2.0  # Use minimum for very old ages
-            else:
-                # Age is below minimum table age (72), should not calculate RMD
-                return Decimal("0.00"), Decimal("0.00")
+        # Get life expectancy from IRS table; very old ages use its final divisor
+        life_expectancy = float(UNIFORM_LIFETIME_DIVISORS[min(age, MAX_DIVISOR_AGE)])
 
         rmd_amount = account_balance / Decimal(str(life_expectancy))
         return rmd_amount, Decimal(str(life_expectancy))
 
+    @staticmethod
+    def divisor_array() -> np.ndarray:
+        """Life expectancy divisor indexed by age, up to ``MAX_DIVISOR_AGE``; ``inf`` before RMDs start"""
+        return rmd_divisors(RMD_START_AGE)
+
+    @staticmethod
+    def project_rmds_batch(
+        starting_ages: Sequence[int],
+        ending_ages: Sequence[int],
+        pre_tax_balances: Sequence[float],
+        expected_returns: Union[Sequence[float], np.ndarray],
+        additional_withdrawals: Union[float, Sequence[float]] = 0.0,
+    ) -> Dict[str, np.ndarray]:
+        """Project RMDs for many accounts at once in floating point
+
+        Inputs hold one value per trajectory (scalars broadcast);
+        ``expected_returns`` are annual percents, either one per trajectory
+        or a ``(trajectories, years)`` array. Every output is a
+        ``(trajectories, years)`` array spanning the longest trajectory,
+        with ``valid`` marking the years up to each trajectory's ending age.
+        """
+        starting, ending, balance, additional = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(starting_ages, dtype=np.int64)),
+            np.atleast_1d(np.asarray(ending_ages, dtype=np.int64)),
+            np.atleast_1d(np.asarray(pre_tax_balances, dtype=float)),
+            np.atleast_1d(np.asarray(additional_withdrawals, dtype=float)),
+        )
+        num_trajectories = len(starting)
+        num_years = max(int((ending - starting).max(initial=-1)) + 1, 0)
+        growth = 1 + np.asarray(expected_returns, dtype=float) / 100.0
+        if growth.ndim < 2:
+            growth = np.broadcast_to(growth, (num_years, num_trajectories)).T
+        divisors = RMDCalculator.divisor_array()
+
+        ages = starting[:, None] + np.arange(num_years)
+        factors = divisors[np.minimum(ages, MAX_DIVISOR_AGE)]
+        balances = np.empty((num_trajectories, num_years))
+        rmds = np.empty((num_trajectories, num_years))
+        balance = balance.copy()
+        for year in range(num_years):
+            balances[:, year] = balance
+            np.divide(balance, factors[:, year], out=rmds[:, year])
+            balance -= rmds[:, year] + additional
+            balance *= growth[:, year]
+            np.maximum(balance, 0.0, out=balance)
+
+        return {
+            "age": ages,
+            "valid": ages <= ending[:, None],
+            "account_balance": balances,
+            "rmd_amount": rmds,
+            "life_expectancy_factor": np.where(np.isfinite(factors), factors, 0.0),
+            "total_withdrawal": rmds + additional[:, None],
+        }
+
+    @staticmethod
+    def income_by_age(batch: Dict[str, np.ndarray]) -> np.ndarray:
+        """RMD amounts of a batch projection indexed by age, shape ``(trajectories, MAX_DIVISOR_AGE + 1)``"""
+        income = np.zeros((len(batch["age"]), MAX_DIVISOR_AGE + 1))
+        rows, years = np.nonzero(batch["valid"] & (batch["age"] <= MAX_DIVISOR_AGE))
+        income[rows, batch["age"][rows, years]] = batch["rmd_amount"][rows, years]
+        return income
+
+    @staticmethod
+    def to_cents(value: float) -> Decimal:
+        """Round a projected float amount to cents"""
+        return Decimal(repr(float(value))).quantize(CENT, rounding=ROUND_HALF_UP)
+
     @staticmethod
     def project_rmds(
         starting_age: int,
@@ -191,93 +908,134 @@ class RMDCalculator:
         Returns:
             List of dicts with year, age, balance, and rmd_amount
         """
-        projections = []
-        balance = pre_tax_balance
-        return_rate = float(expected_return) / 100.0
-
-        for age in range(starting_age, ending_age + 1):
-            # Calculate RMD for this year
-            rmd_amount, life_exp = RMDCalculator.calculate_rmd(age, balance)
-            total_withdrawal = rmd_amount + additional_withdrawals
-
-            projections.append(
-                {
-                    "year": age - starting_age,
-                    "age": age,
-                    "account_balance": float(balance),
-                    "rmd_amount": float(rmd_amount),
-                    "life_expectancy_factor": float(life_exp),
-                    "total_withdrawal": float(total_withdrawal),
-                },
-            )
-
-            # Update balance for next year
-            balance -= total_withdrawal
-            balance *= Decimal(str(1 + return_rate))
-            balance = max(Decimal("0.00"), balance)
-
-        return projections
+        batch = RMDCalculator.project_rmds_batch(
+            [starting_age], [ending_age], [float(pre_tax_balance)], [float(expected_return)],
+            float(additional_withdrawals),
+        )
+        cents = RMDCalculator.to_cents
+        balances, rmds, factors, totals = (
+            batch[key][0].tolist()
+            for key in ("account_balance", "rmd_amount", "life_expectancy_factor", "total_withdrawal")
+        )
+        return [
+            {
+                "year": year,
+                "age": starting_age + year,
+                "account_balance": float(cents(balances[year])),
+                "rmd_amount": float(cents(rmds[year])),
+                "life_expectancy_factor": factors[year],
+                "total_withdrawal": float(cents(totals[year])),
+            }
+            for year in range(batch["age"].shape[1])
+        ]
 
 
 class IRMAACalculator:
-    """Calculate IRMAA (Income-Related Monthly Adjustment Amount) for Medicare"""
-
-    # 2024 IRMAA brackets (single filer)
-    IRMAA_BRACKETS_SINGLE = [
-        {"max_magi": 103000, "tier": "standard", "part_b_surcharge": 0, "part_d_surcharge": 0},
-        {"max_magi": 129000, "tier": "tier1", "part_b_surcharge": 69.90, "part_d_surcharge": 12.20},
-        {"max_magi": 161000, "tier": "tier2", "part_b_surcharge": 174.70, "part_d_surcharge": 31.50},
-        {"max_magi": 193000, "tier": "tier3", "part_b_surcharge": 279.50, "part_d_surcharge": 50.70},
-        {"max_magi": 500000, "tier": "tier4", "part_b_surcharge": 384.30, "part_d_surcharge": 70.00},
-        {"max_magi": float('inf'), "tier": "tier5", "part_b_surcharge": 419.30, "part_d_surcharge": 76.40},
-    ]
-
-    # 2024 IRMAA brackets (married filing jointly)
-    IRMAA_BRACKETS_MARRIED = [
-        {"max_magi": 206000, "tier": "standard", "part_b_surcharge": 0, "part_d_surcharge": 0},
-        {"max_magi": 258000, "tier": "tier1", "part_b_surcharge": 69.90, "part_d_surcharge": 12.20},
-        {"max_magi": 322000, "tier": "tier2", "part_b_surcharge": 174.70, "part_d_surcharge": 31.50},
-        {"max_magi": 386000, "tier": "tier3", "part_b_surcharge": 279.50, "part_d_surcharge": 50.70},
-        {"max_magi": 750000, "tier": "tier4", "part_b_surcharge": 384.30, "part_d_surcharge": 70.00},
-        {"max_magi": float('inf'), "tier": "tier5", "part_b_surcharge": 419.30, "part_d_surcharge": 76.40},
-    ]
+    """Calculate IRMAA (Income-Related Monthly Adjustment Amount) for Medicare
+
+    Brackets come from the year-versioned table file (see
+    ``irmaa_brackets``); a projection uses the table of each calendar year
+    it covers, indexed for inflation past the last published year.
+    """
 
     @staticmethod
-    def calculate_irmaa(magi: Decimal, filing_status: str = "single") -> Dict:
+    def calculate_irmaa(magi: Decimal, filing_status: str = "single", year: Optional[int] = None) -> Dict:
         """
         Calculate IRMAA surcharge based on MAGI
         
         Args:
             magi: Modified Adjusted Gross Income
             filing_status: "single" or "married"
+            year: Premium year whose brackets apply (defaults to the current year)
             
         Returns:
             Dict with tier, monthly and annual surcharges
         """
-        brackets = (IRMAACalculator.IRMAA_BRACKETS_MARRIED
-                    if filing_status == "married"
-                    else IRMAACalculator.IRMAA_BRACKETS_SINGLE)
-
-        magi_float = float(magi)
-
-        for bracket in brackets:
-            if magi_float <= bracket["max_magi"]:
-                monthly_surcharge = bracket["part_b_surcharge"] + bracket["part_d_surcharge"]
-                return {
-                    "tier": bracket["tier"],
-                    "part_b_monthly": Decimal(str(bracket["part_b_surcharge"])),
-                    "part_d_monthly": Decimal(str(bracket["part_d_surcharge"])),
-                    "monthly_total": Decimal(str(monthly_surcharge)),
-                    "annual_total": Decimal(str(monthly_surcharge * 12)),
-                }
-
-        # Shouldn't reach here, but return highest tier as fallback
+        brackets = load_irmaa_brackets(brackets_path())
+        thresholds, part_b, part_d = brackets.table(year or date.today().year, filing_status_index(filing_status))
+        tier = int(np.searchsorted(thresholds, float(magi), side="left"))
+        monthly_surcharge = part_b[tier] + part_d[tier]
+        return {
+            "tier": brackets.tiers[tier],
+            "part_b_monthly": RMDCalculator.to_cents(part_b[tier]),
+            "part_d_monthly": RMDCalculator.to_cents(part_d[tier]),
+            "monthly_total": RMDCalculator.to_cents(monthly_surcharge),
+            "annual_total": RMDCalculator.to_cents(monthly_surcharge * 12),
+        }
+
+    @staticmethod
+    def project_irmaa_batch(
+        starting_ages: Sequence[int],
+        ending_ages: Sequence[int],
+        base_income: Sequence[float],
+        rmd_income_by_age: Optional[np.ndarray] = None,
+        filing_statuses: Union[str, Sequence[str]] = "single",
+        start_year: Optional[int] = None,
+        threshold_inflation: Optional[float] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Project IRMAA tiers and surcharges for many people at once
+
+        ``base_income`` is each person's yearly MAGI before RMDs and
+        ``rmd_income_by_age`` their RMD income indexed by age, as built by
+        ``RMDCalculator.income_by_age``. The first projected year is
+        ``start_year`` (defaulting to the current year) for everyone.
+        Outputs are ``(people, years)`` arrays spanning the longest
+        projection, with ``valid`` marking the years up to each ending age
+        and ``tier`` indexing ``irmaa_tiers()``.
+        """
+        starting, ending, income, statuses = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(starting_ages, dtype=np.int64)),
+            np.atleast_1d(np.asarray(ending_ages, dtype=np.int64)),
+            np.atleast_1d(np.asarray(base_income, dtype=float)),
+            np.atleast_1d(np.asarray(filing_statuses)),
+        )
+        num_people = len(starting)
+        num_years = max(int((ending - starting).max(initial=-1)) + 1, 0)
+        ages = starting[:, None] + np.arange(num_years)
+
+        if rmd_income_by_age is None:
+            rmd_income = np.zeros((num_people, num_years))
+        else:
+            rmd_income_by_age = np.asarray(rmd_income_by_age, dtype=float)
+            age_index = np.minimum(ages, rmd_income_by_age.shape[1] - 1)
+            rmd_income = np.take_along_axis(rmd_income_by_age, age_index, axis=1)
+        magi = income[:, None] + rmd_income
+
+        brackets = load_irmaa_brackets(brackets_path())
+        first_year = start_year or date.today().year
+        tiers = np.empty((num_people, num_years), dtype=np.int64)
+        monthly = np.empty((num_people, num_years))
+        married = statuses == "married"
+        groups = (
+            (filing_status_index("single"), np.flatnonzero(~married)),
+            (filing_status_index("married"), np.flatnonzero(married)),
+        )
+        for status, people in groups:
+            if len(people) == 0:
+                continue
+            thresholds, part_b, part_d = brackets.tables(first_year, num_years, status, threshold_inflation)
+            surcharges = part_b + part_d
+            for year in range(num_years):
+                tier = np.searchsorted(thresholds[year], magi[people, year], side="left")
+                tiers[people, year] = tier
+                monthly[people, year] = surcharges[year, tier]
+
         return {
-            "tier": "tier5",
-            "monthly_total": Decimal("495.70"),
-            "annual_total": Decimal("5948.40"),
+            "age": ages,
+            "valid": ages <= ending[:, None],
+            "calendar_year": np.broadcast_to(first_year + np.arange(num_years), ages.shape),
+            "magi": magi,
+            "rmd_income": rmd_income,
+            "tier": tiers,
+            "monthly_surcharge": monthly,
+            "annual_surcharge": monthly * 12,
         }
 
+    @staticmethod
+    def irmaa_tiers() -> Tuple[str, ...]:
+        """Tier names indexed by the ``tier`` arrays of batch projections"""
+        return load_irmaa_brackets(brackets_path()).tiers
+
     @staticmethod
     def project_irmaa(
         starting_age: int,
@@ -285,6 +1043,8 @@ class IRMAACalculator:
         income_sources: Dict[str, Decimal],
         rmd_projections: List[Dict],
         filing_status: str = "single",
+        start_year: Optional[int] = None,
+        threshold_inflation: Optional[float] = None,
     ) -> List[Dict]:
         """
         Project IRMAA costs over retirement years
@@ -295,42 +1055,42 @@ class IRMAACalculator:
             income_sources: Dict of income sources (social_security, pension, investment_income, etc.)
             rmd_projections: List of RMD projections from RMDCalculator
             filing_status: "single" or "married"
+            start_year: Calendar year of the starting age (defaults to the current year)
+            threshold_inflation: Yearly bracket indexing (percent) past the last published table
             
         Returns:
             List of IRMAA projections by year
         """
-        projections = []
-
-        for age in range(starting_age, ending_age + 1):
-            # Find RMD for this age
-            rmd_income = Decimal("0.00")
-            for rmd_proj in rmd_projections:
-                if rmd_proj["age"] == age:
-                    rmd_income = Decimal(str(rmd_proj["rmd_amount"]))
-                    break
-
-            # Calculate total income (MAGI approximation)
-            total_income = (
-                    income_sources.get("social_security", Decimal("0.00")) +
-                    income_sources.get("pension", Decimal("0.00")) +
-                    income_sources.get("investment_income", Decimal("0.00")) +
-                    rmd_income +
-                    income_sources.get("other_income", Decimal("0.00"))
-            )
+        rmd_income_by_age = np.zeros((1, MAX_DIVISOR_AGE + 1))
+        for rmd_proj in reversed(rmd_projections):  # The first entry for an age wins
+            if 0 <= rmd_proj["age"] <= MAX_DIVISOR_AGE:
+                rmd_income_by_age[0, rmd_proj["age"]] = float(rmd_proj["rmd_amount"])
 
-            # Calculate IRMAA
-            irmaa_result = IRMAACalculator.calculate_irmaa(total_income, filing_status)
-
-            projections.append(
-                {
-                    "year": age - starting_age,
-                    "age": age,
-                    "magi": float(total_income),
-                    "rmd_income": float(rmd_income),
-                    "irmaa_tier": irmaa_result["tier"],
-                    "monthly_surcharge": float(irmaa_result["monthly_total"]),
-                    "annual_surcharge": float(irmaa_result["annual_total"]),
-                },
-            )
+        base_income = sum(
+            float(income_sources.get(source, Decimal("0.00")))
+            for source in ("social_security", "pension", "investment_income", "other_income")
+        )
+        batch = IRMAACalculator.project_irmaa_batch(
+            [starting_age], [ending_age], [base_income], rmd_income_by_age, filing_status,
+            start_year, threshold_inflation,
+        )
 
-        return projections
+        tier_names = IRMAACalculator.irmaa_tiers()
+        cents = RMDCalculator.to_cents
+        magi, rmd_income, tiers, monthly, annual, years = (
+            batch[key][0].tolist()
+            for key in ("magi", "rmd_income", "tier", "monthly_surcharge", "annual_surcharge", "calendar_year")
+        )
+        return [
+            {
+                "year": year,
+                "calendar_year": years[year],
+                "age": starting_age + year,
+                "magi": float(cents(magi[year])),
+                "rmd_income": float(cents(rmd_income[year])),
+                "irmaa_tier": tier_names[tiers[year]],
+                "monthly_surcharge": float(cents(monthly[year])),
+                "annual_surcharge": float(cents(annual[year])),
+            }
+            for year in range(batch["age"].shape[1])
+        ]
@@ -0,0 +1,335 @@
+"""
+Correlated multi-asset Monte Carlo simulation over tax buckets
+"""
+from collections import defaultdict
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..models.investment import Investment, InvestmentType
+from ..models.investment_tax import InvestmentTaxBucket, TaxClassification
+from .monte_carlo_service import MonteCarloSimulator
+from .quantile_sketch import LogHistogramSketch
+from .tax_outcomes import TaxOutcomes
+
+# Long-run nominal (expected return %, volatility %) per asset class
+ASSET_ASSUMPTIONS: Dict[InvestmentType, Tuple[float, float]] = {
+    InvestmentType.STOCK: (7.0, 16.0),
+    InvestmentType.BOND: (4.0, 6.0),
+    InvestmentType.MUTUAL_FUND: (6.0, 12.0),
+    InvestmentType.ETF: (6.5, 14.0),
+    InvestmentType.CRYPTO: (8.0, 65.0),
+    InvestmentType.REAL_ESTATE: (6.0, 15.0),
+    InvestmentType.COMMODITY: (3.5, 16.0),
+    InvestmentType.OTHER: (4.0, 10.0),
+}
+
+# Correlations of annual returns, rows and columns in ``InvestmentType`` order
+ASSET_CORRELATIONS = np.array([
+    # STOCK BOND  MF    ETF   CRYPTO RE   COMM  OTHER
+    [1.00, 0.10, 0.90, 0.95, 0.30, 0.60, 0.30, 0.50],
+    [0.10, 1.00, 0.30, 0.20, 0.00, 0.20, 0.00, 0.30],
+    [0.90, 0.30, 1.00, 0.90, 0.25, 0.55, 0.25, 0.50],
+    [0.95, 0.20, 0.90, 1.00, 0.30, 0.60, 0.30, 0.50],
+    [0.30, 0.00, 0.25, 0.30, 1.00, 0.20, 0.20, 0.20],
+    [0.60, 0.20, 0.55, 0.60, 0.20, 1.00, 0.30, 0.40],
+    [0.30, 0.00, 0.25, 0.30, 0.20, 0.30, 1.00, 0.30],
+    [0.50, 0.30, 0.50, 0.50, 0.20, 0.40, 0.30, 1.00],
+])
+
+# Tax buckets in the order withdrawals draw on them: taxable money first,
+# tax-deferred next, tax-free last
+BUCKETS = (
+    TaxClassification.TAXABLE,
+    TaxClassification.AFTER_TAX,
+    TaxClassification.PRE_TAX,
+    TaxClassification.ROTH,
+)
+
+
+@lru_cache(maxsize=64)
+def correlation_cholesky(asset_types: Tuple[InvestmentType, ...]) -> np.ndarray:
+    """Lower Cholesky factor of the correlation matrix of the given asset classes"""
+    index = [list(InvestmentType).index(asset_type) for asset_type in asset_types]
+    factor = np.linalg.cholesky(ASSET_CORRELATIONS[np.ix_(index, index)])
+    factor.setflags(write=False)
+    return factor
+
+
+class PortfolioAllocation:
+    """Dollar holdings per (tax bucket, asset class)
+
+    ``holdings`` has one row per entry of ``BUCKETS`` and one column per
+    entry of ``asset_types``.
+    """
+
+    def __init__(self, holdings: np.ndarray, asset_types: Sequence[InvestmentType]):
+        self.holdings = np.asarray(holdings, dtype=np.float64)
+        self.asset_types = tuple(InvestmentType(asset_type) for asset_type in asset_types)
+        if self.holdings.shape != (len(BUCKETS), len(self.asset_types)):
+            raise ValueError("holdings must have one row per tax bucket and one column per asset class")
+        if self.total <= 0:
+            raise ValueError("Portfolio has no value to simulate")
+
+    @classmethod
+    def from_accounts(
+        cls,
+        investments: Iterable[Investment],
+        tax_buckets: Iterable[InvestmentTaxBucket],
+    ) -> "PortfolioAllocation":
+        """Combine holdings and tax bucket balances, account by account
+
+        Each account's tax bucket balances are split across asset classes
+        in proportion to the market value of the account's holdings.
+        Accounts with buckets but no holdings use the mix of all holdings;
+        accounts with holdings but no buckets count as taxable.
+        """
+        account_values: Dict[int, Dict[InvestmentType, float]] = defaultdict(lambda: defaultdict(float))
+        for investment in investments:
+            value = float(investment.quantity * investment.current_price)
+            account_values[investment.account_id][InvestmentType(investment.investment_type)] += value
+
+        account_buckets: Dict[int, Dict[TaxClassification, float]] = defaultdict(lambda: defaultdict(float))
+        for bucket in tax_buckets:
+            account_buckets[bucket.account_id][TaxClassification(bucket.tax_classification)] += float(bucket.balance)
+
+        overall_mix = np.zeros(len(InvestmentType))
+        for values in account_values.values():
+            for asset_type, value in values.items():
+                overall_mix[list(InvestmentType).index(asset_type)] += value
+        if overall_mix.sum() <= 0:
+            raise ValueError("No investment holdings to build an allocation from")
+        overall_mix /= overall_mix.sum()
+
+        holdings = np.zeros((len(BUCKETS), len(InvestmentType)))
+        for account_id in account_values.keys() | account_buckets.keys():
+            values = account_values.get(account_id, {})
+            mix = np.array([values.get(asset_type, 0.0) for asset_type in InvestmentType])
+            mix = mix / mix.sum() if mix.sum() > 0 else overall_mix
+
+            balances = account_buckets.get(account_id) or {TaxClassification.TAXABLE: float(sum(values.values()))}
+            for bucket, balance in balances.items():
+                holdings[BUCKETS.index(bucket)] += balance * mix
+
+        held = holdings.sum(axis=0) > 0
+        return cls(holdings[:, held], [asset_type for asset_type, keep in zip(InvestmentType, held) if keep])
+
+    @property
+    def total(self) -> float:
+        return float(self.holdings.sum())
+
+    @property
+    def bucket_balances(self) -> np.ndarray:
+        return self.holdings.sum(axis=1)
+
+    @property
+    def asset_weights(self) -> np.ndarray:
+        """Portfolio-wide weight of each asset class"""
+        return self.holdings.sum(axis=0) / self.total
+
+    def target_weights(self) -> np.ndarray:
+        """Asset mix of each bucket, ``(buckets, assets)``; empty buckets use the portfolio mix"""
+        bucket_balances = self.bucket_balances[:, None]
+        return np.where(
+            bucket_balances > 0,
+            self.holdings / np.where(bucket_balances > 0, bucket_balances, 1.0),
+            self.asset_weights,
+        )
+
+    def summary(self) -> Dict:
+        return {
+            "total": round(self.total, 2),
+            "buckets": {str(bucket): round(float(balance), 2) for bucket, balance in zip(BUCKETS, self.bucket_balances)},
+            "asset_weights": {
+                str(asset_type): round(float(weight) * 100, 2)
+                for asset_type, weight in zip(self.asset_types, self.asset_weights)
+            },
+        }
+
+
+class MultiAssetSimulator(MonteCarloSimulator):
+    """Monte Carlo simulation of a multi-asset portfolio held across tax buckets
+
+    Each year draws one return per asset class and path from a multivariate
+    normal distribution (correlated through the cached Cholesky factor of
+    the asset correlation matrix). Holdings are evolved as a single
+    ``(buckets, assets, paths)`` tensor: contributions go to
+    ``contribution_bucket`` at that bucket's target mix, withdrawals are
+    taken pro rata across assets from the buckets in ``BUCKETS`` order, and
+    every ``rebalance_years`` years (0 disables) each bucket is reset to its
+    starting asset mix. Rebalancing is assumed to be free of costs and taxes.
+
+    Aggregates stack the per-year balance of every bucket followed by the
+    total, so blocking, sharding, streaming and adaptive precision work as
+    for the single-asset engine and results gain ``bucket_stats``. Tax
+    outcomes use the simulated pre-tax bucket itself.
+    """
+
+    def __init__(
+        self,
+        allocation: PortfolioAllocation,
+        current_age: int,
+        retirement_age: int,
+        life_expectancy: int,
+        annual_contribution: Decimal,
+        annual_withdrawal: Decimal,
+        inflation_rate: Decimal = Decimal("2.5"),
+        num_simulations: int = 10000,
+        seed: Optional[int] = None,
+        streaming: Optional[bool] = None,
+        chunk_size: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        target_success_ci: Optional[Decimal] = None,
+        target_median_ci: Optional[Decimal] = None,
+        rebalance_years: int = 1,
+        contribution_bucket: TaxClassification = TaxClassification.PRE_TAX,
+        asset_assumptions: Optional[Dict[InvestmentType, Tuple[Decimal, Decimal]]] = None,
+        tax_outcomes: bool = False,
+        other_income: Decimal = Decimal("0"),
+        filing_status: str = "single",
+        start_year: Optional[int] = None,
+    ):
+        self.allocation = allocation
+        self.rebalance_years = rebalance_years
+        self.contribution_bucket = TaxClassification(contribution_bucket)
+
+        assumptions = {**ASSET_ASSUMPTIONS, **(asset_assumptions or {})}
+        self.asset_returns = np.array([float(assumptions[a][0]) / 100.0 for a in allocation.asset_types])
+        self.asset_volatilities = np.array([float(assumptions[a][1]) / 100.0 for a in allocation.asset_types])
+        self.target_weights = allocation.target_weights()
+
+        # Portfolio-level moments, reported through the base class fields
+        weights = allocation.asset_weights
+        factor = self.asset_volatilities[:, None] * correlation_cholesky(allocation.asset_types)
+        portfolio_volatility = float(np.linalg.norm(weights @ factor))
+
+        super().__init__(
+            current_age=current_age,
+            retirement_age=retirement_age,
+            life_expectancy=life_expectancy,
+            current_savings=Decimal(str(allocation.total)),
+            annual_contribution=annual_contribution,
+            annual_withdrawal=annual_withdrawal,
+            expected_return=Decimal(str(float(weights @ self.asset_returns) * 100)),
+            volatility=Decimal(str(portfolio_volatility * 100)),
+            inflation_rate=inflation_rate,
+            num_simulations=num_simulations,
+            seed=seed,
+            streaming=streaming,
+            chunk_size=chunk_size,
+            num_workers=num_workers,
+            target_success_ci=target_success_ci,
+            target_median_ci=target_median_ci,
+            tax_outcomes=tax_outcomes,
+            other_income=other_income,
+            filing_status=filing_status,
+            start_year=start_year,
+        )
+
+    def cache_parameters(self) -> Dict:
+        return {
+            **super().cache_parameters(),
+            "engine": "multi_asset",
+            "asset_types": [str(asset_type) for asset_type in self.allocation.asset_types],
+            "holdings": self.allocation.holdings.round(2).tolist(),
+            "asset_returns": self.asset_returns.tolist(),
+            "asset_volatilities": self.asset_volatilities.tolist(),
+            "rebalance_years": self.rebalance_years,
+            "contribution_bucket": str(self.contribution_bucket),
+        }
+
+    def _aggregate_rows(self) -> int:
+        return (len(BUCKETS) + 1) * (self.total_years + 1)
+
+    def _draw_returns(self, rng: np.random.Generator, num_paths: int) -> np.ndarray:
+        """Draw a ``(total_years, assets, num_paths)`` tensor of correlated annual returns"""
+        factor = self.asset_volatilities[:, None] * correlation_cholesky(self.allocation.asset_types)
+        shocks = rng.standard_normal((self.total_years, len(self.asset_returns), num_paths))
+        returns = np.matmul(factor, shocks)
+        returns += self.asset_returns[:, None]
+        # A holding can lose at most everything
+        return np.maximum(returns, -1.0, out=returns)
+
+    def _simulate_paths(self, returns: np.ndarray) -> np.ndarray:
+        """Propagate holdings per bucket and asset class for every path
+
+        Returns the stacked ``((buckets + 1) * (total_years + 1), paths)``
+        balances: each bucket's per-year balance, then the per-year total.
+        """
+        num_paths = returns.shape[2]
+        num_buckets = len(BUCKETS)
+        cashflows = self._cashflow_schedule()
+        contribution_index = BUCKETS.index(self.contribution_bucket)
+
+        holdings = np.repeat(self.allocation.holdings[:, :, None], num_paths, axis=2)
+        balances = np.empty((num_buckets + 1, self.total_years + 1, num_paths))
+        balances[:num_buckets, 0] = self.allocation.bucket_balances[:, None]
+        balances[num_buckets, 0] = self.allocation.total
+        alive = np.ones(num_paths, dtype=bool)
+
+        for year in range(self.total_years):
+            holdings *= returns[year] + 1
+
+            cashflow = cashflows[year]
+            if cashflow > 0:
+                holdings[contribution_index] += cashflow * self.target_weights[contribution_index, :, None]
+            elif cashflow < 0:
+                need = np.full(num_paths, -cashflow)
+                for bucket in range(num_buckets):
+                    bucket_balance = holdings[bucket].sum(axis=0)
+                    taken = np.minimum(need, bucket_balance)
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        remaining = np.where(bucket_balance > 0, 1 - taken / bucket_balance, 0.0)
+                    holdings[bucket] *= remaining
+                    need -= taken
+                # A path that cannot meet its spending is depleted and stays at zero
+                alive &= need <= 1e-6
+
+            if self.rebalance_years and (year + 1) % self.rebalance_years == 0:
+                holdings[:] = holdings.sum(axis=1, keepdims=True) * self.target_weights[:, :, None]
+
+            holdings *= alive
+            bucket_balances = balances[:num_buckets, year + 1]
+            holdings.sum(axis=1, out=bucket_balances)
+            total = bucket_balances.sum(axis=0, out=balances[num_buckets, year + 1])
+            alive &= total > 0
+
+        return balances.reshape(-1, num_paths)
+
+    def _pre_tax_balances(self, paths: np.ndarray) -> np.ndarray:
+        start = BUCKETS.index(TaxClassification.PRE_TAX) * (self.total_years + 1)
+        return paths[start:start + self.total_years]
+
+    def _summarize(
+        self,
+        successful_sims: int,
+        num_paths: int,
+        aggregate: Union[np.ndarray, LogHistogramSketch],
+        precision: Optional[Dict] = None,
+        target_met: Optional[bool] = None,
+        outcomes: Optional[TaxOutcomes] = None,
+    ) -> Dict:
+        """Summarize the total as usual, adding per-bucket percentiles and yearly medians"""
+        rows = self.total_years + 1
+        num_buckets = len(BUCKETS)
+        if self.streaming:
+            total = aggregate.select_rows(slice(num_buckets * rows, None))
+            p10, median, p90 = aggregate.select_rows(slice(0, num_buckets * rows)).quantiles([0.10, 0.50, 0.90])
+        else:
+            total = aggregate[num_buckets * rows:]
+            p10, median, p90 = np.percentile(aggregate[:num_buckets * rows], [10, 50, 90], axis=1)
+
+        results = super()._summarize(successful_sims, num_paths, total, precision, target_met, outcomes)
+        results["allocation"] = self.allocation.summary()
+        results["bucket_stats"] = {
+            str(bucket): {
+                "median_final_balance": Decimal(str(round(float(median[(i + 1) * rows - 1]), 2))),
+                "percentile_10_balance": Decimal(str(round(float(p10[(i + 1) * rows - 1]), 2))),
+                "percentile_90_balance": Decimal(str(round(float(p90[(i + 1) * rows - 1]), 2))),
+                "year_medians": np.round(median[i * rows:(i + 1) * rows], 2).tolist(),
+            }
+            for i, bucket in enumerate(BUCKETS)
+        }
+        return results
@@ -0,0 +1,59 @@
+"""
+Bulk persistence of RMD and IRMAA projections
+"""
+from typing import Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from sqlalchemy import and_, delete, insert, or_, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from ..models.retirement_forecast import IRMAAProjection, RMDProjection
+
+ProjectionModel = Union[Type[RMDProjection], Type[IRMAAProjection]]
+# (user_id, forecast_id) owning one projection set
+ProjectionKey = Tuple[int, Optional[int]]
+
+# A replace that loses a race with a concurrent replace of the same key is retried
+REPLACE_ATTEMPTS = 2
+
+
+def _key_filter(model: ProjectionModel, keys: List[ProjectionKey]):
+    linked = [key for key in keys if key[1] is not None]
+    unlinked = [user_id for user_id, forecast_id in keys if forecast_id is None]
+    clauses = []
+    if linked:
+        clauses.append(tuple_(model.user_id, model.forecast_id).in_(linked))
+    if unlinked:
+        clauses.append(and_(model.user_id.in_(unlinked), model.forecast_id.is_(None)))
+    return or_(*clauses)
+
+
+def replace_projections(
+    session: Session,
+    model: ProjectionModel,
+    keys: Iterable[ProjectionKey],
+    rows: List[Dict],
+) -> int:
+    """Atomically replace every projection stored under ``keys`` with ``rows``
+
+    ``rows`` are dicts of model fields (unset fields take the model
+    defaults). The old sets are deleted and the new rows written with one
+    batched multi-row INSERT in the same transaction, so readers see either
+    the old or the new set, never both. Returns the number of rows written.
+    """
+    keys = list(set(keys))
+    values = [model.model_validate(row).model_dump(exclude={"id"}) for row in rows]
+
+    for attempt in range(REPLACE_ATTEMPTS):
+        try:
+            if keys:
+                session.exec(delete(model).where(_key_filter(model, keys)))
+            if values:
+                session.exec(insert(model), params=values)
+            session.commit()
+            return len(values)
+        except IntegrityError:
+            # A concurrent replace committed rows for the same key after our delete
+            session.rollback()
+            if attempt == REPLACE_ATTEMPTS - 1:
+                raise
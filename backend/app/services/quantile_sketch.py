@@ -0,0 +1,113 @@
+"""
+Mergeable quantile sketch for streaming Monte Carlo aggregation
+"""
+import copy
+import math
+from typing import Dict, Sequence
+
+import numpy as np
+
+
+class LogHistogramSketch:
+    """Per-row log-bucketed histogram with a bounded relative error
+
+    Each row (one per simulated year) keeps counts in geometrically spaced
+    buckets, so any reported quantile is within ``relative_accuracy`` of a
+    true sample value of that rank. Values below ``min_value`` fall into a
+    dedicated zero bucket and are reported as 0 (absolute error below
+    ``min_value``). Memory depends only on the number of rows and buckets,
+    never on how many samples were added.
+    """
+
+    def __init__(
+        self,
+        num_rows: int,
+        relative_accuracy: float = 0.005,
+        min_value: float = 1.0,
+        max_value: float = 1e13,
+    ):
+        self.num_rows = num_rows
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.num_bins = int(math.ceil(math.log(max_value / min_value) / self.log_gamma)) + 1
+
+        self.counts = np.zeros((num_rows, self.num_bins + 1), dtype=np.int64)
+        self.minimum = np.full(num_rows, np.inf)
+        self.maximum = np.full(num_rows, -np.inf)
+        self.total = 0
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a ``(num_rows, samples)`` block of values"""
+        if values.shape[1] == 0:
+            return
+
+        with np.errstate(divide="ignore"):
+            bins = np.ceil(np.log(values / self.min_value) / self.log_gamma)
+        np.clip(bins, 0, self.num_bins - 1, out=bins)
+        bins += 1
+        bins[values < self.min_value] = 0
+
+        offsets = np.arange(self.num_rows, dtype=np.int64)[:, None] * (self.num_bins + 1)
+        flat = (bins.astype(np.int64) + offsets).ravel()
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+
+        np.minimum(self.minimum, values.min(axis=1), out=self.minimum)
+        np.maximum(self.maximum, values.max(axis=1), out=self.maximum)
+        self.total += values.shape[1]
+
+    def merge(self, other: "LogHistogramSketch") -> None:
+        """Fold another sketch with identical parameters into this one"""
+        if (
+            other.num_rows != self.num_rows
+            or other.num_bins != self.num_bins
+            or other.relative_accuracy != self.relative_accuracy
+            or other.min_value != self.min_value
+        ):
+            raise ValueError("Cannot merge sketches with different parameters")
+
+        self.counts += other.counts
+        np.minimum(self.minimum, other.minimum, out=self.minimum)
+        np.maximum(self.maximum, other.maximum, out=self.maximum)
+        self.total += other.total
+
+    def select_rows(self, rows: slice) -> "LogHistogramSketch":
+        """Sketch restricted to a slice of rows (shares nothing with this one)"""
+        selected = copy.copy(self)
+        selected.counts = self.counts[rows].copy()
+        selected.minimum = self.minimum[rows].copy()
+        selected.maximum = self.maximum[rows].copy()
+        selected.num_rows = len(selected.counts)
+        return selected
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Estimate quantiles (0-1) for every row, shape ``(len(qs), num_rows)``"""
+        cumulative = np.cumsum(self.counts, axis=1)
+        bin_index = np.arange(self.num_bins + 1)
+        # Bucket i > 0 covers (min * gamma^(i-2), min * gamma^(i-1)]; use the
+        # point with equal relative distance to both edges
+        representatives = np.where(
+            bin_index == 0,
+            0.0,
+            self.min_value * 2 * self.gamma ** (bin_index - 1) / (self.gamma + 1),
+        )
+
+        estimates = np.empty((len(qs), self.num_rows))
+        for i, q in enumerate(qs):
+            rank = q * (self.total - 1)
+            bucket = np.count_nonzero(cumulative <= rank, axis=1)
+            np.minimum(bucket, self.num_bins, out=bucket)
+            estimates[i] = np.clip(representatives[bucket], self.minimum, self.maximum)
+
+        return estimates
+
+    def accuracy(self) -> Dict:
+        """Describe the error bound of quantiles reported by this sketch"""
+        return {
+            "method": "log_histogram",
+            "relative_error": self.relative_accuracy,
+            "absolute_floor": self.min_value,
+        }
@@ -0,0 +1,159 @@
+"""
+Nightly refresh of RMD projections for every forecast
+"""
+import logging
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional, Sequence, Set
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from ..core.config import settings
+from ..core.database import engine
+from ..models.account import Account
+from ..models.investment_tax import InvestmentTaxBucket, TaxClassification
+from ..models.retirement_forecast import ProjectionSource, RetirementForecast, RMDProjection
+from .monte_carlo_service import RMDCalculator
+from .projection_store import replace_projections
+from .rmd_table import RMD_START_AGE
+
+logger = logging.getLogger(__name__)
+
+# Forecasts projected and written per batch
+REFRESH_BATCH_SIZE = 5_000
+
+
+def pre_tax_balances(session: Session) -> Dict[int, float]:
+    """Total pre-tax bucket balance of every user that has one"""
+    rows = session.exec(
+        select(Account.user_id, func.sum(InvestmentTaxBucket.balance))
+        .join(Account, InvestmentTaxBucket.account_id == Account.id)
+        .where(InvestmentTaxBucket.tax_classification == TaxClassification.PRE_TAX)
+        .group_by(Account.user_id),
+    ).all()
+    return {user_id: float(balance) for user_id, balance in rows if balance}
+
+
+def age_on(forecast: RetirementForecast, day: date) -> int:
+    """The forecast's ``current_age`` advanced by the whole years since it was created"""
+    created = forecast.created_at.date()
+    return forecast.current_age + day.year - created.year - ((day.month, day.day) < (created.month, created.day))
+
+
+def forecasts_with_user_projections(session: Session, forecast_ids: Sequence[int]) -> Set[int]:
+    """Those of ``forecast_ids`` whose RMD projections were requested by their user"""
+    return set(session.exec(
+        select(RMDProjection.forecast_id)
+        .where(RMDProjection.forecast_id.in_(forecast_ids), RMDProjection.source == ProjectionSource.USER)
+        .distinct(),
+    ).all())
+
+
+def refresh_rmd_projections(session: Session, batch_size: int = REFRESH_BATCH_SIZE) -> Dict:
+    """Re-project the RMDs linked to every forecast from current pre-tax balances
+
+    Each forecast is projected from its user's age today, or the RMD start
+    age if later, to its life expectancy at its expected return, starting
+    from its user's total pre-tax balance. Forecasts whose projections the
+    user requested are skipped. All forecasts of a batch are projected in
+    one vectorized pass and their previous projections replaced in one
+    bulk write.
+    """
+    balances = pre_tax_balances(session)
+    today = datetime.now(timezone.utc).date()
+    forecasts_refreshed = rows_written = 0
+    last_id = 0
+
+    while True:
+        forecasts = session.exec(
+            select(RetirementForecast)
+            .where(RetirementForecast.id > last_id)
+            .order_by(RetirementForecast.id)
+            .limit(batch_size),
+        ).all()
+        if not forecasts:
+            break
+        last_id = forecasts[-1].id
+
+        forecasts = [f for f in forecasts if f.user_id in balances]
+        user_requested = forecasts_with_user_projections(session, [f.id for f in forecasts]) if forecasts else set()
+        forecasts = [f for f in forecasts if f.id not in user_requested]
+        if not forecasts:
+            continue
+
+        batch = RMDCalculator.project_rmds_batch(
+            starting_ages=[max(age_on(f, today), RMD_START_AGE) for f in forecasts],
+            ending_ages=[f.life_expectancy for f in forecasts],
+            pre_tax_balances=[balances[f.user_id] for f in forecasts],
+            expected_returns=[float(f.expected_return) for f in forecasts],
+        )
+
+        cents = RMDCalculator.to_cents
+        rows = []
+        for i, forecast in enumerate(forecasts):
+            for year in range(int(batch["valid"][i].sum())):
+                account_balance = cents(batch["account_balance"][i, year])
+                rows.append({
+                    "user_id": forecast.user_id,
+                    "forecast_id": forecast.id,
+                    "source": ProjectionSource.REFRESH,
+                    "year": year,
+                    "age": int(batch["age"][i, year]),
+                    "account_balance": account_balance,
+                    "rmd_amount": cents(batch["rmd_amount"][i, year]),
+                    "life_expectancy_factor": cents(batch["life_expectancy_factor"][i, year]),
+                    "pre_tax_balance": account_balance,
+                })
+        rows_written += replace_projections(session, RMDProjection, [(f.user_id, f.id) for f in forecasts], rows)
+        forecasts_refreshed += len(forecasts)
+
+    return {"forecasts_refreshed": forecasts_refreshed, "projections_written": rows_written}
+
+
+class RMDRefreshScheduler:
+    """Runs ``refresh_rmd_projections`` once a day on a background thread"""
+
+    def __init__(self, hour: int):
+        self.hour = hour
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the daily refresh; a negative hour leaves it disabled"""
+        if self.hour < 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="rmd-refresh", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        """Stop waiting for the next refresh (a running refresh finishes first)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def seconds_until_next_run(self, now: datetime) -> float:
+        """Seconds from ``now`` until the next configured UTC hour"""
+        next_run = now.replace(hour=self.hour, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.seconds_until_next_run(datetime.now(timezone.utc))):
+            try:
+                with Session(engine) as session:
+                    logger.info("RMD projections refreshed: %s", refresh_rmd_projections(session))
+            except Exception:
+                logger.exception("RMD projection refresh failed")
+
+
+rmd_refresh_scheduler = RMDRefreshScheduler(settings.rmd_refresh_hour)
+
+
+if __name__ == "__main__":
+    # One-off refresh, e.g. from cron when the in-process scheduler is disabled
+    with Session(engine) as session:
+        print(refresh_rmd_projections(session))
@@ -0,0 +1,55 @@
+"""
+IRS Uniform Lifetime Table as a dense divisor array indexed by age
+"""
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+# Age required minimum distributions start at (73 for those born 1951-1959)
+RMD_START_AGE = 73
+# Oldest age the divisor lookup covers; older ages reuse its divisor
+MAX_DIVISOR_AGE = 130
+
+# IRS Uniform Lifetime Table (2024+): distribution period for each age from _TABLE_FIRST_AGE to 120
+_TABLE_FIRST_AGE = 72
+_TABLE = (
+    27.4, 26.5, 25.5, 24.6, 23.7, 22.9, 22.0, 21.1,
+    20.2, 19.4, 18.5, 17.7, 16.8, 16.0, 15.2, 14.4,
+    13.7, 12.9, 12.2, 11.5, 10.8, 10.1, 9.5, 8.9,
+    8.4, 7.8, 7.3, 6.8, 6.4, 6.0, 5.6, 5.2,
+    4.9, 4.6, 4.3, 4.1, 3.9, 3.7, 3.5, 3.4,
+    3.3, 3.1, 3.0, 2.9, 2.8, 2.7, 2.5, 2.3,
+    2.0,
+)
+
+
+def _uniform_lifetime_divisors() -> np.ndarray:
+    ages = np.arange(MAX_DIVISOR_AGE + 1)
+    last_age = _TABLE_FIRST_AGE + len(_TABLE) - 1
+    divisors = np.empty(len(ages))
+    divisors[_TABLE_FIRST_AGE:last_age + 1] = _TABLE
+    divisors[:_TABLE_FIRST_AGE] = _TABLE[0] + (_TABLE_FIRST_AGE - ages[:_TABLE_FIRST_AGE])
+    divisors[last_age + 1:] = _TABLE[-1]
+    divisors.setflags(write=False)
+    return divisors
+
+
+# Divisor of every age up to MAX_DIVISOR_AGE. Ages above the table use its final
+# divisor; ages below it extend the table by one year of distribution period per
+# year of age, so an early retiree spreads the balance over a longer horizon.
+UNIFORM_LIFETIME_DIVISORS = _uniform_lifetime_divisors()
+
+
+@lru_cache(maxsize=None)
+def rmd_divisors(start_age: Optional[int] = None) -> np.ndarray:
+    """``UNIFORM_LIFETIME_DIVISORS``, with ``inf`` before ``start_age`` when given
+
+    Dividing a balance by ``inf`` yields no required distribution.
+    """
+    if start_age is None:
+        return UNIFORM_LIFETIME_DIVISORS
+    divisors = UNIFORM_LIFETIME_DIVISORS.copy()
+    divisors[:start_age] = np.inf
+    divisors.setflags(write=False)
+    return divisors
@@ -0,0 +1,170 @@
+"""
+Roth conversion search over shared return paths
+"""
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models.retirement_forecast import RothObjective
+from .monte_carlo_service import Z_SCORE, MonteCarloSimulator
+from .scenario_sweep import SCENARIO_BATCH_SIZE, ScenarioSweep
+
+# Paths simulated between pruning rounds; the base simulator's chunk_size
+# (a power of two keeps Sobol blocks balanced)
+SEARCH_BLOCK_SIZE = 1024
+
+
+class RothConversionOptimizer:
+    """Search Roth conversion schedules for the best one of each scenario
+
+    Every combination of ``conversion_amounts`` and ``conversion_years``
+    (converted each year from retirement), plus no conversion, is a
+    candidate for every scenario. All candidates are simulated by one
+    ``ScenarioSweep`` with RMDs and IRMAA surcharges against the same
+    return paths, one block of the base simulator at a time.
+
+    After each block, a candidate is pruned when its success rate is
+    confidently below ``min_success_rate`` (unless no candidate of its
+    scenario does better), or when a candidate of the same scenario that
+    confidently meets it has a confidently better expected objective
+    (95% intervals). Later blocks only simulate the survivors. Of the
+    survivors meeting ``min_success_rate``, the one with the best expected
+    objective wins; if none does, the one with the highest success rate.
+    """
+
+    def __init__(
+        self,
+        base: MonteCarloSimulator,
+        retirement_ages: Sequence[int],
+        annual_contributions: Sequence[Decimal],
+        withdrawal_rates: Sequence[Decimal],
+        conversion_amounts: Sequence[Decimal],
+        conversion_years: Sequence[int],
+        objective: RothObjective = RothObjective.TAXES,
+        min_success_rate: Decimal = Decimal("80"),
+        pre_tax_percent: Decimal = Decimal("100"),
+        tax_rate: Decimal = Decimal("0"),
+        conversion_tax_rate: Optional[Decimal] = None,
+        num_workers: Optional[int] = None,
+    ):
+        self.base = base
+        self.objective = RothObjective(objective)
+        self.min_success_rate = float(min_success_rate) / 100.0
+
+        schedules = [(0.0, 0)] + [
+            (float(amount), years) for amount in conversion_amounts for years in conversion_years
+            if amount > 0 and years > 0
+        ]
+        self.schedules = list(dict.fromkeys(schedules))
+        self.num_scenarios = len(retirement_ages)
+        num_schedules = len(self.schedules)
+
+        # Candidates are scenario-major: every schedule of scenario 0, then scenario 1, ...
+        self.scenario_index = np.repeat(np.arange(self.num_scenarios), num_schedules)
+        self.sweep = ScenarioSweep(
+            base,
+            retirement_ages=np.repeat(retirement_ages, num_schedules),
+            annual_contributions=np.repeat([float(c) for c in annual_contributions], num_schedules),
+            withdrawal_rates=np.repeat([float(r) for r in withdrawal_rates], num_schedules),
+            roth_conversion_amounts=np.tile([amount for amount, _ in self.schedules], self.num_scenarios),
+            roth_conversion_years=np.tile([years for _, years in self.schedules], self.num_scenarios),
+            pre_tax_percent=pre_tax_percent,
+            tax_rate=tax_rate,
+            conversion_tax_rate=conversion_tax_rate,
+            rmds=True,
+            irmaa=True,
+            num_workers=num_workers,
+        )
+
+    @property
+    def num_candidates(self) -> int:
+        return self.sweep.num_scenarios
+
+    def run(self) -> List[Dict]:
+        """Search every scenario; returns one result dict per scenario, in order"""
+        alive = np.arange(self.num_candidates)
+        # Per block: surviving candidates, in order, and their final balance, estate and taxes per path
+        blocks = []
+
+        for returns in self.base.iter_return_blocks():
+            batches = [alive[start:start + SCENARIO_BATCH_SIZE] for start in range(0, len(alive), SCENARIO_BATCH_SIZE)]
+            pre_tax, roth, taxes = (
+                np.concatenate(arrays) for arrays in zip(*self.sweep.simulate_batches(batches, returns))
+            )
+            blocks.append((alive, pre_tax + roth, pre_tax * (1 - self.sweep.tax_rate) + roth, taxes))
+
+            survivors = self._survivors(alive, *self._history(blocks, alive))
+            alive = alive[survivors]
+            blocks[-1] = tuple(array[survivors] for array in blocks[-1])
+
+        final, estate, taxes = self._history(blocks, alive)
+        success_rates = np.count_nonzero(final > 0, axis=1) / final.shape[1]
+        expected_scores = self._scores(estate, taxes).mean(axis=1)
+
+        results = []
+        for scenario in range(self.num_scenarios):
+            rows = np.flatnonzero(self.scenario_index[alive] == scenario)
+            feasible = rows[success_rates[rows] >= self.min_success_rate]
+            if len(feasible):
+                best = feasible[np.argmin(expected_scores[feasible])]
+            else:
+                best = rows[np.lexsort((expected_scores[rows], -success_rates[rows]))[0]]
+
+            amount, years = self.schedules[alive[best] % len(self.schedules)]
+            results.append({
+                "roth_conversion_amount": Decimal(str(round(amount, 2))) if years else None,
+                "roth_conversion_years": years or None,
+                "meets_success_target": bool(len(feasible)),
+                "success_rate": Decimal(str(round(success_rates[best] * 100, 2))),
+                "median_final_balance": Decimal(str(round(float(np.median(final[best])), 2))),
+                "estate_value": Decimal(str(round(float(np.median(estate[best])), 2))),
+                "total_taxes_paid": Decimal(str(round(float(np.median(taxes[best])), 2))),
+                "expected_estate_value": round(float(estate[best].mean()), 2),
+                "expected_taxes_paid": round(float(taxes[best].mean()), 2),
+                "candidates": len(self.schedules),
+                "candidates_remaining": len(rows),
+            })
+        return results
+
+    def _scores(self, estate: np.ndarray, taxes: np.ndarray) -> np.ndarray:
+        """Per-path objective, oriented so that lower is better"""
+        return taxes if self.objective == RothObjective.TAXES else -estate
+
+    @staticmethod
+    def _history(blocks: List[Tuple[np.ndarray, ...]], candidates: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Final balance, estate and taxes of ``candidates`` on every path simulated so far"""
+        rows = [np.searchsorted(block[0], candidates) for block in blocks]
+        return tuple(
+            np.concatenate([block[field][index] for block, index in zip(blocks, rows)], axis=1)
+            for field in (1, 2, 3)
+        )
+
+    def _survivors(self, alive: np.ndarray, final: np.ndarray, estate: np.ndarray, taxes: np.ndarray) -> np.ndarray:
+        """Mask of the ``alive`` candidates that are not confidently infeasible or dominated
+
+        Dominance is judged on per-path differences from the scenario's
+        leader, the confidently feasible candidate with the best expected
+        objective, which share their market paths and so their noise.
+        """
+        num_paths = final.shape[1]
+        rates = np.count_nonzero(final > 0, axis=1) / num_paths
+        # The 1/n term keeps 0% and 100% from looking certain after few paths
+        rate_margin = Z_SCORE * np.sqrt((rates * (1 - rates) + 1 / num_paths) / num_paths)
+        scenarios = self.scenario_index[alive]
+
+        best_rates = np.full(self.num_scenarios, -np.inf)
+        np.maximum.at(best_rates, scenarios, rates)
+        survivors = (rates + rate_margin >= self.min_success_rate) | (rates >= best_rates[scenarios])
+
+        scores = self._scores(estate, taxes)
+        means = scores.mean(axis=1)
+        feasible = rates - rate_margin >= self.min_success_rate
+        for scenario in np.unique(scenarios[feasible]):
+            rows = np.flatnonzero(scenarios == scenario)
+            leaders = rows[feasible[rows]]
+            leader = leaders[np.argmin(means[leaders])]
+            differences = scores[rows] - scores[leader]
+            margin = Z_SCORE * differences.std(axis=1) / np.sqrt(num_paths)
+            survivors[rows] &= differences.mean(axis=1) - margin <= 0
+        return survivors
@@ -0,0 +1,144 @@
+"""
+Variance-reduction sampling of standard normal return shocks
+"""
+import math
+from collections import deque
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..models.retirement_forecast import SamplingMethod
+
+# Coefficients of Acklam's rational approximation to the inverse normal CDF
+# (relative error below 1.2e-9 over the whole open unit interval)
+_PPF_A = (-3.969683028665376e01, 2.209460984245205e02, -2.759285104469687e02,
+          1.383577518672690e02, -3.066479806614716e01, 2.506628277459239e00)
+_PPF_B = (-5.447609879822406e01, 1.615858368580409e02, -1.556989798598866e02,
+          6.680131188771972e01, -1.328068155288572e01)
+_PPF_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e00,
+          -2.549732539343734e00, 4.374664141464968e00, 2.938163982698783e00)
+_PPF_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e00,
+          3.754408661907416e00)
+_PPF_LOW = 0.02425
+
+
+def sobol_available() -> bool:
+    """Whether the optional scipy dependency needed for Sobol sampling is installed"""
+    try:
+        from scipy.stats import qmc  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def standard_normal_ppf(u: np.ndarray) -> np.ndarray:
+    """Inverse standard normal CDF for values strictly inside (0, 1)"""
+    u = np.asarray(u, dtype=np.float64)
+    z = np.empty_like(u)
+
+    tail = np.minimum(u, 1 - u)
+    central = tail >= _PPF_LOW
+
+    q = u[central] - 0.5
+    r = q * q
+    a, b = _PPF_A, _PPF_B
+    z[central] = (
+        (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q
+        / (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+    )
+
+    q = np.sqrt(-2 * np.log(tail[~central]))
+    c, d = _PPF_C, _PPF_D
+    lower_tail = (
+        (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5])
+        / ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1)
+    )
+    z[~central] = np.where(u[~central] < 0.5, lower_tail, -lower_tail)
+    return z
+
+
+@lru_cache(maxsize=32)
+def _bridge_schedule(num_dims: int) -> List[Tuple[int, int, Optional[int], float, float, float]]:
+    """Brownian bridge fill order as (index, left, right, left_weight, right_weight, std)"""
+    schedule = [(num_dims, 0, None, 0.0, 0.0, math.sqrt(num_dims))]
+    intervals = deque([(0, num_dims)])
+    while intervals:
+        left, right = intervals.popleft()
+        if right - left < 2:
+            continue
+        middle = (left + right) // 2
+        span = right - left
+        schedule.append((
+            middle,
+            left,
+            right,
+            (right - middle) / span,
+            (middle - left) / span,
+            math.sqrt((middle - left) * (right - middle) / span),
+        ))
+        intervals.extend([(left, middle), (middle, right)])
+    return schedule
+
+
+def brownian_bridge(shocks: np.ndarray) -> np.ndarray:
+    """Reorder independent normals so the leading rows drive the cumulative path
+
+    Row 0 sets the sum of all years, row 1 the midpoint, and so on; the
+    returned yearly increments are still independent standard normals. For
+    quasi-random and stratified sampling this concentrates the best
+    distributed coordinates on what matters most for the final balance.
+    """
+    num_dims = shocks.shape[0]
+    if num_dims == 0:
+        return shocks
+    walk = np.zeros((num_dims + 1, shocks.shape[1]))
+    for row, (index, left, right, left_weight, right_weight, std) in enumerate(_bridge_schedule(num_dims)):
+        if right is None:
+            walk[index] = std * shocks[row]
+        else:
+            walk[index] = left_weight * walk[left] + right_weight * walk[right] + std * shocks[row]
+    return np.diff(walk, axis=0)
+
+
+def draw_standard_normals(
+    method: SamplingMethod,
+    rng: np.random.Generator,
+    num_dims: int,
+    num_paths: int,
+) -> np.ndarray:
+    """Draw a ``(num_dims, num_paths)`` matrix of standard normal shocks
+
+    Every method yields marginally standard normal values; the structured
+    ones are randomized from ``rng`` so each block is an independent,
+    unbiased estimate:
+
+    - ``antithetic`` pairs each path with its negation
+    - ``latin_hypercube`` places exactly one path in each of ``num_paths``
+      equal-probability strata of every dimension
+    - ``sobol`` uses a scrambled Sobol sequence
+
+    Both of the latter are mapped to years through a Brownian bridge.
+    """
+    if method == SamplingMethod.RANDOM:
+        return rng.standard_normal((num_dims, num_paths))
+
+    if method == SamplingMethod.ANTITHETIC:
+        half = rng.standard_normal((num_dims, (num_paths + 1) // 2))
+        return np.concatenate([half, -half], axis=1)[:, :num_paths]
+
+    if method == SamplingMethod.LATIN_HYPERCUBE:
+        strata = rng.permuted(np.broadcast_to(np.arange(num_paths), (num_dims, num_paths)), axis=1)
+        return brownian_bridge(standard_normal_ppf((strata + rng.random((num_dims, num_paths))) / num_paths))
+
+    if method == SamplingMethod.SOBOL:
+        from scipy.stats import qmc
+
+        # Draw the enclosing power of two so the prefix keeps Sobol balance
+        # as far as possible without scipy's non-power-of-two warning
+        sampler = qmc.Sobol(d=num_dims, scramble=True, rng=rng)
+        points = sampler.random_base2(max(0, math.ceil(math.log2(num_paths))))[:num_paths]
+        # Scrambled points never hit 0 exactly, but guard the ppf domain anyway
+        return brownian_bridge(standard_normal_ppf(np.clip(points.T, 1e-12, 1 - 1e-12)))
+
+    raise ValueError(f"Unknown sampling method: {method}")
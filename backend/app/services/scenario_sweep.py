@@ -0,0 +1,272 @@
+"""
+Batched evaluation of retirement scenarios over shared return paths
+"""
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .irmaa_brackets import brackets_path, filing_status_index, load_irmaa_brackets
+from .monte_carlo_service import MonteCarloSimulator, RMDCalculator, _get_process_pool, configured_workers
+from .rmd_table import MAX_DIVISOR_AGE
+from .tax_outcomes import MEDICARE_AGE
+
+# Scenarios evaluated together; bounds the (scenarios, paths) working arrays
+SCENARIO_BATCH_SIZE = 64
+
+
+def _run_sweep_batch(sweep: "ScenarioSweep", batch: slice, returns: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Process pool entry point for one batch of scenarios"""
+    return sweep._simulate_batch(batch, returns)
+
+
+def _summarize_sweep_batch(sweep: "ScenarioSweep", batch: slice, blocks: List[np.ndarray]) -> Tuple[np.ndarray, ...]:
+    """Process pool entry point for the results of one batch of scenarios over every block"""
+    return sweep._summarize_batch(batch, blocks)
+
+
+class ScenarioSweep:
+    """Evaluate many retirement scenarios against one shared return matrix
+
+    Every scenario sees exactly the same simulated market paths (common
+    random numbers), so differences between scenarios reflect the
+    parameters rather than sampling noise. ``base`` supplies the shared
+    inputs (ages, savings, market assumptions, seed, sampling) and the
+    return paths; each scenario varies retirement age, contribution,
+    withdrawal rate and Roth conversion schedule.
+
+    Savings are split (``pre_tax_percent``) into a pre-tax bucket and a
+    tax-free (Roth) bucket that earn the same returns. Contributions go to the pre-tax bucket. In
+    the first retired year the withdrawal is set to ``withdrawal_rate`` of
+    the balance and then grows with inflation; it is taken net of tax,
+    pre-tax first (grossed up at ``tax_rate``), then from the Roth bucket.
+    Roth conversions move up to the conversion amount from pre-tax to Roth
+    in each of the first ``roth_conversion_years`` retired years, with tax
+    at ``conversion_tax_rate`` withheld from the converted amount.
+
+    With ``rmds``, any RMD on the pre-tax bucket that the withdrawal does
+    not cover is taken anyway, taxed at ``tax_rate`` and the rest moved to
+    the Roth bucket. With ``irmaa``, each year from Medicare age the
+    pre-tax withdrawals and conversions plus the base simulator's
+    ``other_income`` set the MAGI, and the surcharge of its IRMAA tier (in
+    the base's ``filing_status`` table for that calendar year) is paid from
+    the portfolio like spending and counted in the taxes paid.
+
+    Scenarios are processed in batches, which are spread over the shared
+    process pool when more than one worker is configured. Each batch is
+    simulated over every block of paths and reduced to its per-scenario
+    results before the next one starts, so memory is bounded by the batch
+    size rather than growing with the number of scenarios.
+    """
+
+    def __init__(
+        self,
+        base: MonteCarloSimulator,
+        retirement_ages: Sequence[int],
+        annual_contributions: Sequence[Decimal],
+        withdrawal_rates: Sequence[Decimal],
+        roth_conversion_amounts: Sequence[Optional[Decimal]],
+        roth_conversion_years: Sequence[Optional[int]],
+        pre_tax_percent: Decimal = Decimal("100"),
+        tax_rate: Decimal = Decimal("0"),
+        conversion_tax_rate: Optional[Decimal] = None,
+        rmds: bool = False,
+        irmaa: bool = False,
+        num_workers: Optional[int] = None,
+    ):
+        self.base = base
+        self.retirement_ages = np.asarray(retirement_ages, dtype=np.int64)
+        self.annual_contributions = np.array([float(c) for c in annual_contributions])
+        self.withdrawal_rates = np.array([float(r) / 100.0 for r in withdrawal_rates])
+        self.roth_conversion_amounts = np.array([float(a or 0) for a in roth_conversion_amounts])
+        self.roth_conversion_years = np.array([years or 0 for years in roth_conversion_years], dtype=np.int64)
+        self.pre_tax_fraction = float(pre_tax_percent) / 100.0
+        self.tax_rate = float(tax_rate) / 100.0
+        self.conversion_tax_rate = (
+            float(conversion_tax_rate) / 100.0 if conversion_tax_rate is not None else self.tax_rate
+        )
+        self.num_scenarios = len(self.retirement_ages)
+        self.num_workers = num_workers
+
+        years = np.arange(base.total_years)
+        ages = base.current_age + years
+        self.rmd_divisors = None
+        if rmds:
+            self.rmd_divisors = RMDCalculator.divisor_array()[np.minimum(ages, MAX_DIVISOR_AGE)]
+        self.irmaa_thresholds = self.irmaa_surcharges = None
+        if irmaa:
+            brackets = load_irmaa_brackets(brackets_path())
+            thresholds, part_b, part_d = brackets.tables(
+                base.start_year, base.total_years, filing_status_index(base.filing_status), base.inflation_rate * 100,
+            )
+            self.irmaa_thresholds = thresholds
+            self.irmaa_surcharges = (part_b + part_d) * 12
+
+    def run(self) -> List[Dict]:
+        """Simulate every scenario; returns one result dict per scenario, in order"""
+        num_paths = self.base.num_simulations
+        batches = [
+            slice(start, min(start + SCENARIO_BATCH_SIZE, self.num_scenarios))
+            for start in range(0, self.num_scenarios, SCENARIO_BATCH_SIZE)
+        ]
+
+        # Batches are the outer loop so only one batch's per-path outcomes are
+        # alive at a time (per worker); the shared return paths are far smaller
+        blocks = list(self.base.iter_return_blocks())
+        if min(self.num_workers or configured_workers(), len(batches)) > 1:
+            pool = _get_process_pool()
+            summaries = list(pool.map(
+                _summarize_sweep_batch, [self] * len(batches), batches, [blocks] * len(batches),
+            ))
+        else:
+            summaries = [self._summarize_batch(batch, blocks) for batch in batches]
+        successful, median_final, median_estate, median_taxes = (
+            np.concatenate(arrays) for arrays in zip(*summaries)
+        )
+
+        return [
+            {
+                "success_rate": Decimal(str(round(successful[i] / num_paths * 100, 2))),
+                "median_final_balance": Decimal(str(round(float(median_final[i]), 2))),
+                "estate_value": Decimal(str(round(float(median_estate[i]), 2))),
+                "total_taxes_paid": Decimal(str(round(float(median_taxes[i]), 2))),
+            }
+            for i in range(self.num_scenarios)
+        ]
+
+    def _summarize_batch(self, batch: slice, blocks: List[np.ndarray]) -> Tuple[np.ndarray, ...]:
+        """Successful path count and median final balance, estate and taxes of one batch over every block"""
+        outcomes = [self._simulate_batch(batch, returns) for returns in blocks]
+        pre_tax, roth, taxes = (np.concatenate(arrays, axis=1) for arrays in zip(*outcomes))
+        total = pre_tax + roth
+        return (
+            np.count_nonzero(total > 0, axis=1),
+            np.median(total, axis=1),
+            np.median(pre_tax * (1 - self.tax_rate) + roth, axis=1),
+            np.median(taxes, axis=1),
+        )
+
+    def simulate_batches(
+        self,
+        batches: Sequence[Union[slice, np.ndarray]],
+        returns: np.ndarray,
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """``_simulate_batch`` of every batch over one block of return paths, on the pool if configured"""
+        if min(self.num_workers or configured_workers(), len(batches)) > 1:
+            pool = _get_process_pool()
+            return list(pool.map(_run_sweep_batch, [self] * len(batches), batches, [returns] * len(batches)))
+        return [self._simulate_batch(batch, returns) for batch in batches]
+
+    def _simulate_batch(
+        self,
+        batch: Union[slice, np.ndarray],
+        returns: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Propagate a batch of scenarios (a slice or index array) over one block of return paths
+
+        Returns the final pre-tax and Roth balances and the cumulative tax
+        (including IRMAA surcharges), each of shape ``(scenarios, paths)``.
+        """
+        base = self.base
+        retirement_ages = self.retirement_ages[batch, None]
+        contributions = self.annual_contributions[batch, None]
+        withdrawal_rates = self.withdrawal_rates[batch, None]
+        conversion_amounts = self.roth_conversion_amounts[batch, None]
+        conversion_ends = retirement_ages + self.roth_conversion_years[batch, None]
+
+        shape = (len(retirement_ages), returns.shape[1])
+        pre_tax = np.full(shape, base.current_savings * self.pre_tax_fraction)
+        roth = np.full(shape, base.current_savings * (1 - self.pre_tax_fraction))
+        taxes = np.zeros(shape)
+        # Withdrawal base in today's dollars; scenarios already retired draw on today's savings
+        withdrawals = np.zeros(shape)
+        withdrawals += np.where(retirement_ages <= base.current_age, withdrawal_rates * base.current_savings, 0.0)
+        alive = np.ones(shape, dtype=bool)
+        gross = np.zeros(shape)
+
+        net_of_tax = 1 - self.tax_rate
+        for year in range(base.total_years):
+            age = base.current_age + year
+            inflation = (1 + base.inflation_rate) ** year
+            growth = returns[year] + 1
+
+            # RMDs are due on the balance at the start of the year
+            rmds_due = None
+            if self.rmd_divisors is not None and np.isfinite(self.rmd_divisors[year]):
+                rmds_due = pre_tax / self.rmd_divisors[year]
+            medicare = self.irmaa_thresholds is not None and age >= MEDICARE_AGE
+
+            # Withdrawal base is set from the balance at the start of the first retired year
+            retiring = (retirement_ages == age) & (age > base.current_age)
+            if retiring.any():
+                withdrawals += retiring * withdrawal_rates * (pre_tax + roth) / inflation
+
+            pre_tax *= growth
+            roth *= growth
+
+            working = retirement_ages > age
+            if working.any():
+                pre_tax += working * contributions * inflation
+
+            converted = 0.0
+            converting = (retirement_ages <= age) & (age < conversion_ends)
+            if converting.any():
+                converted = np.minimum(converting * conversion_amounts, pre_tax)
+                pre_tax -= converted
+                roth += converted * (1 - self.conversion_tax_rate)
+                taxes += converted * self.conversion_tax_rate
+
+            retired = ~working
+            if not (retired.any() or rmds_due is not None or medicare):
+                continue
+
+            # Net spending need: pre-tax first (grossed up for tax), then Roth
+            self._withdraw(withdrawals * (retired * inflation), pre_tax, roth, taxes, gross)
+
+            if rmds_due is not None:
+                extra = np.clip(rmds_due - gross, 0, pre_tax)
+                pre_tax -= extra
+                roth += extra * net_of_tax
+                taxes += extra * self.tax_rate
+                gross += extra
+
+            if medicare:
+                magi = gross + converted + base.other_income * inflation
+                tiers = np.searchsorted(self.irmaa_thresholds[year], magi, side="left")
+                surcharges = self.irmaa_surcharges[year][tiers] * alive
+                taxes += surcharges
+                self._withdraw(surcharges, pre_tax, roth, taxes, np.empty(shape))
+
+            # A path that cannot meet its spending is depleted and stays at zero
+            # (the tolerance absorbs rounding of the tax gross-up)
+            alive &= roth > -1e-6
+            np.maximum(roth, 0, out=roth)
+            pre_tax *= alive
+            roth *= alive
+            alive &= (pre_tax + roth) > 0
+
+        return pre_tax, roth, taxes
+
+    def _withdraw(
+        self,
+        need: np.ndarray,
+        pre_tax: np.ndarray,
+        roth: np.ndarray,
+        taxes: np.ndarray,
+        gross: np.ndarray,
+    ) -> None:
+        """Take a net amount from the pre-tax bucket (grossed up for tax), then Roth, in place
+
+        ``gross`` receives the pre-tax amount withdrawn. A Roth balance left
+        negative marks a path that could not pay.
+        """
+        net_of_tax = 1 - self.tax_rate
+        if net_of_tax > 0:
+            np.minimum(need / net_of_tax, pre_tax, out=gross)
+            pre_tax -= gross
+            need = need - gross * net_of_tax
+            if self.tax_rate:
+                taxes += gross * self.tax_rate
+        else:
+            gross.fill(0)
+        roth -= need
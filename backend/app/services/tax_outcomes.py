@@ -0,0 +1,113 @@
+"""
+Distributions of RMDs and IRMAA tiers across Monte Carlo paths
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .quantile_sketch import LogHistogramSketch
+
+# Medicare, and with it IRMAA, starts at this age
+MEDICARE_AGE = 65
+
+
+class TaxOutcomes:
+    """Mergeable per-year RMD and IRMAA tier distribution of simulated paths
+
+    Each block of paths contributes its start-of-year pre-tax balances. The
+    RMD is that balance over the divisor for the age (``inf`` where none is
+    due), MAGI is ``base_income`` (nominal, per year) plus the RMD, and the
+    tier follows from the thresholds in effect that year. Everything is
+    computed on whole ``(years, paths)`` arrays. Tier counts are exact;
+    RMD percentiles are exact, or carry the sketch's error bound when
+    ``streaming``.
+    """
+
+    def __init__(
+        self,
+        ages: np.ndarray,
+        calendar_years: np.ndarray,
+        divisors: np.ndarray,
+        base_income: np.ndarray,
+        thresholds: np.ndarray,
+        surcharges: np.ndarray,
+        tiers: Sequence[str],
+        streaming: bool,
+    ):
+        self.ages = ages
+        self.calendar_years = calendar_years
+        self.divisors = divisors
+        self.base_income = base_income
+        self.thresholds = thresholds
+        self.surcharges = surcharges
+        self.tiers = tuple(tiers)
+
+        num_years = len(ages)
+        self.tier_counts = np.zeros((num_years, len(self.tiers)), dtype=np.int64)
+        self.rmd_sketch = LogHistogramSketch(num_years) if streaming else None
+        self.rmd_chunks: List[np.ndarray] = []
+        self.num_paths = 0
+
+    def update(self, pre_tax_balances: np.ndarray) -> None:
+        """Add a ``(years, paths)`` block of start-of-year pre-tax balances"""
+        num_years, num_paths = pre_tax_balances.shape
+        if num_paths == 0:
+            return
+
+        rmds = pre_tax_balances / self.divisors[:, None]
+        magi = rmds + self.base_income[:, None]
+        tiers = np.empty(rmds.shape, dtype=np.int64)
+        for year in range(num_years):
+            tiers[year] = np.searchsorted(self.thresholds[year], magi[year], side="left")
+
+        num_tiers = len(self.tiers)
+        flat = (tiers + np.arange(num_years)[:, None] * num_tiers).ravel()
+        self.tier_counts += np.bincount(flat, minlength=self.tier_counts.size).reshape(self.tier_counts.shape)
+
+        if self.rmd_sketch is not None:
+            self.rmd_sketch.update(rmds)
+        else:
+            self.rmd_chunks.append(rmds)
+        self.num_paths += num_paths
+
+    def merge(self, other: "TaxOutcomes") -> None:
+        """Fold in the outcomes of later paths"""
+        self.tier_counts += other.tier_counts
+        if self.rmd_sketch is not None:
+            self.rmd_sketch.merge(other.rmd_sketch)
+        else:
+            self.rmd_chunks.extend(other.rmd_chunks)
+        self.num_paths += other.num_paths
+
+    def summary(self, min_age: Optional[int] = MEDICARE_AGE) -> Dict:
+        """Per-age RMD percentiles and IRMAA tier probabilities (percent of paths)"""
+        if self.rmd_sketch is not None:
+            p10, median, p90 = self.rmd_sketch.quantiles([0.10, 0.50, 0.90])
+            accuracy = self.rmd_sketch.accuracy()
+        else:
+            p10, median, p90 = np.percentile(np.concatenate(self.rmd_chunks, axis=1), [10, 50, 90], axis=1)
+            accuracy = {"method": "exact"}
+
+        probabilities = self.tier_counts / max(self.num_paths, 1) * 100
+        expected_surcharge = (probabilities / 100 * self.surcharges).sum(axis=1) * 12
+
+        rows = np.flatnonzero(self.ages >= (min_age or 0))
+        return {
+            "irmaa_tiers": list(self.tiers),
+            "rmd_percentile_accuracy": accuracy,
+            "by_age": [
+                {
+                    "age": int(self.ages[year]),
+                    "calendar_year": int(self.calendar_years[year]),
+                    "rmd_p10": round(float(p10[year]), 2),
+                    "rmd_median": round(float(median[year]), 2),
+                    "rmd_p90": round(float(p90[year]), 2),
+                    "irmaa_tier_probabilities": {
+                        tier: round(float(probabilities[year, i]), 2) for i, tier in enumerate(self.tiers)
+                    },
+                    "surcharge_probability": round(float(100 - probabilities[year, 0]), 2),
+                    "expected_annual_surcharge": round(float(expected_surcharge[year]), 2),
+                }
+                for year in rows
+            ],
+        }
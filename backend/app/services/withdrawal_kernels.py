@@ -0,0 +1,114 @@
+"""
+Vectorized withdrawal strategies for Monte Carlo retirement simulation
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Type, Union
+
+import numpy as np
+
+from ..models.retirement_forecast import WithdrawalStrategy
+from .rmd_table import MAX_DIVISOR_AGE, UNIFORM_LIFETIME_DIVISORS
+
+class WithdrawalKernel(ABC):
+    """Computes one retired year's withdrawal for every path at once
+
+    A kernel instance simulates one block of paths: it is called once per
+    retired year, in order, with the start-of-year balances and the
+    cumulative inflation factor, and may keep per-path state between
+    calls. Amounts are in nominal dollars. ``annual_withdrawal`` is in
+    today's dollars; rates, bands and bounds are fractions.
+    """
+
+    def __init__(
+        self,
+        annual_withdrawal: float,
+        withdrawal_rate: float,
+        guardrail_band: float,
+        guardrail_adjustment: float,
+        withdrawal_floor: float,
+        withdrawal_ceiling: float,
+    ):
+        self.annual_withdrawal = annual_withdrawal
+        self.withdrawal_rate = withdrawal_rate
+        self.guardrail_band = guardrail_band
+        self.guardrail_adjustment = guardrail_adjustment
+        self.withdrawal_floor = withdrawal_floor
+        self.withdrawal_ceiling = withdrawal_ceiling
+
+    @abstractmethod
+    def withdraw(self, age: int, inflation: float, balance: np.ndarray) -> Union[float, np.ndarray]:
+        """Withdrawal of every path for the year at ``age``"""
+
+
+class FixedWithdrawal(WithdrawalKernel):
+    """``annual_withdrawal`` grown with inflation, whatever the balance"""
+
+    def withdraw(self, age: int, inflation: float, balance: np.ndarray) -> float:
+        return self.annual_withdrawal * inflation
+
+
+class PercentageWithdrawal(WithdrawalKernel):
+    """``withdrawal_rate`` of the start-of-year balance"""
+
+    def withdraw(self, age: int, inflation: float, balance: np.ndarray) -> np.ndarray:
+        return self.withdrawal_rate * balance
+
+
+class RMDWithdrawal(WithdrawalKernel):
+    """Start-of-year balance divided by the Uniform Lifetime Table divisor for the age"""
+
+    def withdraw(self, age: int, inflation: float, balance: np.ndarray) -> np.ndarray:
+        return balance / UNIFORM_LIFETIME_DIVISORS[min(age, MAX_DIVISOR_AGE)]
+
+
+class GuardrailsWithdrawal(WithdrawalKernel):
+    """Inflation-adjusted withdrawal that is cut or raised when its rate drifts
+
+    The first retired year withdraws ``annual_withdrawal``, which fixes each
+    path's initial withdrawal rate. Afterwards, when the current rate rises
+    more than ``guardrail_band`` above the initial rate the real withdrawal
+    is cut by ``guardrail_adjustment``; when it falls more than the band
+    below, it is raised by the same fraction.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.real_withdrawal = None
+        self.initial_rate = None
+
+    def withdraw(self, age: int, inflation: float, balance: np.ndarray) -> np.ndarray:
+        if self.real_withdrawal is None:
+            self.real_withdrawal = np.full(balance.shape, self.annual_withdrawal)
+            with np.errstate(divide="ignore"):
+                self.initial_rate = self.annual_withdrawal * inflation / balance
+            return self.real_withdrawal * inflation
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = self.real_withdrawal * inflation / balance
+        self.real_withdrawal *= np.where(
+            rate > self.initial_rate * (1 + self.guardrail_band),
+            1 - self.guardrail_adjustment,
+            np.where(rate < self.initial_rate * (1 - self.guardrail_band), 1 + self.guardrail_adjustment, 1.0),
+        )
+        return self.real_withdrawal * inflation
+
+
+class FloorCeilingWithdrawal(WithdrawalKernel):
+    """``withdrawal_rate`` of the balance, kept between a floor and a ceiling
+
+    The bounds are ``withdrawal_floor`` and ``withdrawal_ceiling`` times the
+    inflation-adjusted ``annual_withdrawal``.
+    """
+
+    def withdraw(self, age: int, inflation: float, balance: np.ndarray) -> np.ndarray:
+        base = self.annual_withdrawal * inflation
+        return np.clip(self.withdrawal_rate * balance, self.withdrawal_floor * base, self.withdrawal_ceiling * base)
+
+
+WITHDRAWAL_KERNELS: Dict[WithdrawalStrategy, Type[WithdrawalKernel]] = {
+    WithdrawalStrategy.FIXED: FixedWithdrawal,
+    WithdrawalStrategy.PERCENTAGE: PercentageWithdrawal,
+    WithdrawalStrategy.RMD: RMDWithdrawal,
+    WithdrawalStrategy.GUARDRAILS: GuardrailsWithdrawal,
+    WithdrawalStrategy.FLOOR_CEILING: FloorCeilingWithdrawal,
+}
@@ -0,0 +1,101 @@
+"""
+Closed-form sustainable withdrawal per simulated path
+"""
+from decimal import Decimal
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .monte_carlo_service import MonteCarloSimulator
+
+
+class SustainableWithdrawalSolver:
+    """Maximum sustainable fixed withdrawal of every path in one pass
+
+    For a fixed return path, every balance is linear in the (inflation
+    adjusted) withdrawal ``W``: ``balance_t = A_t - W * C_t``, where ``A_t``
+    is the balance with no withdrawals and ``C_t`` the compounded sum of
+    the inflation factors withdrawn so far. A path survives exactly when
+    every retired balance stays positive, i.e. when ``W`` is below
+    ``min_t A_t / C_t``. ``base`` supplies the inputs and return paths
+    (its ``annual_withdrawal`` and withdrawal strategy are ignored), so the
+    success rate at any ``W`` equals that of ``base.run_simulation`` with
+    ``annual_withdrawal=W``, fixed strategy and the same seed.
+    """
+
+    def __init__(self, base: MonteCarloSimulator):
+        if base.retirement_age >= base.life_expectancy:
+            raise ValueError("Retirement must start before life expectancy")
+        self.base = base
+
+    def max_withdrawals(self) -> np.ndarray:
+        """Supremum of the sustainable withdrawal (today's dollars) of every path"""
+        return np.concatenate([self._solve_block(returns) for returns in self.base.iter_return_blocks()])
+
+    def _solve_block(self, returns: np.ndarray) -> np.ndarray:
+        base = self.base
+        num_paths = returns.shape[1]
+        wealth = np.full(num_paths, base.current_savings)  # A_t
+        withdrawn = np.zeros(num_paths)  # C_t
+        max_withdrawal = np.full(num_paths, np.inf)
+        growth = np.empty(num_paths)
+        ratio = np.empty(num_paths)
+
+        for year in range(base.total_years):
+            inflation = (1 + base.inflation_rate) ** year
+            np.add(returns[year], 1, out=growth)
+            wealth *= growth
+            withdrawn *= growth
+            if base.current_age + year < base.retirement_age:
+                wealth += base.annual_contribution * inflation
+                continue
+
+            withdrawn += inflation
+            np.divide(wealth, withdrawn, out=ratio)
+            np.minimum(max_withdrawal, ratio, out=max_withdrawal)
+
+        # A path whose savings are already gone cannot sustain any withdrawal
+        return np.maximum(max_withdrawal, 0.0)
+
+    def solve(self, target_success_rates: Sequence[Decimal], curve_points: int = 50) -> Dict:
+        """Withdrawals achieving each target success rate (percent) and the success curve
+
+        Each target withdrawal is the largest amount, to the cent, whose
+        success rate is at least the target (None if no amount reaches
+        it). The curve spans zero to the
+        99th percentile of the per-path maxima.
+        """
+        ordered = np.sort(self.max_withdrawals())
+        num_paths = len(ordered)
+
+        targets: List[Dict] = []
+        for target in target_success_rates:
+            # At least this many paths must have a maximum above the withdrawal
+            required = max(1, int(np.ceil(float(target) / 100 * num_paths - 1e-9)))
+            bound = ordered[num_paths - required]
+            # Paths survive strictly below their maximum, so stay one cent under it;
+            # None when even withdrawing nothing misses the target
+            withdrawal = max(0.0, float(np.ceil(bound * 100)) / 100 - 0.01) if bound > 0 else None
+            targets.append({
+                "success_rate": target,
+                "annual_withdrawal": Decimal(str(round(withdrawal, 2))) if withdrawal is not None else None,
+            })
+
+        finite = ordered[np.isfinite(ordered)]
+        top = float(np.quantile(finite, 0.99)) if len(finite) else 0.0
+        amounts = np.linspace(0.0, top, curve_points)
+        surviving = num_paths - np.searchsorted(ordered, amounts, side="right")
+        curve = [
+            {
+                "annual_withdrawal": Decimal(str(round(float(amount), 2))),
+                "success_rate": Decimal(str(round(count / num_paths * 100, 2))),
+            }
+            for amount, count in zip(amounts, surviving)
+        ]
+
+        return {
+            "num_simulations": num_paths,
+            "median_max_withdrawal": Decimal(str(round(float(np.median(ordered)), 2))),
+            "targets": targets,
+            "curve": curve,
+        }
@@ -0,0 +1,148 @@
+"""
+Compact binary encoding of per-year forecast statistics
+"""
+import json
+import struct
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Statistic columns in the order they are written
+YEAR_STAT_NAMES = ("median", "p10", "p90", "min", "max")
+
+MAGIC = b"FYST"
+FORMAT_VERSION = 1
+# Little-endian float64, so stored balances keep every cent
+COLUMN_DTYPE = "<f8"
+
+# magic, format version, number of columns, age at year 0, number of years
+_HEADER = struct.Struct("<4sBBhH")
+# name length, compressed column length
+_COLUMN = struct.Struct("<BI")
+
+
+def _shuffle(column: np.ndarray) -> bytes:
+    """Group the n-th byte of every value together so zlib sees runs of similar bytes"""
+    width = np.dtype(COLUMN_DTYPE).itemsize
+    return column.astype(COLUMN_DTYPE).view(np.uint8).reshape(-1, width).T.tobytes()
+
+
+def _unshuffle(data: bytes, num_years: int) -> np.ndarray:
+    width = np.dtype(COLUMN_DTYPE).itemsize
+    return np.frombuffer(data, dtype=np.uint8).reshape(width, num_years).T.copy().view(COLUMN_DTYPE).ravel()
+
+
+def encode_year_stats(year_stats: List[Dict], start_age: int) -> bytes:
+    """Encode a ``year_stats`` list as float64 columns, one compressed column per statistic
+
+    Layout: a fixed header (magic, format version, column count, age at
+    year 0, year count), a directory of ``(name, compressed length)``
+    entries, then the columns. Each column is compressed separately so a
+    reader can decode only the statistics it needs.
+    """
+    num_years = len(year_stats)
+    directory = []
+    payloads = []
+    for name in YEAR_STAT_NAMES:
+        column = np.fromiter((stats[name] for stats in year_stats), dtype=np.float64, count=num_years)
+        payload = zlib.compress(_shuffle(column), 6)
+        encoded_name = name.encode("ascii")
+        directory.append(_COLUMN.pack(len(encoded_name), len(payload)) + encoded_name)
+        payloads.append(payload)
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(YEAR_STAT_NAMES), start_age, num_years)
+    return b"".join([header, *directory, *payloads])
+
+
+class YearStatsBlob:
+    """Lazily decoded view over an encoded ``year_stats`` blob
+
+    Only the header and column directory are parsed up front; each
+    statistic is decompressed the first time it is requested.
+    """
+
+    def __init__(self, data: bytes):
+        if len(data) < _HEADER.size:
+            raise ValueError("Truncated year stats blob")
+        magic, version, num_columns, start_age, num_years = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a year stats blob")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported year stats format version {version}")
+
+        self.start_age = start_age
+        self.num_years = num_years
+        self._data = memoryview(data)
+        self._columns: Dict[str, np.ndarray] = {}
+
+        offset = _HEADER.size
+        entries = []
+        for _ in range(num_columns):
+            name_length, payload_length = _COLUMN.unpack_from(data, offset)
+            offset += _COLUMN.size
+            entries.append((bytes(data[offset:offset + name_length]).decode("ascii"), payload_length))
+            offset += name_length
+
+        self._spans: Dict[str, slice] = {}
+        for name, payload_length in entries:
+            self._spans[name] = slice(offset, offset + payload_length)
+            offset += payload_length
+
+    @property
+    def stat_names(self) -> List[str]:
+        return list(self._spans)
+
+    def column(self, name: str) -> np.ndarray:
+        """Decode one statistic for every year"""
+        column = self._columns.get(name)
+        if column is None:
+            if name not in self._spans:
+                raise KeyError(name)
+            column = _unshuffle(zlib.decompress(self._data[self._spans[name]]), self.num_years)
+            self._columns[name] = column
+        return column
+
+    def to_columns(
+        self,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        stats: Optional[Sequence[str]] = None,
+    ) -> Dict[str, List]:
+        """Decode years ``[start_year, end_year)`` of the chosen statistics as lists keyed by name"""
+        years = range(self.num_years)[slice(start_year, end_year)]
+        names = list(stats) if stats is not None else self.stat_names
+        columns = {"year": list(years), "age": [self.start_age + year for year in years]}
+        for name in names:
+            columns[name] = np.round(self.column(name)[years.start:years.stop], 2).tolist()
+        return columns
+
+    def to_year_stats(
+        self,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        stats: Optional[Sequence[str]] = None,
+    ) -> List[Dict]:
+        """Rebuild ``year_stats`` dicts for years ``[start_year, end_year)`` and the chosen statistics"""
+        columns = self.to_columns(start_year, end_year, stats)
+        names = list(columns)
+        return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def read_year_stats(
+    data: Optional[bytes],
+    legacy_json: Optional[str] = None,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    stats: Optional[Sequence[str]] = None,
+) -> List[Dict]:
+    """Read ``year_stats`` from a blob, falling back to the legacy JSON text column"""
+    if data:
+        return YearStatsBlob(data).to_year_stats(start_year, end_year, stats)
+    if not legacy_json:
+        return []
+
+    year_stats = json.loads(legacy_json)[slice(start_year, end_year)]
+    if stats is None:
+        return year_stats
+    return [{"year": row["year"], "age": row["age"], **{name: row[name] for name in stats}} for row in year_stats]
@@ -0,0 +1 @@
+"""Performance benchmarks for FinApp backend services"""
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""Benchmark suite for the retirement forecasting engines
+
+Times ``MonteCarloSimulator.run_simulation`` across a matrix of path
+counts, horizons and strategies, each withdrawal kernel and the RMD/IRMAA
+outcome pass at 10,000 paths,
+plus ``RMDCalculator.project_rmds``, ``IRMAACalculator.project_irmaa`` and
+their batched counterparts across horizons, and a Roth conversion search
+over 1,000 candidates. Each case reports
+p50/p99 latency, throughput (paths, projected years or candidates per second) and
+peak traced memory, and is compared against the JSON baseline stored in
+``benchmarks/baselines/``. The run fails (exit status 1) when a case is
+slower or uses more memory than its baseline by more than the tolerance.
+It also fails when an exact 10,000-path forecast is less than 50 times as
+fast as the original engine, which looped over paths and years in Python;
+that reference is timed on the same machine, so no calibration is involved.
+
+Everything runs in-process on one worker and needs no network or
+database, so results depend only on the machine. To compare across
+machines, each run also times a fixed NumPy and Python calibration
+workload. Baseline latencies are scaled by the ratio of this machine's
+calibration time to the one recorded with the baseline. Scaling is
+approximate, so refresh the baseline with ``--update-baseline`` after
+an intentional change, or on a CI host whose relative speed differs
+from the calibration by more than the tolerance.
+
+Usage (from ``backend/``):
+    python -m benchmarks.engines                     # compare with baseline
+    python -m benchmarks.engines --quick             # skip the largest cases
+    python -m benchmarks.engines --update-baseline   # record a new baseline
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.services.monte_carlo_service import IRMAACalculator, MonteCarloSimulator, RMDCalculator
+from app.services.roth_optimizer import SEARCH_BLOCK_SIZE, RothConversionOptimizer
+from app.services.sampling import sobol_available
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "engines.json"
+BASELINE_FORMAT = 2
+
+PATH_COUNTS = (1_000, 10_000, 100_000)
+HORIZONS = (30, 60)
+STRATEGIES = ("exact", "streaming", "antithetic", "latin_hypercube", "sobol")
+# Withdrawal kernels are timed at one path count; the fixed kernel is covered above
+WITHDRAWAL_STRATEGIES = ("percentage", "rmd", "guardrails", "floor_ceiling")
+WITHDRAWAL_PATHS = 10_000
+PROJECTION_HORIZONS = (10, 30)
+RMD_BATCH_ACCOUNTS = 100_000
+IRMAA_BATCH_PEOPLE = 10_000
+# Conversion amounts x years searched (plus no conversion) on 10,000 paths
+ROTH_AMOUNTS = 40
+ROTH_YEARS = 25
+ROTH_PATHS = 10_000
+
+# The exact engine must beat the original per-path loop by this factor on one forecast
+MIN_SPEEDUP = 50
+SPEEDUP_PATHS = 10_000
+SPEEDUP_HORIZON = 60
+SPEEDUP_CASE = f"monte_carlo/speedup/paths={SPEEDUP_PATHS}/years={SPEEDUP_HORIZON}"
+
+# Repeat each case until it has run this long (within the repeat bounds)
+TIME_BUDGET_SECONDS = 1.0
+MIN_REPEATS = 5
+MAX_REPEATS = 200
+# The calibration workload keeps its fastest of this many runs
+CALIBRATION_REPEATS = 15
+# Latency increases below this many milliseconds are never reported as regressions
+LATENCY_NOISE_MS = 0.5
+
+
+def monte_carlo_case(num_paths: int, horizon: int, strategy: str) -> Callable[[], object]:
+    """Build a zero-argument callable running one forecast"""
+    options = {"streaming": strategy == "streaming"}
+    if strategy in WITHDRAWAL_STRATEGIES:
+        options["withdrawal_strategy"] = strategy
+    elif strategy == "tax_outcomes":
+        options.update(
+            tax_outcomes=True, pre_tax_fraction=Decimal("70"), other_income=Decimal("40000"), start_year=2025,
+        )
+    elif strategy not in ("exact", "streaming"):
+        options["sampling"] = strategy
+
+    simulator = MonteCarloSimulator(
+        current_age=95 - horizon,
+        retirement_age=max(95 - horizon, 65),
+        life_expectancy=95,
+        current_savings=Decimal("500000"),
+        annual_contribution=Decimal("20000"),
+        annual_withdrawal=Decimal("45000"),
+        expected_return=Decimal("7"),
+        volatility=Decimal("15"),
+        num_simulations=num_paths,
+        seed=0,
+        num_workers=1,
+        **options,
+    )
+    return simulator.run_simulation
+
+
+def per_path_forecast(num_paths: int, horizon: int) -> List[Dict]:
+    """The original engine on ``monte_carlo_case``'s inputs: one Python loop per path and year
+
+    Kept only as the reference for ``MIN_SPEEDUP``.
+    """
+    current_age, retirement_age = 95 - horizon, max(95 - horizon, 65)
+    rng = np.random.RandomState(0)
+    paths = []
+    for _ in range(num_paths):
+        balance = 500_000.0
+        path = [balance]
+        for year in range(horizon):
+            age = current_age + year
+            balance *= 1 + rng.normal(0.07, 0.15)
+            if age < retirement_age:
+                balance += 20_000 * 1.025 ** year
+            else:
+                balance -= 45_000 * 1.025 ** year
+            balance = max(0, balance)
+            path.append(balance)
+            if balance == 0:
+                break
+        path.extend([0] * (horizon + 1 - len(path)))
+        paths.append(path)
+
+    year_stats = []
+    for year in range(horizon + 1):
+        balances = sorted(path[year] for path in paths)
+        year_stats.append({
+            "median": round(balances[len(balances) // 2], 2),
+            "p10": round(balances[int(len(balances) * 0.10)], 2),
+            "p90": round(balances[int(len(balances) * 0.90)], 2),
+            "min": round(min(balances), 2),
+            "max": round(max(balances), 2),
+        })
+    return year_stats
+
+
+def measure_speedup() -> float:
+    """How many times faster the exact engine runs a forecast than ``per_path_forecast``"""
+    engine = measure(monte_carlo_case(SPEEDUP_PATHS, SPEEDUP_HORIZON, "exact"), SPEEDUP_PATHS)
+    start = time.perf_counter()
+    per_path_forecast(SPEEDUP_PATHS, SPEEDUP_HORIZON)
+    return (time.perf_counter() - start) * 1000 / engine["p50_ms"]
+
+
+def rmd_case(horizon: int) -> Callable[[], object]:
+    return lambda: RMDCalculator.project_rmds(
+        starting_age=73,
+        ending_age=73 + horizon,
+        pre_tax_balance=Decimal("1500000"),
+        expected_return=Decimal("6"),
+    )
+
+
+def rmd_batch_case(horizon: int) -> Callable[[], object]:
+    rng = np.random.default_rng(0)
+    starting_ages = rng.integers(60, 80, RMD_BATCH_ACCOUNTS)
+    balances = rng.uniform(0, 3_000_000, RMD_BATCH_ACCOUNTS)
+    returns = rng.uniform(3, 8, RMD_BATCH_ACCOUNTS)
+    return lambda: RMDCalculator.project_rmds_batch(
+        starting_ages=starting_ages,
+        ending_ages=starting_ages + horizon,
+        pre_tax_balances=balances,
+        expected_returns=returns,
+    )
+
+
+def irmaa_case(horizon: int) -> Callable[[], object]:
+    rmd_projections = RMDCalculator.project_rmds(
+        starting_age=73,
+        ending_age=73 + horizon,
+        pre_tax_balance=Decimal("1500000"),
+        expected_return=Decimal("6"),
+    )
+    income_sources = {
+        "social_security": Decimal("42000"),
+        "pension": Decimal("18000"),
+        "investment_income": Decimal("25000"),
+        "other_income": Decimal("0"),
+    }
+    return lambda: IRMAACalculator.project_irmaa(
+        starting_age=65,
+        ending_age=65 + horizon,
+        income_sources=income_sources,
+        rmd_projections=rmd_projections,
+        filing_status="married",
+        start_year=2025,
+    )
+
+
+def irmaa_batch_case(horizon: int) -> Callable[[], object]:
+    rng = np.random.default_rng(0)
+    starting_ages = np.full(IRMAA_BATCH_PEOPLE, 65)
+    rmds = RMDCalculator.project_rmds_batch(
+        starting_ages=starting_ages,
+        ending_ages=65 + horizon,
+        pre_tax_balances=rng.uniform(0, 3_000_000, IRMAA_BATCH_PEOPLE),
+        expected_returns=6.0,
+    )
+    rmd_income_by_age = RMDCalculator.income_by_age(rmds)
+    base_income = rng.uniform(40_000, 400_000, IRMAA_BATCH_PEOPLE)
+    filing_statuses = np.where(rng.random(IRMAA_BATCH_PEOPLE) < 0.5, "married", "single")
+    return lambda: IRMAACalculator.project_irmaa_batch(
+        starting_ages=starting_ages,
+        ending_ages=starting_ages + horizon,
+        base_income=base_income,
+        rmd_income_by_age=rmd_income_by_age,
+        filing_statuses=filing_statuses,
+        start_year=2025,
+    )
+
+
+def roth_search_case() -> Callable[[], object]:
+    base = MonteCarloSimulator(
+        current_age=60,
+        retirement_age=60,
+        life_expectancy=95,
+        current_savings=Decimal("2000000"),
+        annual_contribution=Decimal("0"),
+        annual_withdrawal=Decimal("0"),
+        expected_return=Decimal("6"),
+        volatility=Decimal("12"),
+        num_simulations=ROTH_PATHS,
+        seed=0,
+        chunk_size=SEARCH_BLOCK_SIZE,
+        other_income=Decimal("50000"),
+        start_year=2025,
+    )
+    optimizer = RothConversionOptimizer(
+        base,
+        retirement_ages=[65],
+        annual_contributions=[Decimal("0")],
+        withdrawal_rates=[Decimal("3")],
+        conversion_amounts=[Decimal(10_000 * (i + 1)) for i in range(ROTH_AMOUNTS)],
+        conversion_years=list(range(1, ROTH_YEARS + 1)),
+        pre_tax_percent=Decimal("90"),
+        tax_rate=Decimal("24"),
+        num_workers=1,
+    )
+    return optimizer.run
+
+
+def build_cases(quick: bool) -> Dict[str, Dict]:
+    """Name -> {"build": factory of the timed callable, "units": work items per run, "unit": label}"""
+    cases = {}
+    for num_paths in PATH_COUNTS:
+        if quick and num_paths > 10_000:
+            continue
+        for horizon in HORIZONS:
+            for strategy in STRATEGIES:
+                if strategy == "sobol" and not sobol_available():
+                    continue
+                cases[f"monte_carlo/{strategy}/paths={num_paths}/years={horizon}"] = {
+                    "build": lambda n=num_paths, h=horizon, s=strategy: monte_carlo_case(n, h, s),
+                    "units": num_paths,
+                    "unit": "paths",
+                }
+    for horizon in HORIZONS:
+        for strategy in WITHDRAWAL_STRATEGIES:
+            cases[f"monte_carlo/withdrawal={strategy}/paths={WITHDRAWAL_PATHS}/years={horizon}"] = {
+                "build": lambda h=horizon, s=strategy: monte_carlo_case(WITHDRAWAL_PATHS, h, s),
+                "units": WITHDRAWAL_PATHS,
+                "unit": "paths",
+            }
+        cases[f"monte_carlo/tax_outcomes/paths={WITHDRAWAL_PATHS}/years={horizon}"] = {
+            "build": lambda h=horizon: monte_carlo_case(WITHDRAWAL_PATHS, h, "tax_outcomes"),
+            "units": WITHDRAWAL_PATHS,
+            "unit": "paths",
+        }
+    for horizon in PROJECTION_HORIZONS:
+        cases[f"rmd/years={horizon}"] = {"build": lambda h=horizon: rmd_case(h), "units": horizon, "unit": "years"}
+        cases[f"rmd_batch/accounts={RMD_BATCH_ACCOUNTS}/years={horizon}"] = {
+            "build": lambda h=horizon: rmd_batch_case(h),
+            "units": RMD_BATCH_ACCOUNTS * horizon,
+            "unit": "years",
+        }
+        cases[f"irmaa/years={horizon}"] = {"build": lambda h=horizon: irmaa_case(h), "units": horizon, "unit": "years"}
+        cases[f"irmaa_batch/people={IRMAA_BATCH_PEOPLE}/years={horizon}"] = {
+            "build": lambda h=horizon: irmaa_batch_case(h),
+            "units": IRMAA_BATCH_PEOPLE * horizon,
+            "unit": "years",
+        }
+    if not quick:
+        cases[f"roth_search/candidates={ROTH_AMOUNTS * ROTH_YEARS + 1}/paths={ROTH_PATHS}"] = {
+            "build": roth_search_case,
+            "units": ROTH_AMOUNTS * ROTH_YEARS + 1,
+            "unit": "candidates",
+        }
+    return cases
+
+
+def measure(run: Callable[[], object], units: int) -> Dict:
+    """Time repeated runs and trace peak memory of one extra run"""
+    run()  # Warm up caches and lazy imports
+
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < MAX_REPEATS and (
+        len(timings) < MIN_REPEATS or time.perf_counter() - started < TIME_BUDGET_SECONDS
+    ):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p99 = np.percentile(timings, [50, 99])
+    return {
+        "repeats": len(timings),
+        "p50_ms": round(p50 * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+        "throughput_per_second": round(units / p50, 1),
+        "peak_memory_mb": round(peak / 2**20, 2),
+    }
+
+
+def calibrate() -> float:
+    """Milliseconds for a fixed workload shaped like the engines, the machine's speed unit"""
+    rng = np.random.default_rng(0)
+
+    def workload() -> None:
+        balances = np.cumprod(1.06 + 0.15 * rng.standard_normal((60, 20_000)), axis=0)
+        np.percentile(balances, [10, 50, 90], axis=1)
+        total = 0.0
+        for year in range(50_000):
+            total += year * 0.5
+
+    workload()
+    timings = []
+    for _ in range(CALIBRATION_REPEATS):
+        start = time.perf_counter()
+        workload()
+        timings.append(time.perf_counter() - start)
+    return round(min(timings) * 1000, 3)
+
+
+def environment() -> Dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def compare(
+    results: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    latency_tolerance: float,
+    memory_tolerance: float,
+    speed_ratio: float = 1.0,
+) -> List[str]:
+    """Return a description of every case that regressed beyond tolerance
+
+    ``speed_ratio`` is this machine's calibration time over the baseline's;
+    baseline latencies are scaled by it before comparing.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        expected = previous["p50_ms"] * speed_ratio
+        # Ignore sub-millisecond scheduling noise in the fastest cases
+        if result["p50_ms"] > max(expected * (1 + latency_tolerance), expected + LATENCY_NOISE_MS):
+            regressions.append(f"{name}: p50 {expected:.3f} (scaled baseline) -> {result['p50_ms']} ms")
+        # Ignore sub-megabyte noise in memory comparisons
+        if result["peak_memory_mb"] > max(previous["peak_memory_mb"] * (1 + memory_tolerance), 1.0):
+            regressions.append(f"{name}: peak memory {previous['peak_memory_mb']} -> {result['peak_memory_mb']} MB")
+    return regressions
+
+
+def load_baseline(path: Path, replacing: bool = False) -> Optional[Dict]:
+    """Read a baseline; one in an older format only counts as missing when it is being replaced"""
+    if not path.exists():
+        return None
+    baseline = json.loads(path.read_text())
+    if baseline.get("format") != BASELINE_FORMAT:
+        if replacing:
+            return None
+        raise SystemExit(
+            f"{path}: unsupported baseline format {baseline.get('format')}; record one with --update-baseline",
+        )
+    return baseline
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="skip the 100,000-path cases and the Roth conversion search")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--latency-tolerance", type=float, default=0.30, help="allowed p50 slowdown (0.30 = 30%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="allowed peak memory growth")
+    parser.add_argument("--retries", type=int, default=2, help="re-measure regressed cases before failing")
+    args = parser.parse_args()
+
+    cases = {name: case for name, case in build_cases(args.quick).items() if args.filter in name}
+    baseline = load_baseline(args.baseline, replacing=args.update_baseline)
+    previous = baseline["cases"] if baseline else {}
+    calibration_ms = calibrate()
+    speed_ratio = calibration_ms / baseline["calibration_ms"] if baseline else 1.0
+    print(f"Calibration: {calibration_ms:.2f} ms" + (f" ({speed_ratio:.2f}x the baseline machine)" if baseline else ""))
+
+    print(f"{'case':<60}{'p50 ms':>10}{'p99 ms':>10}{'throughput':>20}{'peak MB':>10}{'vs base':>10}")
+    results = {}
+    for name, case in cases.items():
+        result = measure(case["build"](), case["units"])
+        results[name] = result
+        change = (
+            f"{(result['p50_ms'] / (previous[name]['p50_ms'] * speed_ratio) - 1) * 100:+.0f}%"
+            if name in previous else "new"
+        )
+        throughput = f"{result['throughput_per_second']:,.0f} {case['unit']}/s"
+        print(
+            f"{name:<60}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+            f"{throughput:>20}{result['peak_memory_mb']:>10.2f}{change:>10}"
+        )
+
+    # A ratio of two timings on this machine, so it has no baseline and is never calibrated
+    speedup = measure_speedup() if args.filter in SPEEDUP_CASE else None
+    for _ in range(args.retries):
+        if speedup is None or speedup >= MIN_SPEEDUP:
+            break
+        speedup = max(speedup, measure_speedup())
+    if speedup is not None:
+        print(f"\n{SPEEDUP_CASE}: {speedup:.0f}x the per-path engine (minimum {MIN_SPEEDUP}x)")
+    too_slow = []
+    if speedup is not None and speedup < MIN_SPEEDUP:
+        too_slow.append(f"{SPEEDUP_CASE}: {speedup:.0f}x the per-path engine")
+
+    if args.update_baseline:
+        # Kept cases are rescaled to this machine so the whole file shares one calibration
+        kept = {
+            name: {
+                **result,
+                "p50_ms": round(result["p50_ms"] * speed_ratio, 3),
+                "p99_ms": round(result["p99_ms"] * speed_ratio, 3),
+            }
+            for name, result in previous.items()
+        } if args.filter or args.quick else {}
+        merged = {**kept, **results}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(
+            {
+                "format": BASELINE_FORMAT,
+                "environment": environment(),
+                "calibration_ms": calibration_ms,
+                "cases": dict(sorted(merged.items())),
+            },
+            indent=2,
+        ) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 1 if too_slow else 0
+
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one")
+        return 1 if too_slow else 0
+    if baseline.get("environment") != environment():
+        print(
+            f"\nNote: baseline was recorded on {baseline.get('environment')}, not {environment()}; "
+            "latencies are compared after calibration scaling",
+        )
+
+    # Timing noise is common on shared machines: a case only fails if it
+    # stays regressed across re-measurements (keeping its best p50)
+    for _ in range(args.retries):
+        regressed = [
+            name for name, result in results.items()
+            if compare({name: result}, previous, args.latency_tolerance, args.memory_tolerance, speed_ratio)
+        ]
+        if not regressed:
+            break
+        for name in regressed:
+            retry = measure(cases[name]["build"](), cases[name]["units"])
+            if retry["p50_ms"] < results[name]["p50_ms"]:
+                results[name] = retry
+
+    regressions = compare(results, previous, args.latency_tolerance, args.memory_tolerance, speed_ratio) + too_slow
+    if regressions:
+        print("\nRegressions beyond tolerance:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print("\nNo regressions beyond tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
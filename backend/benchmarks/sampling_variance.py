@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Measure the variance reduction of each Monte Carlo sampling method
+
+Runs the same forecast many times with independent seeds per sampling
+method and compares the spread of the estimates against plain
+pseudo-random sampling. A variance reduction factor of 4 means the method
+reaches the same precision as pseudo-random sampling with 4x fewer paths.
+
+Usage (from ``backend/``):
+    python -m benchmarks.sampling_variance --paths 1000 --replications 200
+"""
+import argparse
+import time
+from decimal import Decimal
+
+import numpy as np
+
+from app.models.retirement_forecast import SamplingMethod
+from app.services.monte_carlo_service import MonteCarloSimulator
+from app.services.sampling import sobol_available
+
+SCENARIO = dict(
+    current_age=45,
+    retirement_age=65,
+    life_expectancy=95,
+    current_savings=Decimal("400000"),
+    annual_contribution=Decimal("20000"),
+    annual_withdrawal=Decimal("45000"),
+    expected_return=Decimal("7"),
+    volatility=Decimal("15"),
+    inflation_rate=Decimal("2.5"),
+)
+
+METRICS = ("success_rate", "median_final_balance", "percentile_90_balance")
+
+
+def measure(method: SamplingMethod, num_paths: int, replications: int) -> dict:
+    """Estimate the sampling variance of each metric for one method"""
+    estimates = {metric: [] for metric in METRICS}
+    start = time.perf_counter()
+    for seed in range(replications):
+        simulator = MonteCarloSimulator(
+            **SCENARIO,
+            num_simulations=num_paths,
+            seed=seed,
+            streaming=False,
+            chunk_size=num_paths,
+            num_workers=1,
+            sampling=method,
+        )
+        results = simulator.run_simulation()
+        for metric in METRICS:
+            estimates[metric].append(float(results[metric]))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mean": {metric: float(np.mean(values)) for metric, values in estimates.items()},
+        "variance": {metric: float(np.var(values, ddof=1)) for metric, values in estimates.items()},
+        "seconds_per_run": elapsed / replications,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=1024, help="paths per forecast")
+    parser.add_argument("--replications", type=int, default=200, help="independent forecasts per method")
+    args = parser.parse_args()
+
+    methods = [method for method in SamplingMethod if method != SamplingMethod.SOBOL or sobol_available()]
+    measurements = {method: measure(method, args.paths, args.replications) for method in methods}
+    baseline = measurements[SamplingMethod.RANDOM]["variance"]
+
+    print(f"{args.replications} forecasts x {args.paths} paths per method; "
+          f"variance reduction factor vs random (higher is better)\n")
+    print(f"{'method':<16}" + "".join(f"{metric:>24}" for metric in METRICS) + f"{'ms/run':>10}")
+    for method, measurement in measurements.items():
+        factors = "".join(f"{baseline[metric] / measurement['variance'][metric]:>24.2f}" for metric in METRICS)
+        print(f"{method:<16}{factors}{measurement['seconds_per_run'] * 1000:>10.1f}")
+
+    if not sobol_available():
+        print("\nsobol skipped: install scipy to enable it")
+
+
+if __name__ == "__main__":
+    main()
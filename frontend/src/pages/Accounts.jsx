@@ -12,7 +12,7 @@ function Accounts() {
   const fetchAccounts = async () => {
     try {
       const response = await axios.get('/api/v1/accounts')
-      setAccounts(response.data)
+      setAccounts(response.data.items)
     } catch (error) {
       console.error('Error fetching accounts:', error)
     }
@@ -18,8 +18,14 @@ function Dashboard() {
   const fetchDashboardData = async () => {
     try {
       // Example: fetch accounts and calculate total balance
-      const accountsRes = await axios.get('/api/v1/accounts')
-      const totalBalance = accountsRes.data.reduce((sum, acc) => sum + parseFloat(acc.balance), 0)
+      // The list is paginated, so follow next_cursor to sum every account
+      let totalBalance = 0
+      let cursor = null
+      do {
+        const accountsRes = await axios.get('/api/v1/accounts', { params: cursor ? { cursor } : {} })
+        totalBalance += accountsRes.data.items.reduce((sum, acc) => sum + parseFloat(acc.balance), 0)
+        cursor = accountsRes.data.next_cursor
+      } while (cursor)
       
       setStats(prev => ({
         ...prev,
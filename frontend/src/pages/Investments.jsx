@@ -11,7 +11,7 @@ function Investments() {
   const fetchInvestments = async () => {
     try {
       const response = await axios.get('/api/v1/investments')
-      setInvestments(response.data)
+      setInvestments(response.data.items)
     } catch (error) {
       console.error('Error fetching investments:', error)
     }
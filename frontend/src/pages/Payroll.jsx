@@ -11,7 +11,7 @@ function Payroll() {
   const fetchPayrollRecords = async () => {
     try {
       const response = await axios.get('/api/v1/payroll')
-      setPayrollRecords(response.data)
+      setPayrollRecords(response.data.items)
     } catch (error) {
       console.error('Error fetching payroll records:', error)
     }
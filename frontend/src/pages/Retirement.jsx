@@ -11,7 +11,7 @@ function Retirement() {
   const fetchRetirementAccounts = async () => {
     try {
       const response = await axios.get('/api/v1/retirement')
-      setRetirementAccounts(response.data)
+      setRetirementAccounts(response.data.items)
     } catch (error) {
       console.error('Error fetching retirement accounts:', error)
     }
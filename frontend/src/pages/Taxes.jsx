@@ -11,7 +11,7 @@ function Taxes() {
   const fetchTaxRecords = async () => {
     try {
       const response = await axios.get('/api/v1/taxes')
-      setTaxRecords(response.data)
+      setTaxRecords(response.data.items)
     } catch (error) {
       console.error('Error fetching tax records:', error)
     }
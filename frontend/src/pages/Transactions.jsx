@@ -11,7 +11,7 @@ function Transactions() {
   const fetchTransactions = async () => {
     try {
       const response = await axios.get('/api/v1/transactions')
-      setTransactions(response.data)
+      setTransactions(response.data.items)
     } catch (error) {
       console.error('Error fetching transactions:', error)
     }
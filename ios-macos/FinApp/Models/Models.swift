@@ -102,6 +102,18 @@ struct Investment: Codable, Identifiable {
     }
 }
 
+// MARK: - Page
+/// One page of a list endpoint; `nextCursor` is nil on the last page
+struct Page<Item: Decodable>: Decodable {
+    let items: [Item]
+    let nextCursor: String?
+    
+    enum CodingKeys: String, CodingKey {
+        case items
+        case nextCursor = "next_cursor"
+    }
+}
+
 // MARK: - Dashboard Stats
 struct DashboardStats: Codable {
     let totalBalance: Decimal
@@ -43,7 +43,8 @@ class APIService: ObservableObject {
     
     // MARK: - Accounts
     func fetchAccounts(userId: Int) async throws -> [Account] {
-        return try await request(endpoint: "accounts?user_id=\(userId)")
+        let page: Page<Account> = try await request(endpoint: "accounts?user_id=\(userId)")
+        return page.items
     }
     
     func createAccount(_ account: Account) async throws -> Account {
@@ -69,7 +70,8 @@ class APIService: ObservableObject {
             endpoint += "?" + params.joined(separator: "&")
         }
         
-        return try await request(endpoint: endpoint)
+        let page: Page<Transaction> = try await request(endpoint: endpoint)
+        return page.items
     }
     
     func createTransaction(_ transaction: Transaction) async throws -> Transaction {
@@ -81,7 +83,8 @@ class APIService: ObservableObject {
     
     // MARK: - Investments
     func fetchInvestments(userId: Int) async throws -> [Investment] {
-        return try await request(endpoint: "investments?user_id=\(userId)")
+        let page: Page<Investment> = try await request(endpoint: "investments?user_id=\(userId)")
+        return page.items
     }
     
     // MARK: - Dashboard Stats